@@ -1,40 +1,95 @@
 import os
 import yaml
-import pandas as pd
 import datetime
 import time
 import json
+import hashlib
 import argparse
 import glob
+import re
+import threading
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 from dotenv import load_dotenv
-import google.generativeai as genai
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
+# Gemini / LangChain SDKs are imported lazily in initialize() and _get_client():
+# mock runs, tests and cached startups never pay for them.
+from utils.team_matcher import TeamMatcher
+from utils.llm_cache import LLMResponseCache
+from utils.incremental import IncrementalState, format_count_change, hash_text
+from utils.ingest import TeamBucket, stream_team_buckets
+from utils.review_store import ANALYSIS_COLUMNS, load_reviews
+from utils.review_sampler import cluster_reviews, format_cluster_lines
+from utils.vector_store import DocumentIndex
+from utils.token_budget import TokenCounter, estimate_cost, fit_reviews
+from utils.trace_writer import TraceWriter
+from utils.llm_client import RateLimitedLLM
+from utils.metrics import Metrics
+from utils.notifier import NotificationDispatcher, evaluate_alerts
+from utils.report_writer import ReportWriter
+from utils.rollups import DailyRollupStore, format_trend_line, format_trend_table
 
 # Load environment variables
 load_dotenv()
 
+_README_LOCK = threading.Lock()  # README.md is shared by every analyzer in the process (service mode)
+_ROLLUP_LOCK = threading.Lock()  # So are the daily rollup stores under data/rollups
+
 class VOCAnalyzer:
-    def __init__(self, config_path="config/teams.yaml", project_name="default_analysis"):
+    MODEL_CACHE_PATH = "data/cache/models.json"
+    MODEL_CACHE_TTL = 24 * 3600  # Seconds a discovered model list stays valid
+
+    def __init__(self, config_path="config/teams.yaml", project_name="default_analysis", max_workers=4, incremental=False,
+                 rag_top_k=4, prompt_token_budget=8000, batch_threshold=0, batch_size=5, compress_logs=False, team_stats=False,
+                 notify=False, trends=False, config=None, rag_context=None):
         self.project_name = project_name
+        self.max_workers = max(1, int(max_workers))
+        self.incremental = incremental  # Reuse sections of teams whose review set is unchanged
+        self.rag_top_k = rag_top_k  # Chunks retrieved per category; 0 = inject all docs
+        self.doc_index = None  # DocumentIndex over data/docs, built on first analysis
+        self.prompt_token_budget = prompt_token_budget  # Max prompt tokens per category
+        self._token_counter = None
+        self.batch_threshold = batch_threshold  # Teams with <= this many reviews share one LLM call (0 = off)
+        self.batch_size = max(1, int(batch_size))  # Max categories packed into one batched prompt
+        self.compress_logs = compress_logs  # gzip the per-run trace JSONL
+        self._trace_writer = None
+        self.team_stats = team_stats  # Append per-team correlation statistics to the report
+        self._routed = None  # (reviews_df, membership) of the last full load, reused by statistics and rollups
+        self.notify = notify  # Send threshold alerts from teams.yaml to team webhooks after the run
+        self._notifier = None
+        self.trends = trends  # Maintain data/rollups and add WoW/MoM trends to prompts and the report header
+        self._trends = {}  # team -> trend of the current run
+        self.metrics = Metrics()  # Spans, counters and per-category values; exported after each run
+        self.review_loader = None  # Optional load_reviews replacement (service mode keeps frames warm)
+        self.last_report_path = None
         self._ensure_directories()
-        self.config = self._load_config(config_path)
-        self.rag_context = self._load_rag_documents()
+        # Preloaded config / RAG context can be injected (service mode reuses them across jobs)
+        with self.metrics.span("config_load"):
+            self.config = config if config is not None else self._load_config(config_path)
+        with self.metrics.span("rag_load"):
+            self.rag_context = rag_context if rag_context is not None else self._load_rag_documents()
         self.start_time = time.time()
         self.analyzed_count = 0
         self.success_count = 0
         self.fail_count = 0
         self.selected_model = "unknown"
+        self.temperature = 0.0
+        self.cache = None  # LLMResponseCache, set up in initialize()
+        self.client = None  # RateLimitedLLM around self.llm, built on first call
+        self.client_options = {}  # rpm / tpm / max_retries / timeout for the client
         self.analysis_stats = []  # Store execution stats per category
+        self._statuses = {}  # category -> Status of its latest stat
+        self.llm_calls = 0  # Requests actually sent to the LLM (batched categories share one)
+        self._stats_lock = threading.Lock()  # Guards counters/stats across worker threads
         
         # Security: Robust Env Loading & Masked Logging
         api_key = os.environ.get("GOOGLE_API_KEY")
         self.mock_mode = False
 
-    def initialize(self, use_mock=False):
+    def initialize(self, use_mock=False, use_cache=True, rpm=None, tpm=None, max_retries=4, timeout=120.0,
+                   refresh_models=False):
         self.mock_mode = use_mock
+        self.client_options = {"rpm": rpm, "tpm": tpm, "max_retries": max_retries, "timeout": timeout}
         api_key = os.environ.get("GOOGLE_API_KEY")
 
         if self.mock_mode:
@@ -42,6 +97,12 @@ class VOCAnalyzer:
             self.selected_model = "mock-model"
             return
 
+        if use_cache:
+            self.cache = LLMResponseCache()
+            print(f">> [INFO] LLM response cache enabled: {self.cache.cache_dir}")
+        else:
+            print(">> [INFO] LLM response cache disabled (--no-cache).")
+
         if not api_key:
             print(">> [CRITICAL] GOOGLE_API_KEY not found in environment variables.")
             print(">> Please ensure .env file exists and contains GOOGLE_API_KEY.")
@@ -53,14 +114,8 @@ class VOCAnalyzer:
             # --- Auto-Model Detection Logic ---
             self.selected_model = "gemini-1.5-flash" # Default fallback
             try:
-                genai.configure(api_key=api_key)
-                available = []
-                print(">> [INFO] Checking available models...")
-                
-                for m in genai.list_models():
-                    if 'generateContent' in m.supported_generation_methods:
-                        model_name = m.name.replace("models/", "")
-                        available.append(model_name)
+                with self.metrics.span("model_discovery"):
+                    available = self._list_available_models(api_key, refresh=refresh_models)
                 
                 # Log available models
                 try:
@@ -89,22 +144,88 @@ class VOCAnalyzer:
                 print(f">> [WARNING] Model list failed ({e}). Defaulting to {self.selected_model}")
 
             try:
+                from langchain_google_genai import ChatGoogleGenerativeAI
                 self.llm = ChatGoogleGenerativeAI(
                     model=self.selected_model,
-                    temperature=0.0,
+                    temperature=self.temperature,
                     google_api_key=api_key
                 )
             except Exception as e:
                  print(f">> [ERROR] Failed to initialize LLM: {e}.")
                  raise e
 
+    def share_runtime(self, source):
+        """Reuses an initialized analyzer's model, LLM client, caches and document index instead of initialize().
+
+        Used by service.py so jobs skip model discovery and client setup. The
+        client (and its rate limits) is shared, so its counters are service-wide.
+        """
+        self.mock_mode = source.mock_mode
+        self.selected_model = source.selected_model
+        self.temperature = source.temperature
+        self.client_options = dict(source.client_options)
+        self.cache = source.cache
+        if getattr(source, "llm", None) is not None:
+            self.llm = source.llm
+            self.client = source._get_client()
+        self._token_counter = source._token_counter
+        if source.doc_index is not None:
+            self.doc_index = source.doc_index
+        elif not source.mock_mode and source.rag_top_k <= 0:
+            self.rag_top_k = 0  # The index is unavailable; don't retry it on every job
+
+    def close(self):
+        """Stops the trace writer and delivers pending notifications (long-lived processes create one analyzer per job)."""
+        if self._trace_writer:
+            self._trace_writer.close()
+        if self._notifier:
+            self._notifier.close()
+            print(f">> [INFO] Notifications: {self._notifier.summary()}")
+
+    @staticmethod
+    def safe_project_name(project_name):
+        """Project name reduced to the characters allowed in results/<project>."""
+        safe_project_name = "".join([c for c in project_name if c.isalnum() or c in ('-', '_')]).strip()
+        return safe_project_name or "default_analysis"
+
+    def _list_available_models(self, api_key, refresh=False):
+        """Models supporting generateContent, cached on disk for MODEL_CACHE_TTL per API key."""
+        key_id = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+        if not refresh:
+            try:
+                with open(self.MODEL_CACHE_PATH, "r", encoding="utf-8") as f:
+                    cached = json.load(f)
+                age = time.time() - cached.get("fetched", 0)
+                if cached.get("key_id") == key_id and age < self.MODEL_CACHE_TTL and cached.get("models"):
+                    print(f">> [INFO] Using cached model list ({int(age // 60)} min old, --refresh-models to re-check).")
+                    return cached["models"]
+            except (OSError, ValueError):
+                pass
+
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        available = []
+        print(">> [INFO] Checking available models...")
+        
+        for m in genai.list_models():
+            if 'generateContent' in m.supported_generation_methods:
+                model_name = m.name.replace("models/", "")
+                available.append(model_name)
+
+        if available:
+            try:
+                os.makedirs(os.path.dirname(self.MODEL_CACHE_PATH), exist_ok=True)
+                tmp_path = f"{self.MODEL_CACHE_PATH}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"key_id": key_id, "fetched": time.time(), "models": available}, f)
+                os.replace(tmp_path, self.MODEL_CACHE_PATH)
+            except OSError as e:
+                print(f">> [WARNING] Failed to cache model list: {e}")
+        return available
+
     def _ensure_directories(self):
         """Creates necessary directories if they don't exist."""
-        safe_project_name = "".join([c for c in self.project_name if c.isalnum() or c in ('-', '_')]).strip()
-        if not safe_project_name:
-            safe_project_name = "default_analysis"
-        
-        self.project_name = safe_project_name
+        self.project_name = self.safe_project_name(self.project_name)
         
         dirs = [
             "data/raw", 
@@ -137,53 +258,165 @@ class VOCAnalyzer:
                         print(f"Failed to read doc {file}: {e}")
         return "\n\n".join(context)
 
-    def _log_trace(self, category, input_data, prompt_text, response_text):
-        """Logs the analysis trace to detailed files."""
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        base_path = f"results/{self.project_name}/logs"
-        
-        # 1. Main Trace Log (Summary)
-        log_filename = f"{base_path}/trace_{timestamp}_{category}.log"
+    def _prepare_rag_index(self):
+        """Syncs the persistent vector index over data/docs. Falls back to full-context RAG on failure."""
+        if self.rag_top_k <= 0 or self.doc_index is not None:
+            return
         try:
-            with open(log_filename, "w", encoding="utf-8") as f:
-                f.write(f"=== [Step 1: Raw Input] ===\n")
-                f.write(f"{input_data}\n\n")
-                f.write(f"=== [Step 2: Constructed Prompt Used] ===\n")
-                f.write(f"(See {timestamp}_{category}_prompt.txt for full content)\n\n")
-                f.write(f"=== [Step 3: AI Raw Response] ===\n")
-                f.write(f"{response_text}\n")
+            with self.metrics.span("rag_index_sync"):
+                self.doc_index = DocumentIndex()
+                added, removed = self.doc_index.sync()
+            print(f">> [INFO] Vector store synced: {self.doc_index.count()} chunks "
+                  f"(+{len(added)} / -{len(removed)} files re-indexed)")
         except Exception as e:
-            print(f"Failed to write summary log: {e}")
+            print(f">> [WARNING] Vector store unavailable ({e}). Using full RAG context.")
+            self.doc_index = None
+            self.rag_top_k = 0
 
-        # 2. Detailed Prompt Log
-        prompt_filename = f"{base_path}/{timestamp}_{category}_prompt.txt"
-        try:
-            with open(prompt_filename, "w", encoding="utf-8") as f:
-                f.write(prompt_text)
-        except Exception as e:
-            print(f"Failed to write prompt log: {e}")
+    def _retrieve_rag_context(self, groups):
+        """Top-k guideline chunks relevant to [(category, reviews_df)] (or every doc without an index)."""
+        if not self.doc_index:
+            return self.rag_context
+        seen = set()
+        blocks = []
+        for category_name, reviews_df in groups:
+            keywords = (self.config.get('teams', {}).get(category_name) or {}).get('keywords', [])
+            query = " ".join([category_name, *map(str, keywords), *reviews_df['review_text'].head(5).astype(str)])
+            for hit in self.doc_index.query(query, top_k=self.rag_top_k):
+                if (hit['source'], hit['chunk']) not in seen:
+                    seen.add((hit['source'], hit['chunk']))
+                    blocks.append(f"[{hit['source']}#{hit['chunk']}]\n{hit['text']}")
+        return "\n\n".join(blocks)
+
+    @property
+    def token_counter(self):
+        """Lazily created TokenCounter shared by all categories."""
+        with self._stats_lock:
+            if self._token_counter is None:
+                self._token_counter = TokenCounter()
+            return self._token_counter
+
+    @property
+    def trace_writer(self):
+        """Background writer for this run's trace JSONL, started on first use."""
+        with self._stats_lock:
+            if self._trace_writer is None:
+                self._trace_writer = TraceWriter(f"results/{self.project_name}/logs", compress=self.compress_logs)
+            return self._trace_writer
+
+    @property
+    def notifier(self):
+        """Webhook dispatcher configured from the `notifications` block of teams.yaml, created on first use."""
+        with self._stats_lock:
+            if self._notifier is None:
+                options = (self.config or {}).get('notifications') or {}
+                self._notifier = NotificationDispatcher(
+                    rate_per_minute=options.get('rate_per_minute', 30),
+                    max_retries=options.get('max_retries', 3),
+                    dead_letter_path=f"results/{self.project_name}/logs/notifications_dead_letter.jsonl",
+                )
+            return self._notifier
+
+    def _queue_alerts(self, team_groups, previous_counts, headlines, ratings):
+        """Evaluates the teams.yaml threshold rules and hands one coalesced alert per team to the notifier.
 
-        # 3. Raw Response JSON
-        res_filename = f"{base_path}/{timestamp}_{category}_raw_res.json"
+        `ratings` holds each team's exact rating stats over all matched reviews
+        (also in streaming mode), and `headlines` its section's first '###'
+        line, sent as the alert detail. Delivery happens on the notifier's
+        background threads; close() waits for it.
+        """
+        teams = (self.config or {}).get('teams', {})
+        defaults = ((self.config or {}).get('notifications') or {}).get('rules') or {}
+        for team, _, count in team_groups:
+            info = teams.get(team) or {}
+            rules = {**defaults, **(info.get('alerts') or {})}
+            if not rules:
+                continue
+            previous = previous_counts.get(team)
+            alerts = evaluate_alerts(rules, {
+                "count": count,
+                **ratings.get(team, {}),
+                "change_pct": (count - previous) / previous * 100 if previous else None,
+            })
+            for alert in alerts:
+                self.notifier.add(team, info.get('webhook_url'), alert, detail=headlines.get(team))
+        queued = self.notifier.dispatch(title=self.project_name)
+        if queued:
+            print(f">> [INFO] Queued {queued} team alert(s) for delivery.")
+
+    def _log_trace(self, category, input_data, prompt_text, response_text, **fields):
+        """Queues the analysis trace (input, prompt, response) for the background log writer.
+
+        All records of a run go to results/<project>/logs/trace_<run_id>.jsonl;
+        `python -m utils.trace_reader` rebuilds the per-file view for auditing.
+        Extra `fields` are stored in the record as-is. Returns the record id.
+        """
         try:
-            with open(res_filename, "w", encoding="utf-8") as f:
-                json.dump({"category": category, "response": response_text}, f, ensure_ascii=False, indent=2)
+            with self.metrics.span("trace_log"):
+                return self.trace_writer.write({
+                    "project": self.project_name,
+                    "category": category,
+                    "model": self.selected_model,
+                    "input": input_data,
+                    "prompt": prompt_text,
+                    "response": response_text,
+                    **fields,
+                })
         except Exception as e:
-            print(f"Failed to write response json: {e}")
+            print(f"Failed to queue trace log: {e}")
+            return None
 
     def _save_result(self, content, filename="final_report.md"):
         """Saves the final report to results/project_name."""
         filepath = f"results/{self.project_name}/{filename}"
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(content)
+        with self.metrics.span("report_save"):
+            with open(filepath, "w", encoding="utf-8") as f:
+                f.write(content)
         return filepath
 
     def _generate_stats_table(self):
         """Generates a markdown table row for each analyzed category."""
         rows = []
         for stat in self.analysis_stats:
-            rows.append(f"| {stat['Category']} | {stat['Status']} | {stat['Timestamp']} | [Logs](logs/) |")
-        return "\n".join(rows) if rows else "| No data | - | - | - |"
+            tokens = f"{stat['PromptTokens']:,} / {stat['ResponseTokens']:,}" if 'PromptTokens' in stat else "-"
+            latency = f"{stat['Latency']:.2f}s" if 'Latency' in stat else "-"
+            rows.append(f"| {stat['Category']} | {stat.get('Cases', '-')} | {stat['Status']} | {stat.get('Cache', '-')} | {tokens} | {stat.get('Retries', '-')} | {latency} | {stat['Timestamp']} | [Logs](logs/) |")
+        return "\n".join(rows) if rows else "| No data | - | - | - | - | - | - | - | - |"
+
+    def _generate_token_summary(self):
+        """Aggregate token usage and estimated cost of the calls actually sent (cache hits are free)."""
+        billed = [stat for stat in self.analysis_stats if stat.get('Billed')]
+        if not billed:
+            return "**Token Usage**: no LLM calls sent"
+        prompt_tokens = sum(stat['PromptTokens'] for stat in billed)
+        response_tokens = sum(stat['ResponseTokens'] for stat in billed)
+        cost = estimate_cost(self.selected_model, prompt_tokens, response_tokens)
+        return (f"**Token Usage**: {prompt_tokens:,} prompt + {response_tokens:,} response tokens "
+                f"over {self.llm_calls} calls (est. ${cost:.4f}, counter: {self.token_counter.name})")
+
+    def _generate_team_statistics(self):
+        """Per-team correlation table computed from the routing matrix of the last full load."""
+        if not self.team_stats:
+            return ""
+        if self._routed is None:
+            print(">> [WARNING] Team statistics need the full review set; skipped in streaming mode.")
+            return ""
+        with self.metrics.span("team_statistics"):
+            return self._compute_team_statistics()
+
+    def _compute_team_statistics(self):
+        from sentiment_engine import SentimentCache, SentimentScorer
+        from statistics_engine import format_statistics_table, group_statistics
+
+        df, membership = self._routed
+        if 'sentiment_score' not in df.columns:
+            # Local lexicon scores, cached by review hash across runs
+            scorer = SentimentScorer(cache=SentimentCache())
+            df = df.assign(sentiment_score=scorer.score(df['review_text']))
+            scorer.cache.save()
+            print(f">> [INFO] Sentiment scored: {scorer.summary()}")
+        stats = group_statistics(df, membership)
+        return "# 📈 Team Statistics (Rating vs Sentiment)\n" + format_statistics_table(stats)
 
     def _generate_verification_trail(self):
         """Generates collapsible verification sections."""
@@ -198,15 +431,8 @@ class VOCAnalyzer:
 {stat.get('InputSnippet', 'N/A')}
 ```
 
-#### 2. Actual Prompt Used
-```text
-{stat.get('PromptSnippet', 'N/A')}
-```
-
-#### 3. Raw AI Response
-```markdown
-{stat.get('ResultUtils', 'N/A')}
-```
+#### 2. Prompt & Raw AI Response
+{self._trace_reference(stat.get('TraceId'))}
 </details>
 <hr>
 """)
@@ -218,19 +444,21 @@ class VOCAnalyzer:
 
 
     def update_readme(self, report_path):
-        """Updates README.md to link to the latest analysis."""
+        """Updates README.md to link to the latest analysis.
+
+        Only the first lines of the report are read for the preview. The marker
+        region is replaced in a temp file that is then moved over README.md, so
+        the README is never left half-written.
+        """
         readme_path = "README.md"
         if not os.path.exists(readme_path):
             print(">> [WARNING] README.md not found. Skipping sync.")
             return
 
         try:
+            # Create a summary (first 15 lines of report)
             with open(report_path, 'r', encoding='utf-8') as f:
-                report_content = f.read()
-            
-            # Create a summary (first 10 lines of report)
-            summary_lines = report_content.split('\n')[:15]
-            summary = "\n".join(summary_lines)
+                summary = "".join(islice(f, 15)).rstrip("\n")
             
             # Construct the injection block (Prettier Format)
             injection = f"""<!-- LATEST_ANALYSIS_START -->
@@ -253,32 +481,138 @@ class VOCAnalyzer:
 ---
 <!-- LATEST_ANALYSIS_END -->"""
 
-            with open(readme_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Replace logic
-            start_marker = "<!-- LATEST_ANALYSIS_START -->"
-            end_marker = "<!-- LATEST_ANALYSIS_END -->"
-            
-            if start_marker in content and end_marker in content:
-                # Replace existing block
-                new_content = content.split(start_marker)[0] + injection + content.split(end_marker)[1]
-            else:
-                # Append to end if markers don't exist
-                new_content = content + "\n\n" + injection
-            
-            with open(readme_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            with _README_LOCK:
+                with open(readme_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                
+                # Replace logic
+                start_marker = "<!-- LATEST_ANALYSIS_START -->"
+                end_marker = "<!-- LATEST_ANALYSIS_END -->"
+                start = content.find(start_marker)
+                end = content.find(end_marker, start) if start != -1 else -1
+                
+                if end != -1:
+                    # Replace existing block
+                    new_content = content[:start] + injection + content[end + len(end_marker):]
+                else:
+                    # Append to end if markers don't exist
+                    new_content = content + "\n\n" + injection
+                
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(readme_path)), suffix=".tmp")
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        f.write(new_content)
+                    os.chmod(tmp_path, os.stat(readme_path).st_mode & 0o777)  # mkstemp creates files as 0600
+                    os.replace(tmp_path, readme_path)
+                except BaseException:
+                    os.remove(tmp_path)
+                    raise
                 
             print(f">> [INFO] README.md updated with latest analysis.")
             
         except Exception as e:
             print(f">> [ERROR] Failed to update README: {e}")
 
-    def analyze_group(self, category_name, reviews_df):
-        count = len(reviews_df)
-        combined_text = "\n".join(reviews_df['review_text'].head(20).tolist())
-        rag_section = f"\n[Guideline & Context from Query]\n{self.rag_context}\n" if self.rag_context else ""
+    def _get_client(self):
+        """Rate-limited, retrying client around self.llm (created on first use)."""
+        from langchain_core.output_parsers import StrOutputParser
+        counter = self.token_counter
+        with self._stats_lock:
+            if self.client is None:
+                self.client = RateLimitedLLM(self.llm | StrOutputParser(), count_tokens=counter.count, **self.client_options)
+            return self.client
+
+    def _invoke_llm(self, formatted_prompt, label):
+        """Sends a prompt through the response cache and the rate-limited LLM client.
+
+        Returns a dict with result, succeeded, cache ("Hit"/"Miss"/"-"),
+        billed, retries and throttle_wait_s.
+        """
+        call = {"result": None, "succeeded": False, "cache": "-", "billed": False, "retries": 0, "throttle_wait_s": 0.0}
+        cache_key = None
+        if self.cache:
+            cache_key = self.cache.make_key(self.selected_model, formatted_prompt, self.temperature)
+            call["result"] = self.cache.get(cache_key)
+            call["cache"] = "Hit" if call["result"] is not None else "Miss"
+            self.metrics.inc("llm_cache", result=call["cache"].lower())
+        if call["result"] is not None:
+            call["succeeded"] = True
+            return call
+
+        client = self._get_client()
+        with self._stats_lock:
+            self.llm_calls += 1
+        call["billed"] = True
+        try:
+            with self.metrics.span("llm_call"):
+                call["result"], info = client.invoke(formatted_prompt)
+            call.update(succeeded=True, retries=info["retries"], throttle_wait_s=info["throttle_wait_s"])
+        except Exception as e:
+            call["result"] = f"Error during LLM execution: {e}"
+            info = getattr(e, "call_info", {})
+            call.update(retries=info.get("retries", 0), throttle_wait_s=info.get("throttle_wait_s", 0.0))
+            self.metrics.inc("llm_errors")
+            self.metrics.inc("llm_retries", call["retries"])
+            return call
+        self.metrics.inc("llm_retries", call["retries"])
+        if cache_key:
+            self.cache.put(cache_key, call["result"], model=self.selected_model, category=label)
+        return call
+
+    def _select_reviews(self, reviews_df, count, budget):
+        """Collapses near-duplicate reviews and fits the largest clusters into `budget` tokens.
+
+        Returns (prompt_lines, clusters). Each line carries its cluster's exact
+        count and share, so the LLM derives ratios from data; clusters that do
+        not fit are summarized in one closing line.
+        """
+        clusters = cluster_reviews(reviews_df['review_text'])
+        lines, _ = fit_reviews(format_cluster_lines(clusters, count), self.token_counter, budget)
+        omitted = clusters.iloc[len(lines):]
+        if len(omitted):
+            lines.append(f"(+{len(omitted)} more clusters, {omitted['share'].sum():.1%} of reviews, omitted for length)")
+        return lines, clusters
+
+    def _build_audit_section(self, result, clusters, rag_section, trace_id):
+        """Appends the inline verification table to an analysis result.
+
+        The full prompt and raw response live once in the run trace; the table
+        references the record (`python -m utils.trace_reader <trace> --id <id>`).
+        """
+        raw_reviews_preview = "\n".join(
+            f"- {row.representative} ({row.count}건)" for row in clusters.head(5).itertuples(index=False)
+        )
+        
+        audit_section = f"""
+#### 🔍 Analysis Audit (검증 데이터)
+| 단계 | 내용 |
+| :--- | :--- |
+| **Raw Data** | {raw_reviews_preview} |
+| **RAG Context** | {rag_section[:200]}... (Refer to full docs) |
+| **Prompt & Response** | {self._trace_reference(trace_id)} |
+<hr>
+"""
+
+        # Combine Result with Audit
+        return result + "\n\n" + audit_section
+
+    def _trace_reference(self, trace_id):
+        if not trace_id:
+            return "(trace not recorded)"
+        trace_file = os.path.basename(self.trace_writer.path)
+        return f"`{trace_id}` in [{trace_file}](logs/{trace_file})"
+
+    def _build_prompt(self, category_name, reviews_df, count):
+        """Assembles one category's prompt within the token budget.
+
+        Returns (formatted_prompt, selected_reviews, clusters, rag_section).
+        """
+        with self.metrics.span("prompt_build"):
+            return self._format_prompt(category_name, reviews_df, count)
+
+    def _format_prompt(self, category_name, reviews_df, count):
+        rag_context = self._retrieve_rag_context([(category_name, reviews_df)])
+        rag_section = f"\n[Guideline & Context from Query]\n{rag_context}\n" if rag_context else ""
         
         prompt_template_str = """
         You are a VOC Analyst. STRICT adherence to output format and tone is required.
@@ -288,10 +622,12 @@ class VOCAnalyzer:
         1. Classify the reviews strictly based on the context above.
         2. Tone: summarize the issue in 'Eum-seum-che'.
         3. Do not add any introductory or concluding remarks. Only the Markdown.
+        4. Each review line stands for a cluster of near-identical reviews, prefixed with its count and share
+           "(N건, S%)". Compute 비율 from these counts instead of estimating.
         [Input Data]
         Category: {category_name}
-        Review Count: {count}
-        Reviews:
+        Review Count: {count}{trend_section}
+        Reviews (clustered, largest first):
         {reviews}
         [Strict Output Format (Markdown)]
         ### N [{category_name}] [Main Issue] Ratio%, {count} cases
@@ -303,68 +639,286 @@ class VOCAnalyzer:
         - 개선 방향 : (Actionable suggestion)
         """
         
-        prompt = PromptTemplate(
-            template=prompt_template_str,
-            input_variables=["category_name", "reviews", "count", "rag_section"]
+        # Token budget: fill whatever the fixed prompt parts leave with as many reviews as fit
+        counter = self.token_counter
+        trend_section = self._trend_section(category_name)
+        base_tokens = counter.count(prompt_template_str.format(
+            category_name=category_name, reviews="", count=count, rag_section=rag_section, trend_section=trend_section
+        ))
+        selected_reviews, clusters = self._select_reviews(
+            reviews_df, count, max(self.prompt_token_budget - base_tokens, 0)
         )
-        
-        formatted_prompt = prompt.format(
+        combined_text = "\n".join(selected_reviews)
+
+        formatted_prompt = prompt_template_str.format(
             category_name=category_name, 
             reviews=combined_text, 
             count=count,
-            rag_section=rag_section
+            rag_section=rag_section,
+            trend_section=trend_section
         )
+        return formatted_prompt, selected_reviews, clusters, rag_section
+
+    def analyze_group(self, category_name, reviews_df, total_count=None):
+        # In streaming mode reviews_df only holds samples; total_count is the exact match count
+        count = total_count if total_count is not None else len(reviews_df)
+        started = time.perf_counter()
+        formatted_prompt, selected_reviews, clusters, rag_section = self._build_prompt(category_name, reviews_df, count)
+        combined_text = "\n".join(selected_reviews)
+        counter = self.token_counter
+        prompt_tokens = counter.count(formatted_prompt)
         
-        result = ""
-        try:
-            chain = prompt | self.llm | StrOutputParser()
-            result = chain.invoke({
-                "category_name": category_name, 
-                "reviews": combined_text, 
-                "count": count, 
-                "rag_section": rag_section
-            })
-            self.success_count += 1
-        except Exception as e:
-            result = f"Error during LLM execution: {e}"
-            self.fail_count += 1
-        
-        self.analyzed_count += 1
+        call = self._invoke_llm(formatted_prompt, category_name)
+        result, succeeded = call["result"], call["succeeded"]
         
-        # Record Stats
+        trace_id = self._log_trace(category_name, combined_text, formatted_prompt, result)
+
         # Record Stats & Verification Data
-        self.analysis_stats.append({
+        self._record_stat({
             "Category": category_name,
             "Status": "Success" if result and "Error" not in result[:20] else "Failed",
+            "Cache": call["cache"],
             "Timestamp": datetime.datetime.now().strftime("%H:%M:%S"),
+            "Latency": time.perf_counter() - started,
+            "PromptChars": len(formatted_prompt),
+            "ResponseChars": len(result or ""),
+            "ReviewsSent": len(selected_reviews),
+            "PromptTokens": prompt_tokens,
+            "ResponseTokens": counter.count(result) if succeeded else 0,
+            "Billed": call["billed"],
+            "Retries": call["retries"],
+            "ThrottleWait": call["throttle_wait_s"],
             "InputSnippet": combined_text[:200] + "..." if len(combined_text) > 200 else combined_text,
-            "PromptSnippet": formatted_prompt,
-            "ResultUtils": result
+            "TraceId": trace_id
+        }, succeeded=succeeded)
+
+        return self._build_audit_section(result, clusters, rag_section, trace_id)
+
+    def analyze_batch(self, groups):
+        """Analyzes several small categories in one LLM call.
+
+        `groups` is [(category, reviews_df, count)]. The response is split back
+        into per-category sections on the delimiter lines; any category whose
+        section is missing or malformed is re-analyzed with analyze_group.
+        Returns {category: section}.
+        """
+        names = [category for category, _, _ in groups]
+        started = time.perf_counter()
+        rag_context = self._retrieve_rag_context([(category, reviews) for category, reviews, _ in groups])
+        rag_section = f"\n[Guideline & Context from Query]\n{rag_context}\n" if rag_context else ""
+
+        prompt_template_str = """
+        You are a VOC Analyst. STRICT adherence to output format and tone is required.
+        [RAG Context]
+        {rag_section}
+        [Instructions]
+        1. Classify the reviews strictly based on the context above.
+        2. Tone: summarize the issue in 'Eum-seum-che'.
+        3. Do not add any introductory or concluding remarks. Only the Markdown.
+        4. Each review line stands for a cluster of near-identical reviews, prefixed with its count and share
+           "(N건, S%)". Compute 비율 from these counts instead of estimating.
+        5. Analyze EACH category below independently. Wrap each category's Markdown in its delimiter lines,
+           copied exactly: a line <<<CATEGORY: name>>> before it and a line <<<END CATEGORY>>> after it.
+        [Input Data]
+        {category_blocks}
+        [Strict Output Format (Markdown, once per category)]
+        <<<CATEGORY: (category)>>>
+        ### N [(category)] [Main Issue] Ratio%, (count) cases
+        - 이슈 요약 : (Summarize in 'Eum-seum-che', max 30 chars)
+        - 감정 : (1-2 keywords)
+        - | 불만 유형 | 비율 | 대표 예시 |
+          | :--- | :--- | :--- |
+          | (Type A) | (Approx %) | "(Example)" |
+        - 개선 방향 : (Actionable suggestion)
+        <<<END CATEGORY>>>
+        """
+
+        def category_block(category, count, reviews_text):
+            trend = self._trends.get(category)
+            trend_line = f"\n{format_trend_line(trend)}" if trend else ""
+            return f"<<<CATEGORY: {category}>>>\nCategory: {category}\nReview Count: {count}{trend_line}\nReviews (clustered, largest first):\n{reviews_text}\n<<<END CATEGORY>>>"
+
+        # Split the review budget evenly across the packed categories
+        counter = self.token_counter
+        skeleton = prompt_template_str.format(
+            rag_section=rag_section,
+            category_blocks="\n".join(category_block(category, count, "") for category, _, count in groups)
+        )
+        per_category_budget = max(self.prompt_token_budget - counter.count(skeleton), 0) // len(groups)
+        selected, clusters = {}, {}
+        for category, reviews, count in groups:
+            selected[category], clusters[category] = self._select_reviews(reviews, count, per_category_budget)
+        formatted_prompt = prompt_template_str.format(
+            rag_section=rag_section,
+            category_blocks="\n".join(
+                category_block(category, count, "\n".join(selected[category])) for category, _, count in groups
+            )
+        )
+        prompt_tokens = counter.count(formatted_prompt)
+        self.metrics.observe("prompt_build", time.perf_counter() - started)
+
+        label = "batch_" + "+".join(names)
+        print(f"Analyzing batch: {', '.join(names)} (1 call)...")
+        call = self._invoke_llm(formatted_prompt, label)
+        result, succeeded = call["result"], call["succeeded"]
+        parsed = self._split_batch_response(result, names) if succeeded else {}
+        # The shared prompt and raw response are logged once, parsed or not; each section references this record
+        missing = [category for category in names if category not in parsed]
+        trace_id = self._log_trace(label, "\n".join(
+            f"[{category}]\n" + "\n".join(selected[category]) for category in names
+        ), formatted_prompt, result, batch={
+            "categories": names,
+            "call_succeeded": succeeded,
+            "unparsed": missing,
         })
-        
-        self._log_trace(category_name, combined_text, formatted_prompt, result)
-        
 
-        
-        
-        # Construct Audit Trail
-        raw_reviews_preview = "\n".join([f"- {r}" for r in reviews_df['review_text'].head(5).tolist()])
-        
-        audit_section = f"""
-#### 🔍 Analysis Audit (검증 데이터)
-| 단계 | 내용 |
-| :--- | :--- |
-| **Raw Data** | {raw_reviews_preview} |
-| **RAG Context** | {rag_section[:200]}... (Refer to full docs) |
-| **Full Prompt** | <details><summary>View Prompt</summary>\n\n```text\n{formatted_prompt}\n```\n</details> |
-| **Raw Response** | <details><summary>View Response</summary>\n\n```text\n{result}\n```\n</details> |
-<hr>
-"""
+        sections = {}
+        fallback = []
+        for category, reviews, count in groups:
+            section = parsed.get(category)
+            if section is None:
+                fallback.append((category, reviews, count))
+                continue
+            reviews_text = "\n".join(selected[category])
+            self._record_stat({
+                "Category": category,
+                "Status": "Success (Batched)",
+                "Cache": call["cache"],
+                "Timestamp": datetime.datetime.now().strftime("%H:%M:%S"),
+                "Latency": time.perf_counter() - started,
+                "PromptChars": len(formatted_prompt) // len(groups),
+                "ResponseChars": len(section),
+                "ReviewsSent": len(selected[category]),
+                # The shared call is attributed evenly so per-category totals add up
+                "PromptTokens": prompt_tokens // len(groups),
+                "ResponseTokens": counter.count(section),
+                "Billed": call["billed"],
+                "Retries": call["retries"],
+                "ThrottleWait": call["throttle_wait_s"],
+                "InputSnippet": reviews_text[:200] + "..." if len(reviews_text) > 200 else reviews_text,
+                "TraceId": trace_id
+            })
+            sections[category] = self._build_audit_section(section, clusters[category], rag_section, trace_id)
 
-        # Combine Result with Audit
-        final_output = result + "\n\n" + audit_section
+        if fallback:
+            reason = "call failed" if not succeeded else "unparseable sections"
+            print(f">> [WARNING] Batch {reason} for {[c for c, _, _ in fallback]}. Falling back to individual calls.")
+            if self.cache and succeeded and not parsed:
+                # Don't keep serving a response we could not parse at all
+                self.cache.discard(self.cache.make_key(self.selected_model, formatted_prompt, self.temperature))
+            for category, reviews, count in fallback:
+                sections[category] = self.analyze_group(category, reviews, total_count=count)
+        return sections
 
-        return final_output
+    @staticmethod
+    def _split_batch_response(result, names):
+        """Parses <<<CATEGORY: name>>> ... <<<END CATEGORY>>> blocks into {name: markdown}."""
+        parsed = {}
+        pattern = re.compile(r"<<<\s*CATEGORY:\s*(.+?)\s*>>>\s*(.*?)\s*<<<\s*END CATEGORY\s*>>>", re.DOTALL)
+        for match in pattern.finditer(result or ""):
+            name, body = match.group(1).strip(), match.group(2).strip()
+            # Only accept well-formed sections for categories we actually asked about
+            if name in names and name not in parsed and body.startswith("###") and f"[{name}]" in body:
+                parsed[name] = body
+        return parsed
+
+    def _record_stat(self, stat, succeeded=True):
+        """Appends a category stat and updates counters (thread-safe)."""
+        with self._stats_lock:
+            if succeeded:
+                self.success_count += 1
+            else:
+                self.fail_count += 1
+            self.analyzed_count += 1
+            self.analysis_stats.append(stat)
+            self._statuses[stat["Category"]] = stat["Status"]
+        self.metrics.inc("categories", status=stat["Status"])
+        self.metrics.record_category(stat["Category"], **{
+            metric: stat[key] for key, metric in (
+                ("Latency", "latency_seconds"), ("PromptChars", "prompt_chars"), ("ResponseChars", "response_chars"),
+                ("PromptTokens", "prompt_tokens"), ("ResponseTokens", "response_tokens"),
+                ("ReviewsSent", "reviews_sent"), ("Retries", "retries"),
+            ) if key in stat
+        })
+
+    def _analyze_category(self, team, team_reviews, count):
+        """Runs the mock or real analysis for one category and returns its section."""
+        print(f"Analyzing category: {team} ({count} reviews)...")
+        if self.mock_mode:
+            started = time.perf_counter()
+            section = self._mock_analyze_group(team)
+            # Manually add stats for mock
+            self._record_stat({
+                "Category": team,
+                "Status": "Success (Mock)",
+                "Timestamp": datetime.datetime.now().strftime("%H:%M:%S"),
+                "Latency": time.perf_counter() - started,
+                "InputSnippet": "(Mock Data) Review 1...",
+            })
+            return section
+        return self.analyze_group(team, team_reviews, total_count=count)
+
+    def _plan_units(self, team_groups):
+        """Groups categories into work units: singles, plus batches of small teams when enabled."""
+        if self.mock_mode or self.batch_threshold <= 0 or self.batch_size <= 1:
+            return [[group] for group in team_groups]
+        small = [group for group in team_groups if group[2] <= self.batch_threshold]
+        units = [[group] for group in team_groups if group[2] > self.batch_threshold]
+        for i in range(0, len(small), self.batch_size):
+            units.append(small[i:i + self.batch_size])
+        return units
+
+    def _analyze_unit(self, unit):
+        """Runs one work unit. Returns {team: section}."""
+        if len(unit) == 1:
+            team, reviews, count = unit[0]
+            return {team: self._analyze_category(team, reviews, count)}
+        return self.analyze_batch(unit)
+
+    def _run_categories(self, team_groups, progress=None, on_section=None):
+        """Analyzes categories on a bounded worker pool. Returns {team: section}.
+
+        With `on_section`, each finished section is handed to
+        `on_section(team, section)` (on the calling thread) instead of being
+        kept, and an empty dict is returned. `progress(done, total)` is
+        updated as work units finish.
+        """
+        units = self._plan_units(team_groups)
+        batched = sum(len(unit) for unit in units if len(unit) > 1)
+        if batched:
+            print(f">> [INFO] Packing {batched} small categories into {sum(len(u) > 1 for u in units)} batched calls.")
+
+        sections = {}
+        done = 0
+
+        def finished(unit_sections):
+            nonlocal done
+            done += len(unit_sections)
+            if on_section:
+                for team, section in unit_sections.items():
+                    on_section(team, section)
+            else:
+                sections.update(unit_sections)
+            if progress:
+                progress(done, len(team_groups))
+
+        workers = min(self.max_workers, len(units))
+        if workers <= 1:
+            for unit in units:
+                finished(self._analyze_unit(unit))
+            return sections
+
+        print(f">> [INFO] Analyzing {len(team_groups)} categories with {workers} workers.")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for future in as_completed([pool.submit(self._analyze_unit, unit) for unit in units]):
+                finished(future.result())
+        return sections
+
+    def _context_key(self):
+        """Hash of everything besides the reviews that a rendered section depends on."""
+        settings = [self.selected_model, self.temperature, self.rag_top_k, self.prompt_token_budget,
+                    self.batch_threshold, self.batch_size, self.rag_context]
+        return hash_text(":".join(str(value) for value in settings))
 
     def _mock_analyze_group(self, category_name):
         """Returns a dummy analysis result for testing."""
@@ -382,83 +936,341 @@ class VOCAnalyzer:
 | :--- | :--- |
 | **Raw Data** | - Mock Review 1\n- Mock Review 2 |
 | **RAG Context** | Mock Context... |
-| **Full Prompt** | <details><summary>View Prompt</summary>\n\n```text\n(Mock Prompt)\n```\n</details> |
-| **Raw Response** | <details><summary>View Response</summary>\n\n```text\n{mock_result}\n```\n</details> |
+| **Prompt & Response** | (Mock mode: no LLM call) |
 <hr>
 """
         return mock_result + "\n\n" + audit_section
 
-    def generate_full_report(self, csv_path):
-        if not os.path.exists(csv_path):
-            return "Error: Data file not found."
+    def _load_team_groups(self, data_path, start_date=None, end_date=None):
+        """Reads the whole store and routes it.
+
+        Returns [(team, reviews_df, count)], review-set digests and exact
+        per-team rating stats ({team: {mean_rating, negative_share}}).
+        """
+        with self.metrics.span("data_read"):
+            df = (self.review_loader or load_reviews)(
+                data_path, columns=ANALYSIS_COLUMNS + (["date"] if self.trends else []),
+                start_date=start_date, end_date=end_date
+            )
+        self.metrics.inc("reviews_read", len(df))
+
+        # One vectorized pass builds the row -> team membership matrix for all teams
+        with self.metrics.span("team_routing"):
+            membership = TeamMatcher.from_config(self.config).match(df['review_text'])
+            if self.team_stats or self.trends:
+                self._routed = (df, membership)
+            team_groups = []
+            digests = {}
+            ratings = {}
+            for team in membership.columns:
+                team_reviews = df[membership[team].to_numpy()]
+                
+                if not team_reviews.empty:
+                    # Same aggregates as the streaming path, so alerts do not depend on --chunksize
+                    bucket = TeamBucket(max_samples=0)
+                    bucket.add(team_reviews)
+                    team_groups.append((team, team_reviews, len(team_reviews)))
+                    digests[team] = bucket.hasher.hexdigest()
+                    ratings[team] = bucket.rating_stats()
+        return team_groups, digests, ratings
+
+    def _stream_team_groups(self, data_path, chunksize, start_date=None, end_date=None):
+        """Chunked variant of _load_team_groups with memory bounded by chunksize."""
+        print(f">> [INFO] Streaming {data_path} in chunks of {chunksize} rows.")
+        with self.metrics.span("data_read_and_routing"):
+            buckets, total_rows = stream_team_buckets(
+                data_path, self.config, chunksize=chunksize, start_date=start_date, end_date=end_date
+            )
+        self.metrics.inc("reviews_read", total_rows)
+        print(f">> [INFO] Routed {total_rows} reviews.")
+        team_groups = []
+        digests = {}
+        ratings = {}
+        for team, bucket in buckets.items():
+            if bucket.count:
+                team_groups.append((team, bucket.sample_frame(), bucket.count))
+                digests[team] = bucket.hasher.hexdigest()
+                ratings[team] = bucket.rating_stats()
+        return team_groups, digests, ratings
+
+    def generate_full_report(self, data_path, chunksize=None, start_date=None, end_date=None):
+        """Analyzes a review CSV or date-partitioned Parquet store, optionally limited to a date window.
 
-        df = pd.read_csv(csv_path)
-        report_sections = []
+        Category sections are streamed to results/<project>/report_<ts>.md in
+        config order as they complete, so the report text is never held in
+        memory. Returns the saved report path (earlier versions returned the
+        report text; read the file instead), or None if data_path is missing.
+        """
+        if not os.path.exists(data_path):
+            print(f">> [ERROR] Data file not found: {data_path}")
+            return None
+        run_started = time.perf_counter()
         
         print(f"Starting Analysis for Project: {self.project_name} ... (Mock Mode: {self.mock_mode})")
         if self.rag_context:
             print(f"RAG Context Loaded: {len(self.rag_context)} chars")
         else:
             print("RAG Context: None loaded.")
+
+        if not self.mock_mode:
+            self._prepare_rag_index()
+        if start_date or end_date:
+            print(f">> [INFO] Date window: {start_date or '...'} ~ {end_date or '...'}")
+        if chunksize:
+            team_groups, digests, ratings = self._stream_team_groups(data_path, chunksize, start_date, end_date)
+        else:
+            team_groups, digests, ratings = self._load_team_groups(data_path, start_date, end_date)
+        header = "\n"
+        if self.trends:
+            with self.metrics.span("trend_rollup"):
+                self._update_trends(data_path, [team for team, _, _ in team_groups], chunksize, start_date, end_date)
+            if self._trends:
+                header = "\n" + format_trend_table(self._trends) + "\n\n"
+
+        timestamp = self._report_timestamp()
+        writer = ReportWriter(f"results/{self.project_name}/report_{timestamp}.md", total=len(team_groups),
+                              header=header)
+        try:
+            saved_path = self._write_report(writer, team_groups, digests, ratings)
+        except BaseException:
+            writer.abort()
+            raise
+        self.last_report_path = saved_path
         
-        for team, info in self.config.get('teams', {}).items():
-            keywords = info.get('keywords', [])
-            team_reviews = df[df['review_text'].apply(lambda x: any(k in str(x) for k in keywords))]
-            
-            if not team_reviews.empty:
-                print(f"Analyzing category: {team} ({len(team_reviews)} reviews)...")
-            if not team_reviews.empty:
-                print(f"Analyzing category: {team} ({len(team_reviews)} reviews)...")
-                if self.mock_mode:
-                    section = self._mock_analyze_group(team)
-                    # Manually add stats for mock
-                    self.analysis_stats.append({
-                        "Category": team,
-                        "Status": "Success (Mock)",
-                        "Timestamp": datetime.datetime.now().strftime("%H:%M:%S"),
-                        "InputSnippet": "(Mock Data) Review 1...",
-                        "PromptSnippet": "(Mock Prompt) ...",
-                        "ResultUtils": section
-                    })
-                else:
-                    section = self.analyze_group(team, team_reviews)
-                report_sections.append(section)
-                
-        full_report = "\n\n".join(report_sections)
+        # Sync README (No separate log report)
+        with self.metrics.span("readme_sync"):
+            self.update_readme(saved_path)
+
+        self.metrics.observe("total", time.perf_counter() - run_started)
+        self._export_metrics(timestamp)
         
-        # Merge Verification Trail (Unified Report)
-        # Note: Audit trail is now inline, so we just add the breakdown table
-        unified_report = f"""
-{full_report}
+        return saved_path
+
+    def _update_trends(self, data_path, teams, chunksize=None, start_date=None, end_date=None):
+        """Brings the source's daily rollups up to date and computes each team's trend as of the window end.
+
+        A full in-memory load that covers every day since the watermark is
+        ingested directly; otherwise only rows dated from the watermark on
+        are streamed from the source.
+        """
+        options = (self.config or {}).get('trends') or {}
+        with _ROLLUP_LOCK:
+            store = DailyRollupStore(data_path, self.config)
+            covered = not chunksize and not end_date and self._routed is not None and (
+                not start_date or (store.watermark and start_date <= store.watermark))
+            try:
+                if covered:
+                    store.update([self._routed])
+                else:
+                    store.refresh(chunksize or 100000)
+            except ValueError as e:
+                print(f">> [WARNING] Trends skipped: {e}")
+                self._trends = {}
+                return
+        print(f">> [INFO] Daily rollups: {store.summary()}")
+        if not store.watermark:
+            self._trends = {}
+            return
+        as_of = min(end_date, store.watermark) if end_date else store.watermark
+        self._trends = {
+            team: store.trend(team, as_of, spike_z=options.get('spike_z', 3.0),
+                              baseline_days=options.get('baseline_days', 28),
+                              min_spike_count=options.get('min_spike_count', 5))
+            for team in teams
+        }
+
+    def _trend_section(self, category_name):
+        """Prompt line with the category's WoW/MoM trend ('' unless --trends)."""
+        trend = self._trends.get(category_name)
+        return f"\n        {format_trend_line(trend)}" if trend else ""
+
+    def _report_timestamp(self):
+        now = datetime.datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        if os.path.exists(f"results/{self.project_name}/report_{timestamp}.md"):
+            timestamp = now.strftime("%Y%m%d_%H%M%S_%f")  # Back-to-back runs of one project (service mode)
+        return timestamp
+
+    def _write_report(self, writer, team_groups, digests, ratings):
+        """Analyzes (or reuses) every category, streaming sections to `writer`, then appends the summary.
+
+        Each section goes to the writer (and, if it succeeded, to the
+        incremental state's section file) as soon as it is done; only its
+        '###' headline is kept for alerts.
+        """
+        order = {team: i for i, (team, _, _) in enumerate(team_groups)}
+        counts = {team: count for team, _, count in team_groups}
+
+        # Incremental mode: skip teams whose review set and context are unchanged
+        state = IncrementalState(self.project_name)
+        previous_counts = {team: state.previous_count(team) for team in counts}
+        context_key = self._context_key()
+        # A section embeds its team's trend line, so a changed trend also forces re-analysis
+        fingerprints = {team: state.fingerprint(digests[team], context_key + self._trend_section(team)) for team in digests}
+        headlines = {}
+
+        def headline_of(section):
+            return next((line for line in section.splitlines() if line.startswith("###")), None)
+
+        def on_section(team, section):
+            writer.add(order[team], section)
+            headlines[team] = headline_of(section)
+            if self._statuses.get(team, "").startswith("Success"):
+                state.update(team, fingerprints[team], counts[team], section)
+
+        pending = []
+        for team, reviews, count in team_groups:
+            reused = state.reusable_section(team, fingerprints[team]) if self.incremental else None
+            if reused is None:
+                pending.append((team, reviews, count))
+                continue
+            print(f"Reusing category: {team} ({count} reviews, unchanged since last run)")
+            writer.add(order[team], reused)
+            headlines[team] = headline_of(reused)
+            self._record_stat({
+                "Category": team,
+                "Status": "Reused (Unchanged)",
+                "Timestamp": datetime.datetime.now().strftime("%H:%M:%S"),
+                "InputSnippet": "(Unchanged since last run)",
+            })
+
+        self._run_categories(pending, on_section=on_section)
+
+        # Stats are appended in completion order; restore config order for the summary
+        with self._stats_lock:
+            self.analysis_stats.sort(key=lambda stat: order.get(stat['Category'], len(order)))
+        for stat in self.analysis_stats:
+            stat['Cases'] = format_count_change(counts[stat['Category']], previous_counts[stat['Category']])
+        state.retain(counts)
+        state.save()
+        if self.notify:
+            self._queue_alerts(team_groups, previous_counts, headlines, ratings)
+
+        if self._trace_writer:
+            with self.metrics.span("trace_flush"):
+                self._trace_writer.flush()
+            print(f">> [INFO] Trace log written to {self._trace_writer.path}")
+
+        return self._close_report(writer, self._render_summary())
+
+    def _close_report(self, writer, footer):
+        """Appends the summary to the streamed report and moves it into place."""
+        with self.metrics.span("report_save"):
+            return writer.close(footer)
+
+    def analyze_selection(self, team_groups, progress=None):
+        """Analyzes already routed [(team, reviews_df, count)] (e.g. a playground selection).
+
+        Saves the report under results/<project>/ without touching README.md.
+        Returns (report, saved_path).
+        """
+        sections = self._run_categories(team_groups, progress=progress)
+        if self._trace_writer:
+            self._trace_writer.flush()
+        report = self._render_report([sections[team] for team, _, _ in team_groups])
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        self.last_report_path = self._save_result(report, f"selection_{timestamp}.md")
+        return report, self.last_report_path
+
+    def _export_metrics(self, timestamp):
+        """Writes results/<project>/metrics_<ts>.json and the metrics.prom snapshot."""
+        json_path = f"results/{self.project_name}/metrics_{timestamp}.json"
+        prom_path = f"results/{self.project_name}/metrics.prom"
+        try:
+            self.metrics.write(json_path, prom_path)
+            print(f">> [INFO] Metrics written to {json_path} ({self.metrics.summary()})")
+        except OSError as e:
+            print(f">> [WARNING] Failed to write metrics: {e}")
+
+    def _render_report(self, report_sections):
+        """Joins the category sections (in config order) with the execution summary."""
+        with self.metrics.span("report_render"):
+            return "\n" + "\n\n".join(report_sections) + self._format_summary()
+
+    def _render_summary(self):
+        """Execution summary appended after the streamed category sections."""
+        with self.metrics.span("report_render"):
+            return self._format_summary()
+
+    def _format_summary(self):
+        # Note: Audit trail is inline in each section, so we just add the breakdown table
+        summary = f"""
 
 ---
 # 📊 Execution Summary
-| Category | Status | Timestamp | Log Link |
-| :--- | :--- | :--- | :--- |
+| Category | Cases | Status | Cache | Tokens (in / out) | Retries | Latency | Timestamp | Log Link |
+| :--- | :--- | :--- | :--- | :--- | :--- | :--- | :--- | :--- |
 {self._generate_stats_table()}
+
+**LLM Cache**: {self.cache.summary() if self.cache else "disabled"}
+
+**LLM Client**: {self.client.summary() if self.client else "no calls"}
+
+{self._generate_token_summary()}
+
+{self._generate_team_statistics()}
 """
-        
-        # Save Result
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_filename = f"report_{timestamp}.md"
-        saved_path = self._save_result(unified_report, report_filename)
-        
-        # Sync README (No separate log report)
-        self.update_readme(saved_path)
-        
-        return unified_report
+        return summary
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="VOC AI Analyzer")
     parser.add_argument("--project", type=str, default="default_analysis", help="Project name for output subdirectory")
     parser.add_argument("--mock", action="store_true", help="Run in mock mode without API calls")
+    parser.add_argument("--workers", type=int, default=4, help="Max categories analyzed concurrently (1 = serial)")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the LLM, bypassing the on-disk response cache")
+    parser.add_argument("--data", type=str, default="data/raw/mock_reviews.csv", help="Review CSV or Parquet store (file or date-partitioned directory)")
+    parser.add_argument("--start-date", type=str, default=None, help="Only analyze reviews on/after this date (YYYY-MM-DD)")
+    parser.add_argument("--end-date", type=str, default=None, help="Only analyze reviews on/before this date (YYYY-MM-DD)")
+    parser.add_argument("--chunksize", type=int, default=None, help="Stream the review file in chunks of this many rows (bounded memory)")
+    parser.add_argument("--rag-top-k", type=int, default=4, help="Guideline chunks retrieved per category from data/vector_store (0 = inject all docs)")
+    parser.add_argument("--token-budget", type=int, default=8000, help="Max prompt tokens per category; reviews are added until it is filled")
+    parser.add_argument("--batch-small", type=int, default=0, help="Pack teams with at most this many reviews into shared LLM calls (0 = off)")
+    parser.add_argument("--batch-size", type=int, default=5, help="Max categories per batched LLM call")
+    parser.add_argument("--compress-logs", action="store_true", help="gzip the per-run trace JSONL")
+    parser.add_argument("--rpm", type=float, default=None, help="Max LLM requests per minute (token-bucket throttle)")
+    parser.add_argument("--tpm", type=float, default=None, help="Max prompt tokens per minute (token-bucket throttle)")
+    parser.add_argument("--max-retries", type=int, default=4, help="Retries for 429/5xx/timeout errors, with jittered exponential backoff")
+    parser.add_argument("--llm-timeout", type=float, default=120.0, help="Per-call LLM timeout in seconds")
+    parser.add_argument("--refresh-models", action="store_true", help="Ignore the cached model list and re-query the API")
+    parser.add_argument("--incremental", action="store_true", help="Only re-analyze teams whose matched reviews changed since the last run of this project")
+    parser.add_argument("--team-stats", action="store_true", help="Append per-team Pearson/Spearman, p-values, bootstrap CIs and predictive impact to the report")
+    parser.add_argument("--trends", action="store_true", help="Update daily rollups in data/rollups and add WoW/MoM trends and spikes to prompts and the report header")
+    parser.add_argument("--notify", action="store_true", help="Send teams.yaml threshold alerts to each team's webhook (Slack/Discord)")
+    parser.add_argument("--profile", action="store_true", help="Run under cProfile and dump stats to results/<project>/profile_<ts>.prof")
     
     args = parser.parse_args()
+
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
     
-    analyzer = VOCAnalyzer(project_name=args.project)
-    analyzer.initialize(use_mock=args.mock)
+    analyzer = VOCAnalyzer(
+        project_name=args.project, max_workers=args.workers, incremental=args.incremental, rag_top_k=args.rag_top_k,
+        prompt_token_budget=args.token_budget, batch_threshold=args.batch_small, batch_size=args.batch_size,
+        compress_logs=args.compress_logs, team_stats=args.team_stats, notify=args.notify, trends=args.trends
+    )
+    analyzer.initialize(
+        use_mock=args.mock, use_cache=not args.no_cache,
+        rpm=args.rpm, tpm=args.tpm, max_retries=args.max_retries, timeout=args.llm_timeout,
+        refresh_models=args.refresh_models
+    )
     
-    if os.path.exists("data/raw/mock_reviews.csv"):
-        analyzer.generate_full_report("data/raw/mock_reviews.csv")
+    if os.path.exists(args.data):
+        analyzer.generate_full_report(
+            args.data, chunksize=args.chunksize, start_date=args.start_date, end_date=args.end_date
+        )
     else:
-        print("Mock data not found. Run generate_data.py first.")
+        print(f"Review data not found at {args.data}. Run generate_data.py first.")
+    analyzer.close()
+
+    if profiler:
+        import pstats
+        profiler.disable()
+        profile_dir = f"results/{analyzer.project_name}"
+        os.makedirs(profile_dir, exist_ok=True)
+        profile_path = f"{profile_dir}/profile_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.prof"
+        profiler.dump_stats(profile_path)
+        print(f">> [INFO] cProfile stats saved to {profile_path} (view with: python -m pstats {profile_path})")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
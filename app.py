@@ -1,4 +1,157 @@
+import os
+import threading
+import time
+
 import streamlit as st
+import yaml
+
+from service import WarmState, path_signature
+from utils.query_engine import ReviewQueryEngine
+from utils.review_store import load_reviews
+
+st.set_page_config(page_title="VOC Intelligence Playground", layout="wide")
+
+
+@st.cache_resource(show_spinner="Loading reviews and building the filter index...", max_entries=2)
+def load_engine(data_path, config_path, data_signature, config_signature):
+    """Dataset + team-membership/date index, built once per (file, config) version and shared across sessions."""
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    return ReviewQueryEngine(load_reviews(data_path), config)
+
+
+@st.cache_resource(show_spinner="Initializing analyzer...", max_entries=2)
+def load_runtime(use_mock, config_path):
+    """Warm config, RAG context and LLM client shared by every analysis started from the app."""
+    return WarmState(config_path=config_path, use_mock=use_mock)
+
+
+def select_positions(engine, engine_key, query):
+    """Row positions of the current selection. Only the latest selection per session is kept."""
+    key = (engine_key, query)
+    cached = st.session_state.get("selection")
+    if cached is None or cached[0] != key:
+        teams, keywords, start_date, end_date, ratings, match_all = query
+        positions = engine.select(teams, keywords, start_date, end_date, ratings, match_all_keywords=match_all)
+        st.session_state["selection"] = cached = (key, positions)
+    return cached[1]
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def run_query(_engine, engine_key, teams, keywords, start_date, end_date, ratings, match_all):
+    """Selection summary for one filter combination; revisited combinations come straight from the cache.
+
+    Only the summary (counts per team/day/rating) is cached; the row
+    positions can be as large as the dataset and are kept by select_positions.
+    """
+    started = time.perf_counter()
+    query = (teams, keywords, start_date, end_date, ratings, match_all)
+    summary = _engine.summary(select_positions(_engine, engine_key, query))
+    summary["elapsed_ms"] = (time.perf_counter() - started) * 1000
+    return summary
+
+
+def start_analysis(runtime, groups):
+    """Runs the LLM analysis of a selection on a background thread; the returned dict tracks progress."""
+    job = {"status": "running", "done": 0, "total": len(groups), "report": None, "path": None, "error": None,
+           "started": time.time()}
+
+    def run():
+        analyzer = None
+        try:
+            analyzer = runtime.new_analyzer("playground")
+            job["report"], job["path"] = analyzer.analyze_selection(
+                groups, progress=lambda done, total: job.update(done=done))
+            job["status"] = "done"
+        except Exception as e:
+            job.update(status="failed", error=str(e))
+        finally:
+            if analyzer:
+                analyzer.close()
+            job["elapsed_s"] = time.time() - job["started"]
+
+    threading.Thread(target=run, name="playground-analysis", daemon=True).start()
+    return job
+
+
+@st.fragment(run_every="1s")
+def analysis_status():
+    """Polls the background job without re-running the whole page."""
+    job = st.session_state.get("analysis_job")
+    if not job:
+        return
+    if job["status"] == "running":
+        st.progress(job["done"] / max(job["total"], 1), text=f"Analyzing... {job['done']}/{job['total']} categories")
+    elif job["status"] == "failed":
+        st.error(f"Analysis failed: {job['error']}")
+    else:
+        st.success(f"Analysis finished in {job['elapsed_s']:.1f}s. Saved to {job['path']}")
+        with st.expander("Report", expanded=True):
+            st.markdown(job["report"])
+
 
 st.title("VOC Intelligence Playground")
-st.write("Welcome! Please configure your API keys and data.")
+
+with st.sidebar:
+    st.header("Data")
+    data_path = st.text_input("Review data (CSV or Parquet)", "data/raw/mock_reviews.csv")
+    config_path = st.text_input("Team config", "config/teams.yaml")
+    use_mock = st.checkbox("Mock mode (no API calls)", value=not os.environ.get("GOOGLE_API_KEY"))
+
+if not os.path.exists(data_path) or not os.path.exists(config_path):
+    st.warning("Review data or team config not found. Run `python generate_data.py` first.")
+    st.stop()
+
+# File signatures are part of the cache key, so edited data/config files are re-indexed automatically
+data_signature = path_signature(data_path)
+config_signature = path_signature(config_path)
+engine = load_engine(data_path, config_path, data_signature, config_signature)
+engine_key = (data_path, config_path, data_signature, config_signature)
+
+with st.sidebar:
+    st.header("나만의 데이터셋")
+    teams = st.multiselect("Teams", engine.teams)
+    keyword_text = st.text_input("Keywords (comma-separated)", "")
+    match_all = st.checkbox("Match all keywords", value=False)
+    start_date = end_date = None
+    if len(engine.days):
+        start_date, end_date = st.select_slider(
+            "Date range", options=list(engine.days), value=(engine.days[0], engine.days[-1])
+        )
+    ratings = st.multiselect("Star rating", [1, 2, 3, 4, 5])
+
+keywords = tuple(k.strip() for k in keyword_text.split(",") if k.strip())
+query = (tuple(teams), keywords, start_date, end_date, tuple(ratings), match_all)
+result = run_query(engine, engine_key, *query)
+
+col_count, col_rating, col_share = st.columns(3)
+col_count.metric("Reviews", f"{result['count']:,}")
+col_rating.metric("Mean rating", f"{result['mean_rating']:.2f}" if result["mean_rating"] is not None else "-")
+col_share.metric("Share of dataset", f"{result['count'] / max(len(engine), 1):.1%}")
+st.caption(f"Filtered {len(engine):,} reviews in {result['elapsed_ms']:.1f} ms")
+
+col_teams, col_daily = st.columns(2)
+with col_teams:
+    st.subheader("By team")
+    st.bar_chart(result["teams"])
+with col_daily:
+    st.subheader("By day")
+    st.line_chart(result["daily"])
+
+st.subheader("Reviews")
+positions = select_positions(engine, engine_key, query)
+st.dataframe(engine.frame(positions, limit=500), hide_index=True)
+
+st.subheader("LLM Analysis")
+job = st.session_state.get("analysis_job")
+running = bool(job) and job["status"] == "running"
+if st.button("Analyze selection", disabled=running or not result["count"]):
+    groups = engine.team_groups(positions, teams=teams or None)
+    if not groups:
+        st.info("No reviews in the selection are routed to a team.")
+    else:
+        try:
+            st.session_state["analysis_job"] = start_analysis(load_runtime(use_mock, config_path), groups)
+        except Exception as e:
+            st.error(f"Analyzer unavailable: {e}")
+analysis_status()
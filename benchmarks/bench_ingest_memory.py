@@ -0,0 +1,103 @@
+"""Compares peak memory of full-file vs chunked review ingestion.
+
+Each mode runs in its own subprocess so peak RSS is measured independently.
+
+Usage:
+    python benchmarks/bench_ingest_memory.py --rows 2000000 --chunksize 100000
+"""
+import argparse
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PHRASES = ["페이 충전 실패", "결제 오류", "앱 튕김", "로그인 실패", "배송 언제 오나요",
+           "디자인이 별로에요", "글씨가 너무 작아요", "기능 좋아요", "편리해요", "최고에요"]
+
+
+def write_fixture(path, rows, seed=42, block=200000):
+    rng = random.Random(seed)
+    written = 0
+    while written < rows:
+        n = min(block, rows - written)
+        pd.DataFrame({
+            "review_id": range(written + 1, written + n + 1),
+            "date": [f"2025-12-{rng.randint(1, 28):02d}" for _ in range(n)],
+            "review_text": [f"{rng.choice(PHRASES)} {rng.choice(PHRASES)} 해결 좀 해주세요." for _ in range(n)],
+            "star_rating": [rng.randint(1, 5) for _ in range(n)],
+        }).to_csv(path, mode="a" if written else "w", header=not written, index=False)
+        written += n
+
+
+def run_mode(mode, csv_path, chunksize):
+    """Routes the file the way VOCAnalyzer does and prints peak RSS (child process)."""
+    import yaml
+    from utils.ingest import stream_team_buckets
+    from utils.team_matcher import TeamMatcher
+
+    with open(os.path.join(ROOT, "config/teams.yaml"), encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+
+    start = time.perf_counter()
+    if mode == "full":
+        df = pd.read_csv(csv_path)
+        membership = TeamMatcher.from_config(config).match(df['review_text'])
+        counts = {team: len(df[membership[team].to_numpy()]) for team in membership.columns}
+    else:
+        buckets, _ = stream_team_buckets(csv_path, config, chunksize=chunksize)
+        counts = {team: bucket.count for team, bucket in buckets.items()}
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is KiB on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode}\t{elapsed:.2f}\t{peak_mb:.1f}\t{sum(counts.values())}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingestion memory benchmark")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--chunksize", type=int, default=100000)
+    parser.add_argument("--csv", type=str, default=None, help="Use an existing review CSV instead of a synthetic one")
+    parser.add_argument("--_mode", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args._mode:
+        run_mode(args._mode, args.csv, args.chunksize)
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = args.csv
+        if not csv_path:
+            csv_path = os.path.join(tmp, "reviews.csv")
+            print(f"Generating {args.rows} synthetic reviews...")
+            write_fixture(csv_path, args.rows)
+        size_mb = os.path.getsize(csv_path) / 1024 / 1024
+
+        results = {}
+        for mode in ("full", "stream"):
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--csv", csv_path,
+                 "--chunksize", str(args.chunksize), "--_mode", mode],
+                capture_output=True, text=True, check=True, cwd=ROOT,
+            ).stdout.strip().splitlines()[-1]
+            _, elapsed, peak_mb, matched = out.split("\t")
+            results[mode] = (float(elapsed), float(peak_mb), int(matched))
+
+    print(f"File: {size_mb:.1f} MB | chunksize: {args.chunksize}")
+    for mode, (elapsed, peak_mb, matched) in results.items():
+        print(f"{mode:<7} time {elapsed:7.2f}s | peak RSS {peak_mb:8.1f} MB | team matches {matched}")
+    identical = results["full"][2] == results["stream"][2]
+    print(f"Identical match counts: {identical}")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
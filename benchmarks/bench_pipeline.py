@@ -0,0 +1,137 @@
+"""Times each stage of VOCAnalyzer.generate_full_report in mock mode at several data sizes.
+
+Data and a matching teams config are produced by generate_data.generate_reviews
+in a scratch directory that also holds copies of data/docs and README.md, so the
+real README and results/ are never touched. Stages: load (CSV read), route (team matching + grouping),
+analyze (mock per-category analysis), prompt_build (the prompts a real run
+would send, built separately since mock mode skips them), render, save and
+readme_sync.
+
+Usage:
+    python benchmarks/bench_pipeline.py --rows 10000,100000,1000000 --teams 3 [--json benchmarks/results/pipeline.json]
+
+Timings are written to benchmarks/results/pipeline.json unless --json points elsewhere ('' to skip).
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import analyzer  # noqa: E402
+from generate_data import generate_reviews  # noqa: E402
+
+STAGES = ["load", "route", "analyze", "prompt_build", "render", "save", "readme_sync"]
+
+
+def timed(timings, key, fn):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            timings[key] += time.perf_counter() - start
+    return wrapper
+
+
+def run_once(data_path, config_path):
+    """One mock run with every stage wrapped in a timer. Returns {stage: seconds}."""
+    timings = defaultdict(float)
+    groups = []
+    a = analyzer.VOCAnalyzer(config_path=config_path, project_name="bench_pipeline")
+    a.initialize(use_mock=True, use_cache=False)
+
+    original_load = analyzer.load_reviews
+    load_team_groups = a._load_team_groups
+
+    def grouped(*args, **kwargs):
+        result = load_team_groups(*args, **kwargs)
+        groups.extend(result[0])
+        return result
+
+    analyzer.load_reviews = timed(timings, "load", original_load)
+    a._load_team_groups = timed(timings, "load_and_route", grouped)
+    a._run_categories = timed(timings, "analyze", a._run_categories)
+    a._render_summary = timed(timings, "render", a._render_summary)
+    a._close_report = timed(timings, "save", a._close_report)
+    a.update_readme = timed(timings, "readme_sync", a.update_readme)
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            a.generate_full_report(data_path)
+        timings["total"] = time.perf_counter() - start
+    finally:
+        analyzer.load_reviews = original_load
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        a.token_counter  # One-time tokenizer setup is not part of the per-run cost
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for team, reviews, count in groups:
+            a._build_prompt(team, reviews, count)
+    timings["prompt_build"] = time.perf_counter() - start
+
+    timings["route"] = timings.pop("load_and_route") - timings["load"]
+    return {stage: round(timings[stage], 4) for stage in STAGES + ["total"]}
+
+
+def prepare_workspace(tmp):
+    """Scratch copy of what the analyzer reads relative to the working directory."""
+    shutil.copytree(os.path.join(ROOT, "data", "docs"), os.path.join(tmp, "data", "docs"))
+    shutil.copy(os.path.join(ROOT, "README.md"), os.path.join(tmp, "README.md"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="generate_full_report stage benchmark (mock mode)")
+    parser.add_argument("--rows", type=str, default="10000,100000,1000000", help="Comma-separated data sizes")
+    parser.add_argument("--teams", type=int, default=3)
+    parser.add_argument("--keyword-density", type=float, default=0.7)
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per size; the fastest is kept")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end-date", type=str, default="2025-12-31", help="Last review date, fixed so runs on different days use the same data")
+    parser.add_argument("--json", type=str, default=os.path.join(ROOT, "benchmarks", "results", "pipeline.json"),
+                        help="Write stage timings to this JSON file ('' to skip)")
+    args = parser.parse_args()
+    json_path = os.path.abspath(args.json) if args.json else None
+
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        prepare_workspace(tmp)
+        os.chdir(tmp)
+        try:
+            for rows in (int(r) for r in args.rows.split(",")):
+                data_path = os.path.join(tmp, "data", "raw", f"reviews_{rows}.csv")
+                config_path = os.path.join(tmp, "config", f"teams_{args.teams}.yaml")
+                with contextlib.redirect_stdout(io.StringIO()):
+                    generate_reviews(rows, n_teams=args.teams, keyword_density=args.keyword_density,
+                                     seed=args.seed, output=data_path, config_out=config_path,
+                                     end_date=args.end_date)
+                runs = [run_once(data_path, config_path) for _ in range(args.repeat)]
+                results[str(rows)] = min(runs, key=lambda r: r["total"])
+                os.remove(data_path)
+        finally:
+            os.chdir(cwd)
+
+    print(f"{'rows':>9} " + " ".join(f"{s:>12}" for s in STAGES + ["total"]) + "  (seconds)")
+    for rows, r in results.items():
+        print(f"{int(rows):>9} " + " ".join(f"{r[s]:>12.3f}" for s in STAGES + ["total"]))
+
+    if json_path:
+        os.makedirs(os.path.dirname(json_path), exist_ok=True)
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"timestamp": time.time(), "python": sys.version.split()[0], "teams": args.teams,
+                       "keyword_density": args.keyword_density, "results": results}, f, indent=2)
+        print(f"Saved to {json_path}")
+
+
+if __name__ == "__main__":
+    main()
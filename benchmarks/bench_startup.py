@@ -0,0 +1,90 @@
+"""Tracks cold-start latency of analyzer.py for mock and real modes.
+
+Each measurement runs in a fresh interpreter. "real" mode uses a dummy API key
+and a pre-seeded model-list cache, so it measures the local startup path
+(SDK imports + client construction) without any network calls.
+
+Usage:
+    python benchmarks/bench_startup.py --repeat 5 [--json benchmarks/results/startup.json]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT = "bench_startup"
+
+CHILD = r"""
+import json, os, sys, time
+t0 = time.perf_counter()
+import analyzer
+t1 = time.perf_counter()
+analyzer.VOCAnalyzer.MODEL_CACHE_PATH = sys.argv[2]
+a = analyzer.VOCAnalyzer(project_name="%s")
+t2 = time.perf_counter()
+a.initialize(use_mock=(sys.argv[1] == "mock"), use_cache=False)
+t3 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "construct": t2 - t1, "initialize": t3 - t2}))
+""" % PROJECT
+
+
+def measure(mode, model_cache_path):
+    env = dict(os.environ)
+    if mode == "real":
+        env["GOOGLE_API_KEY"] = "bench-dummy-key"
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", CHILD, mode, model_cache_path], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    total = time.perf_counter() - start
+    stages = json.loads(out.strip().splitlines()[-1])
+    stages["process_total"] = total
+    return stages
+
+
+def seed_model_cache(path):
+    import hashlib
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "key_id": hashlib.sha256(b"bench-dummy-key").hexdigest()[:12],
+            "fetched": time.time(),
+            "models": ["gemini-1.5-flash"],
+        }, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="analyzer.py startup benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--modes", type=str, default="mock,real")
+    parser.add_argument("--json", type=str, default=None, help="Write median timings to this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "models.json")
+        seed_model_cache(cache_path)
+        try:
+            for mode in args.modes.split(","):
+                runs = [measure(mode, cache_path) for _ in range(args.repeat)]
+                results[mode] = {key: statistics.median(r[key] for r in runs) for key in runs[0]}
+        finally:
+            shutil.rmtree(os.path.join(ROOT, "results", PROJECT), ignore_errors=True)
+
+    print(f"{'mode':<6} {'import':>9} {'construct':>10} {'initialize':>11} {'process':>9}  (median of {args.repeat}, seconds)")
+    for mode, r in results.items():
+        print(f"{mode:<6} {r['import']:>9.3f} {r['construct']:>10.3f} {r['initialize']:>11.3f} {r['process_total']:>9.3f}")
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"timestamp": time.time(), "python": sys.version.split()[0], "results": results}, f, indent=2)
+        print(f"Saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmarks the vectorized TeamMatcher against the original per-team lambda scan.
+
+Usage:
+    python benchmarks/bench_team_matcher.py --rows 200000 --teams 40
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.team_matcher import TeamMatcher
+
+VOCAB = ["페이", "충전", "환불", "결제", "튕김", "종료", "접속", "로그인", "오류", "디자인",
+         "배송", "화면", "글씨", "좋아요", "최고에요", "그냥", "그렇네요", "해결", "부탁", "감사"]
+
+
+def build_fixture(rows, teams, seed=42):
+    rng = random.Random(seed)
+    words = VOCAB + [f"kw{i:03d}" for i in range(teams * 3)]
+    texts = [" ".join(rng.choice(words) for _ in range(rng.randint(3, 12))) for _ in range(rows)]
+    config = {"teams": {
+        f"team_{t:02d}": {"keywords": rng.sample(words, 4)} for t in range(teams)
+    }}
+    return pd.DataFrame({"review_text": texts}), config
+
+
+def lambda_scan(df, config):
+    """The original routing loop from VOCAnalyzer.generate_full_report."""
+    out = {}
+    for team, info in config.get('teams', {}).items():
+        keywords = info.get('keywords', [])
+        out[team] = df['review_text'].apply(lambda x: any(k in str(x) for k in keywords)).to_numpy()
+    return pd.DataFrame(out, index=df.index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TeamMatcher benchmark")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--teams", type=int, default=40)
+    args = parser.parse_args()
+
+    df, config = build_fixture(args.rows, args.teams)
+
+    start = time.perf_counter()
+    baseline = lambda_scan(df, config)
+    lambda_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    membership = TeamMatcher.from_config(config).match(df['review_text'])
+    matcher_time = time.perf_counter() - start
+
+    identical = membership.equals(baseline[membership.columns])
+    print(f"Rows: {args.rows} | Teams: {args.teams}")
+    print(f"Lambda scan : {lambda_time:.3f}s")
+    print(f"TeamMatcher : {matcher_time:.3f}s ({lambda_time / max(matcher_time, 1e-9):.1f}x)")
+    print(f"Identical output: {identical}")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
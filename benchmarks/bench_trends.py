@@ -0,0 +1,119 @@
+"""Compares trend computation from daily rollups against rescanning the full review history.
+
+For each size, a dataset spanning --days days is generated. It is stored as a
+CSV and as a date-partitioned Parquet store. Timings:
+  rescan       read + route + per-day groupby of the whole history (what a run without rollups pays)
+  build        first DailyRollupStore build (also a full read)
+  refresh_csv  incremental update after one new day arrives, CSV source (parse is still a full read)
+  refresh_pq   the same on the partitioned Parquet store (only partitions from the watermark on are read)
+  trend        WoW/MoM/spike computation for every team from the rollups
+
+Usage:
+    python benchmarks/bench_trends.py --rows 100000,1000000 --days 180 [--json benchmarks/results/trends.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from generate_data import generate_reviews  # noqa: E402
+from utils.rollups import ROLLUP_COLUMNS, DailyRollupStore  # noqa: E402
+from utils.team_matcher import TeamMatcher  # noqa: E402
+
+STAGES = ["rescan", "build", "refresh_csv", "refresh_pq", "trend"]
+
+
+def clock(fn):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    return time.perf_counter() - start
+
+
+def rescan(path, config):
+    df = pd.read_csv(path, usecols=ROLLUP_COLUMNS)
+    membership = TeamMatcher.from_config(config).match(df['review_text'])
+    return {team: df[membership[team].to_numpy()].groupby('date')['star_rating'].agg(['size', 'sum'])
+            for team in membership.columns}
+
+
+def run_size(tmp, rows, args):
+    full_csv = os.path.join(tmp, f"reviews_{rows}.csv")
+    config_path = os.path.join(tmp, f"teams_{args.teams}.yaml")
+    with contextlib.redirect_stdout(io.StringIO()):
+        generate_reviews(rows, n_teams=args.teams, days=args.days, seed=args.seed, output=full_csv,
+                         config_out=config_path)
+    with open(config_path, encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+
+    # History without the latest day, then the full file as "one new day arrived"
+    df = pd.read_csv(full_csv)
+    df['date'] = df['date'].astype(str)
+    latest = df['date'].max()
+    csv_path = os.path.join(tmp, "reviews.csv")
+    pq_path = os.path.join(tmp, "reviews_parquet")
+    df[df['date'] < latest].to_csv(csv_path, index=False)
+    df[df['date'] < latest].to_parquet(pq_path, partition_cols=["date"], index=False)
+
+    timings = {"rescan": clock(lambda: rescan(full_csv, config))}
+    timings["build"] = clock(lambda: DailyRollupStore(csv_path, config, root="rollups", rebuild=True).refresh())
+    DailyRollupStore(pq_path, config, root="rollups", rebuild=True).refresh()
+
+    shutil.copy(full_csv, csv_path)
+    df[df['date'] == latest].to_parquet(pq_path, partition_cols=["date"], index=False)
+    timings["refresh_csv"] = clock(lambda: DailyRollupStore(csv_path, config, root="rollups").refresh())
+    timings["refresh_pq"] = clock(lambda: DailyRollupStore(pq_path, config, root="rollups").refresh())
+
+    store = DailyRollupStore(csv_path, config, root="rollups")
+    timings["trend"] = clock(lambda: [store.trend(team) for team in store.teams])
+    shutil.rmtree(pq_path)
+    for path in (full_csv, csv_path):
+        os.remove(path)
+    return {stage: round(timings[stage], 4) for stage in STAGES}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Daily rollup vs full-rescan trend benchmark")
+    parser.add_argument("--rows", type=str, default="100000,1000000", help="Comma-separated data sizes")
+    parser.add_argument("--days", type=int, default=180, help="History length in days")
+    parser.add_argument("--teams", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", type=str, default=None, help="Write timings to this JSON file")
+    args = parser.parse_args()
+    json_path = os.path.abspath(args.json) if args.json else None
+
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # Rollups and the sentiment cache are written relative to the working directory
+        try:
+            for rows in (int(r) for r in args.rows.split(",")):
+                results[str(rows)] = run_size(tmp, rows, args)
+        finally:
+            os.chdir(cwd)
+
+    print(f"{'rows':>9} " + " ".join(f"{s:>12}" for s in STAGES) + "  (seconds)")
+    for rows, r in results.items():
+        print(f"{int(rows):>9} " + " ".join(f"{r[s]:>12.4f}" for s in STAGES))
+
+    if json_path:
+        os.makedirs(os.path.dirname(json_path), exist_ok=True)
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"timestamp": time.time(), "python": sys.version.split()[0], "teams": args.teams,
+                       "days": args.days, "results": results}, f, indent=2)
+        print(f"Saved to {json_path}")
+
+
+if __name__ == "__main__":
+    main()
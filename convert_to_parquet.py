@@ -0,0 +1,40 @@
+import argparse
+import os
+import shutil
+
+import pandas as pd
+
+
+def convert_csv_to_parquet(csv_path="data/raw/mock_reviews.csv", out_dir="data/raw/reviews_parquet",
+                           chunksize=500000, overwrite=False):
+    """Converts a review CSV into a Parquet dataset partitioned by `date` (date=YYYY-MM-DD/)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if os.path.exists(out_dir):
+        if not overwrite:
+            raise FileExistsError(f"{out_dir} already exists. Use --overwrite to replace it.")
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+
+    # Parse and type-infer the CSV exactly once; later runs read typed columns directly
+    total = 0
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize, encoding="utf-8-sig"):
+        chunk['date'] = chunk['date'].astype(str).str[:10]
+        chunk['review_text'] = chunk['review_text'].astype(str)
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        pq.write_to_dataset(table, root_path=out_dir, partition_cols=['date'])
+        total += len(chunk)
+
+    print(f"Converted {total} reviews from {csv_path} to {out_dir} (partitioned by date)")
+    return out_dir
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CSV -> date-partitioned Parquet converter")
+    parser.add_argument("--csv", type=str, default="data/raw/mock_reviews.csv", help="Source review CSV")
+    parser.add_argument("--out", type=str, default="data/raw/reviews_parquet", help="Output dataset directory")
+    parser.add_argument("--chunksize", type=int, default=500000, help="Rows converted per batch")
+    parser.add_argument("--overwrite", action="store_true", help="Replace an existing output directory")
+    args = parser.parse_args()
+    convert_csv_to_parquet(args.csv, args.out, chunksize=args.chunksize, overwrite=args.overwrite)
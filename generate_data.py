@@ -1,5 +1,11 @@
+import argparse
+import os
+import time
+
+import numpy as np
 import pandas as pd
 import random
+import yaml
 from datetime import datetime, timedelta
 
 def generate_mock_data():
@@ -38,5 +44,130 @@ def generate_mock_data():
     df.to_csv("data/raw/mock_reviews.csv", index=False, encoding="utf-8-sig")
     print("Mock data generated at data/raw/mock_reviews.csv")
 
+# Building blocks for the scaled generator. The first teams reuse the keywords of config/teams.yaml;
+# further teams get synthetic keywords so routing cost can be measured at any team count.
+BASE_TEAMS = {
+    "billing_team": {"keywords": ["페이", "충전", "환불", "결제"], "rating_range": [1, 2]},
+    "system_team": {"keywords": ["튕김", "종료", "접속", "로그인", "오류"], "rating_range": [1, 2]},
+    "design_logistics_team": {"keywords": ["디자인", "배송", "화면", "글씨"], "rating_range": [2, 3]},
+}
+ISSUE_SUFFIXES = ["안됨", "실패", "문제", "너무 느려요", "확인 부탁드려요", "왜 이래요"]
+FILLER_WORDS = ["오늘", "어제", "계속", "진짜", "그냥", "앱", "사용", "고객센터", "답변", "업데이트", "이후", "자꾸",
+                "생각보다", "전반적으로", "친구", "추천", "매일", "쓰는데", "가끔", "요즘"]
+CLOSINGS = ["해결 좀 해주세요.", "그냥 그렇네요.", "앞으로도 잘 부탁드려요.", "ㅠㅠ", "!", "..."]
+SYLLABLES = list("가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후")
+
+
+def build_teams(n_teams, keywords_per_team=4, seed=42):
+    """Team -> {keywords, rating_range}: the real teams first, then synthetic ones with unique keywords."""
+    rng = random.Random(seed)
+    teams = {name: dict(info) for name, info in list(BASE_TEAMS.items())[:n_teams]}
+    used = {k for info in teams.values() for k in info["keywords"]}
+    while len(teams) < n_teams:
+        keywords = []
+        while len(keywords) < keywords_per_team:
+            word = "".join(rng.choices(SYLLABLES, k=3))
+            if word not in used:
+                used.add(word)
+                keywords.append(word)
+        low = rng.randint(1, 3)
+        teams[f"team_{len(teams):03d}"] = {"keywords": keywords, "rating_range": [low, low + 1]}
+    return teams
+
+
+def write_teams_config(teams, path):
+    """Writes a teams.yaml matching the generated data."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    config = {"teams": {name: {"keywords": info["keywords"], "webhook_url": "PLACEHOLDER_URL"}
+                        for name, info in teams.items()}}
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f, allow_unicode=True, sort_keys=False)
+
+
+def generate_reviews(rows=1000000, n_teams=3, keyword_density=0.7, review_length=6, days=30,
+                     seed=42, output="data/raw/mock_reviews.csv", config_out=None, chunksize=200000, end_date=None):
+    """Streams a synthetic review CSV of `rows` rows, `chunksize` rows at a time.
+
+    A review mentions one team keyword with probability `keyword_density`
+    (otherwise it matches no team) and carries about `review_length` filler
+    words. Dates span the `days` days up to `end_date` (YYYY-MM-DD, default
+    today). The same seed, end date and chunksize always produce the same
+    file; without an end date the dates shift with the day it is run. Memory
+    is bounded by `chunksize`. Returns the number of rows written.
+    """
+    rng = np.random.default_rng(seed)
+    teams = build_teams(n_teams, seed=seed)
+    if config_out:
+        write_teams_config(teams, config_out)
+
+    # (team, keyword) pairs flattened so one integer draw picks both
+    pair_team = np.array([t for t, info in enumerate(teams.values()) for _ in info["keywords"]])
+    pair_keyword = np.array([k for info in teams.values() for k in info["keywords"]], dtype=object)
+    rating_low = np.array([info["rating_range"][0] for info in teams.values()])
+    rating_high = np.array([info["rating_range"][1] for info in teams.values()])
+    issue_suffixes = np.array([" " + s for s in ISSUE_SUFFIXES], dtype=object)
+    closings = np.array([" " + c for c in CLOSINGS], dtype=object)
+    # Pre-built filler phrases of every length up to 3x the mean; rows pick one by length
+    max_words = max(1, review_length * 3)
+    filler_pool = [np.array([" ".join(rng.choice(FILLER_WORDS, size=n)) for _ in range(64)], dtype=object)
+                   for n in range(max_words + 1)]
+    end = datetime.strptime(end_date, "%Y-%m-%d") if end_date else datetime.now()
+    start_date = end - timedelta(days=days)
+    date_strings = np.array([(start_date + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(days + 1)],
+                            dtype=object)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    started = time.perf_counter()
+    written = 0
+    with open(output, "w", encoding="utf-8-sig", newline="") as f:
+        while written < rows:
+            n = min(chunksize, rows - written)
+            lengths = np.minimum(rng.poisson(review_length, n), max_words)
+            filler = np.empty(n, dtype=object)
+            for length in np.unique(lengths):
+                mask = lengths == length
+                filler[mask] = filler_pool[length][rng.integers(0, 64, mask.sum())]
+
+            has_issue = rng.random(n) < keyword_density
+            pair = rng.integers(0, len(pair_keyword), n)
+            team = pair_team[pair]
+            issue = pair_keyword[pair] + issue_suffixes[rng.integers(0, len(issue_suffixes), n)]
+            text = np.where(has_issue, issue + " " + filler, filler) + closings[rng.integers(0, len(closings), n)]
+            ratings = np.where(has_issue, rng.integers(rating_low[team], rating_high[team] + 1),
+                               rng.integers(3, 6, n))
+
+            pd.DataFrame({
+                "review_id": np.arange(written + 1, written + n + 1),
+                "date": date_strings[rng.integers(0, days + 1, n)],
+                "review_text": text,
+                "star_rating": ratings,
+            }).to_csv(f, index=False, header=(written == 0))
+            written += n
+
+    elapsed = time.perf_counter() - started
+    print(f"Generated {written:,} reviews for {len(teams)} teams at {output} "
+          f"({elapsed:.1f}s, {written / max(elapsed, 1e-9):,.0f} rows/sec)")
+    return written
+
+
 if __name__ == "__main__":
-    generate_mock_data()
+    parser = argparse.ArgumentParser(description="Mock VOC review generator")
+    parser.add_argument("--rows", type=int, default=None, help="Rows to generate (omit for the original 50-review sample)")
+    parser.add_argument("--teams", type=int, default=3, help="Number of teams; beyond the 3 real teams synthetic keywords are used")
+    parser.add_argument("--keyword-density", type=float, default=0.7, help="Share of reviews that mention a team keyword")
+    parser.add_argument("--review-length", type=int, default=6, help="Mean number of filler words per review")
+    parser.add_argument("--days", type=int, default=30, help="Date span in days, ending at --end-date")
+    parser.add_argument("--end-date", type=str, default=None, help="Last review date (YYYY-MM-DD, default today)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (same seed, --end-date and --chunksize give the same file)")
+    parser.add_argument("--output", type=str, default="data/raw/mock_reviews.csv", help="Output CSV path")
+    parser.add_argument("--config-out", type=str, default=None, help="Also write a teams.yaml matching the generated teams")
+    parser.add_argument("--chunksize", type=int, default=200000, help="Rows generated and written per chunk (bounds memory)")
+    args = parser.parse_args()
+
+    if args.rows is None:
+        generate_mock_data()
+    else:
+        generate_reviews(args.rows, n_teams=args.teams, keyword_density=args.keyword_density,
+                         review_length=args.review_length, days=args.days, seed=args.seed,
+                         output=args.output, config_out=args.config_out, chunksize=args.chunksize,
+                         end_date=args.end_date)
@@ -0,0 +1,232 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.review_store import is_columnar, iter_review_chunks
+
+try:
+    import pyarrow  # noqa: F401  (RE2-backed regex counting on Arrow strings)
+    _TEXT_DTYPE = "string[pyarrow]"
+except ImportError:
+    _TEXT_DTYPE = None
+
+# Korean VOC lexicon: weight -> terms (plain substrings). Negated phrases carry
+# their own strongly negative weight so "안 좋아요" outweighs the "좋아요" inside it.
+# Terms match inside words, so single syllables are spelled out as phrases
+# ("렉 걸", not "렉", which would also hit "플렉스" or "렉서스").
+LEXICON = {
+    1.0: ["최고", "만족", "감사", "좋아요", "좋네요", "좋습니다", "편리", "편해요", "훌륭", "추천", "잘 쓰고", "빠른 응대",
+          "빨라요", "깔끔", "대박"],
+    0.5: ["괜찮", "좋은", "좋고", "무난", "잘 부탁", "만족스", "친절"],
+    -0.5: ["별로", "그냥 그렇", "아쉽", "느려", "느림", "불편", "작아요", "촌스", "언제 오나요", "ㅠ", "ㅜ", "해결 좀",
+           "개선", "답답"],
+    -1.0: ["실패", "오류", "에러", "안됨", "안 됨", "안돼", "안 돼", "안들어와", "안 들어와", "불가", "튕김", "튕겨", "멈춤",
+           "먹통", "최악", "환불", "짜증", "화나", "사기", "버그", "렉 걸", "렉걸", "렉이 걸", "렉이 심", "렉 심", "렉 때문",
+           "로그인 안", "접속 안"],
+    -2.0: ["안 좋", "안좋", "좋지 않", "좋지않", "만족하지 않", "못 쓰", "못쓰", "안 편", "비추"],
+}
+LEXICON_SCALE = 2.0  # tanh(raw / scale): one strong term ~ ±0.46, two ~ ±0.76
+
+
+def lexicon_version(lexicon=None):
+    """Short hash of the lexicon; cached scores are only reused for the same version."""
+    payload = json.dumps(sorted((str(w), terms) for w, terms in (lexicon or LEXICON).items()), ensure_ascii=False)
+    return hashlib.sha256(f"{payload}|{LEXICON_SCALE}".encode("utf-8")).hexdigest()[:12]
+
+
+def review_hashes(texts):
+    """Stable uint64 content hash per review text (vectorized)."""
+    return pd.util.hash_pandas_object(pd.Series(texts, dtype=object).fillna("").astype(str), index=False).to_numpy()
+
+
+class LexiconScorer:
+    """Scores review texts in [-1, 1] with one vectorized regex count per lexicon weight."""
+
+    def __init__(self, lexicon=None, scale=LEXICON_SCALE):
+        self.lexicon = lexicon or LEXICON
+        self.scale = scale
+        self.patterns = {
+            weight: "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+            for weight, terms in self.lexicon.items() if terms
+        }
+
+    def score(self, texts):
+        text = pd.Series(texts, dtype=object).fillna("").astype(str)
+        if _TEXT_DTYPE:
+            text = text.astype(_TEXT_DTYPE)
+        raw = np.zeros(len(text), dtype=np.float64)
+        for weight, pattern in self.patterns.items():
+            raw += weight * text.str.count(pattern).to_numpy(dtype=np.float64, na_value=0)
+        return np.tanh(raw / self.scale).astype(np.float32)
+
+
+class SentimentCache:
+    """On-disk score cache keyed by review hash (one Parquet file per lexicon version)."""
+
+    _save_lock = threading.Lock()  # Shared by every instance: concurrent jobs save the same file (service mode)
+
+    def __init__(self, cache_dir="data/cache/sentiment", version=None):
+        self.path = os.path.join(cache_dir, f"scores_{version or lexicon_version()}.parquet")
+        self._dirty = False
+        self._scores = pd.Series(dtype=np.float32, index=pd.Index([], dtype=np.uint64))
+        if os.path.exists(self.path):
+            try:
+                table = pd.read_parquet(self.path)
+                self._scores = pd.Series(table["score"].to_numpy(np.float32),
+                                         index=pd.Index(table["key"].to_numpy(np.uint64)))
+            except Exception as e:
+                print(f">> [WARNING] Ignoring unreadable sentiment cache {self.path}: {e}")
+
+    def __len__(self):
+        return len(self._scores)
+
+    def lookup(self, keys):
+        """Cached scores aligned with `keys` (NaN where missing)."""
+        if not len(self._scores):
+            return np.full(len(keys), np.nan, dtype=np.float32)
+        positions = self._scores.index.get_indexer(keys)
+        found = self._scores.to_numpy()[positions]
+        return np.where(positions >= 0, found, np.nan).astype(np.float32)
+
+    def add(self, keys, scores):
+        if len(keys):
+            new = pd.Series(np.asarray(scores, dtype=np.float32), index=pd.Index(keys, dtype=np.uint64))
+            self._scores = pd.concat([self._scores, new[~new.index.isin(self._scores.index)]])
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        table = pd.DataFrame({"key": self._scores.index.to_numpy(np.uint64), "score": self._scores.to_numpy()})
+        with self._save_lock:
+            # A private temp file per writer, so another save can never replace ours half-written
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+            os.close(fd)
+            try:
+                table.to_parquet(tmp_path, index=False)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        self._dirty = False
+
+
+class SentimentScorer:
+    """Batch sentiment stage: hashes reviews, skips cached ones, scores each unique new text once."""
+
+    def __init__(self, scorer=None, cache=None, batch_size=100000):
+        self.scorer = scorer or LexiconScorer()
+        self.cache = cache
+        self.batch_size = batch_size
+        self.scored = 0
+        self.cached = 0
+        self.seconds = 0.0
+
+    def score(self, texts):
+        start = time.perf_counter()
+        texts = pd.Series(texts, dtype=object).reset_index(drop=True)
+        keys = review_hashes(texts)
+        scores = self.cache.lookup(keys) if self.cache is not None else np.full(len(texts), np.nan, dtype=np.float32)
+        missing = np.flatnonzero(np.isnan(scores))
+        self.cached += len(texts) - len(missing)
+
+        if len(missing):
+            # Duplicate texts share a hash, so each distinct review is scored once
+            unique_keys, first, inverse = np.unique(keys[missing], return_index=True, return_inverse=True)
+            unique_texts = texts.iloc[missing[first]]
+            fresh = np.concatenate([
+                self.scorer.score(unique_texts.iloc[i:i + self.batch_size])
+                for i in range(0, len(unique_texts), self.batch_size)
+            ])
+            scores[missing] = fresh[inverse]
+            if self.cache is not None:
+                self.cache.add(unique_keys, fresh)
+            self.scored += len(missing)
+
+        self.seconds += time.perf_counter() - start
+        return scores
+
+    def summary(self):
+        total = self.scored + self.cached
+        rate = total / self.seconds if self.seconds else 0.0
+        return f"{total:,} reviews ({self.cached:,} cached) in {self.seconds:.2f}s, {rate:,.0f} reviews/sec"
+
+
+def _write_csv_chunks(chunks, out_path):
+    tmp_path = f"{out_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8-sig", newline="") as f:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(f, index=False, header=(i == 0))
+    os.replace(tmp_path, out_path)
+
+
+def _write_parquet_chunks(chunks, out_path, partitioned):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    tmp_path = f"{out_path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if partitioned:
+                pq.write_to_dataset(table, root_path=tmp_path, partition_cols=["date"])
+            else:
+                writer = writer or pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table)
+    finally:
+        if writer:
+            writer.close()
+    if os.path.isdir(out_path):
+        shutil.rmtree(out_path)
+    os.replace(tmp_path, out_path)
+
+
+def score_store(path="data/raw/mock_reviews.csv", out_path=None, chunksize=100000, use_cache=True,
+                text_column="review_text"):
+    """Adds (or refreshes) a `sentiment_score` column in a review CSV or Parquet store.
+
+    The store is streamed in chunks and rewritten to `out_path` (default: in
+    place, via a temporary file swapped in at the end). Returns the scorer so
+    callers can read its throughput summary.
+    """
+    out_path = out_path or path
+    scorer = SentimentScorer(cache=SentimentCache() if use_cache else None, batch_size=chunksize)
+
+    def scored_chunks():
+        for chunk in iter_review_chunks(path, chunksize):
+            chunk = chunk.drop(columns=["sentiment_score"], errors="ignore")
+            chunk["sentiment_score"] = scorer.score(chunk[text_column])
+            yield chunk
+
+    if is_columnar(path):
+        _write_parquet_chunks(scored_chunks(), out_path, partitioned=os.path.isdir(path))
+    else:
+        _write_csv_chunks(scored_chunks(), out_path)
+    if scorer.cache is not None:
+        scorer.cache.save()
+
+    print(f">> [INFO] Sentiment scored: {scorer.summary()}")
+    print(f">> [INFO] Wrote sentiment_score to {out_path}")
+    return scorer
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="VOC Sentiment Scoring (local lexicon)")
+    parser.add_argument("--file", type=str, default="data/raw/mock_reviews.csv", help="Review CSV or Parquet store to score")
+    parser.add_argument("--out", type=str, default=None, help="Write the scored store here instead of in place")
+    parser.add_argument("--chunksize", type=int, default=100000, help="Reviews read and scored per batch")
+    parser.add_argument("--no-cache", action="store_true", help="Re-score every review, ignoring data/cache/sentiment")
+    args = parser.parse_args()
+    score_store(args.file, args.out, chunksize=args.chunksize, use_cache=not args.no_cache)
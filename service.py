@@ -0,0 +1,378 @@
+"""Resident VOC analysis service with warm state and a job queue.
+
+Config, RAG documents, the model choice, the LLM client and recently read
+review files stay in memory across jobs. `config/teams.yaml` and `data/docs`
+are re-read when their modification times change. Jobs for different
+projects run concurrently; jobs for the same project run one at a time so
+they never clobber each other's results/<project> directory.
+
+    python service.py --port 8765 [--mock] [--job-workers 2]
+
+API (JSON over HTTP, bound to 127.0.0.1 by default):
+    POST /jobs        {"project": "weekly", "data": "data/raw/mock_reviews.csv", "start_date": ..., ...}
+                      -> 202 {"job_id": ..., "status": "queued"}
+    GET  /jobs        recent jobs, newest first
+    GET  /jobs/<id>   status, report path, stage timings or error
+    GET  /health      warm-state summary
+    POST /reload      re-read config/teams.yaml and data/docs now
+"""
+import argparse
+import datetime
+import json
+import os
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from analyzer import VOCAnalyzer
+from utils.review_store import load_reviews
+
+# Job fields -> VOCAnalyzer constructor arguments
+ANALYZER_OPTIONS = {
+    "workers": "max_workers",
+    "incremental": "incremental",
+    "rag_top_k": "rag_top_k",
+    "token_budget": "prompt_token_budget",
+    "batch_small": "batch_threshold",
+    "batch_size": "batch_size",
+    "compress_logs": "compress_logs",
+    "team_stats": "team_stats",
+    "notify": "notify",
+    "trends": "trends",
+}
+# Job fields -> generate_full_report arguments
+RUN_OPTIONS = ["chunksize", "start_date", "end_date"]
+# Job field -> (type, minimum) checked by JobQueue.validate; dates are YYYY-MM-DD strings
+FIELD_TYPES = {
+    "workers": (int, 1),
+    "rag_top_k": (int, 0),
+    "token_budget": (int, 1),
+    "batch_small": (int, 0),
+    "batch_size": (int, 1),
+    "chunksize": (int, 1),
+    "incremental": (bool, None),
+    "compress_logs": (bool, None),
+    "team_stats": (bool, None),
+    "notify": (bool, None),
+    "trends": (bool, None),
+    "start_date": (datetime.date, None),
+    "end_date": (datetime.date, None),
+}
+
+
+def path_signature(path):
+    """(name, mtime_ns, size) of a file, or of every file below a directory."""
+    if not os.path.exists(path):
+        return ()
+    if not os.path.isdir(path):
+        stat = os.stat(path)
+        return ((path, stat.st_mtime_ns, stat.st_size),)
+    signature = []
+    for root, _, files in os.walk(path):
+        for name in files:
+            stat = os.stat(os.path.join(root, name))
+            signature.append((os.path.join(root, name), stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(signature))
+
+
+class ReviewFrameCache:
+    """Keeps the last few loaded review frames, keyed by path, file signature and filter."""
+
+    def __init__(self, max_entries=2):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, path, columns=None, start_date=None, end_date=None):
+        """Drop-in for utils.review_store.load_reviews. Callers must not modify the returned frame."""
+        key = (os.path.abspath(path), path_signature(path), tuple(columns or ()), start_date, end_date)
+        with self._lock:
+            if key in self._frames:
+                self._frames.move_to_end(key)
+                self.hits += 1
+                return self._frames[key]
+        df = load_reviews(path, columns=columns, start_date=start_date, end_date=end_date)
+        with self._lock:
+            self.misses += 1
+            if self.max_entries > 0:
+                self._frames[key] = df
+                while len(self._frames) > self.max_entries:
+                    self._frames.popitem(last=False)
+        return df
+
+    def summary(self):
+        return f"{len(self._frames)} frames cached, {self.hits} hits / {self.misses} misses"
+
+
+class WarmState:
+    """Config, RAG context and the initialized LLM runtime shared by every job."""
+
+    def __init__(self, config_path="config/teams.yaml", docs_dir="data/docs", use_mock=False, client_options=None,
+                 data_cache_entries=2):
+        self.config_path = config_path
+        self.docs_dir = docs_dir
+        self.frames = ReviewFrameCache(max_entries=data_cache_entries)
+        self.reloads = 0
+        self._lock = threading.Lock()
+
+        # Runs model discovery, client and cache setup once for the whole service
+        self.runtime = VOCAnalyzer(config_path=config_path, project_name="service")
+        self.runtime.initialize(use_mock=use_mock, **(client_options or {}))
+        if not use_mock:
+            self.runtime.token_counter  # Tokenizer setup is paid once, not per job
+            self.runtime._prepare_rag_index()
+        self.config = self.runtime.config
+        self.rag_context = self.runtime.rag_context
+        self._signature = self._current_signature()
+        self.loaded_at = datetime.datetime.now()
+
+    def _current_signature(self):
+        return path_signature(self.config_path), path_signature(self.docs_dir)
+
+    def refresh(self, force=False):
+        """Reloads config and RAG documents if they changed on disk. Returns True if reloaded."""
+        with self._lock:
+            signature = self._current_signature()
+            if signature == self._signature and not force:
+                return False
+            config_changed = signature[0] != self._signature[0] or force
+            docs_changed = signature[1] != self._signature[1] or force
+            if config_changed:
+                self.config = self.runtime._load_config(self.config_path)
+                print(f">> [INFO] Reloaded {self.config_path}")
+            if docs_changed:
+                self.rag_context = self.runtime._load_rag_documents()
+                if self.runtime.doc_index is not None:
+                    added, removed = self.runtime.doc_index.sync()
+                    print(f">> [INFO] Vector store re-synced (+{len(added)} / -{len(removed)} files)")
+                print(f">> [INFO] Reloaded {self.docs_dir} ({len(self.rag_context)} chars)")
+            self._signature = signature
+            self.loaded_at = datetime.datetime.now()
+            self.reloads += 1
+            return True
+
+    def new_analyzer(self, project, **options):
+        """A per-job VOCAnalyzer wired to the warm config, RAG context, runtime and frame cache."""
+        self.refresh()
+        with self._lock:
+            config, rag_context = self.config, self.rag_context
+        analyzer = VOCAnalyzer(config_path=self.config_path, project_name=project, config=config,
+                               rag_context=rag_context, **options)
+        analyzer.share_runtime(self.runtime)
+        analyzer.review_loader = self.frames.load
+        return analyzer
+
+    def health(self):
+        with self._lock:
+            return {
+                "model": self.runtime.selected_model,
+                "mock_mode": self.runtime.mock_mode,
+                "teams": len((self.config or {}).get("teams", {})),
+                "rag_chars": len(self.rag_context),
+                "loaded_at": self.loaded_at.isoformat(timespec="seconds"),
+                "reloads": self.reloads,
+                "llm_client": self.runtime.client.summary() if self.runtime.client else "no calls",
+                "llm_cache": self.runtime.cache.summary() if self.runtime.cache else "disabled",
+                "review_frames": self.frames.summary(),
+            }
+
+
+class JobQueue:
+    """FIFO job queue drained by a few worker threads, with one lock per project."""
+
+    def __init__(self, warm, workers=2, max_history=200):
+        self.warm = warm
+        self.max_history = max_history
+        self.jobs = OrderedDict()  # job_id -> job dict, oldest first
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._project_locks = {}
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"voc-job-{i}", daemon=True) for i in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @staticmethod
+    def _check_field(key, value):
+        """Raises ValueError unless `value` has the type and range FIELD_TYPES expects for `key`."""
+        kind, minimum = FIELD_TYPES[key]
+        if kind is bool:
+            if not isinstance(value, bool):
+                raise ValueError(f"{key} must be true or false, got {value!r}")
+        elif kind is int:
+            # JSON true/false would pass isinstance(int); a worker count of True is a client bug
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise ValueError(f"{key} must be an integer, got {value!r}")
+            if value < minimum:
+                raise ValueError(f"{key} must be >= {minimum}, got {value}")
+        else:
+            try:
+                datetime.date.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{key} must be a YYYY-MM-DD date, got {value!r}") from None
+
+    @staticmethod
+    def validate(params):
+        """Normalized job parameters. Raises ValueError on unknown fields, bad values or a missing data path."""
+        unknown = set(params) - {"project", "data", *ANALYZER_OPTIONS, *RUN_OPTIONS}
+        if unknown:
+            raise ValueError(f"Unknown job fields: {', '.join(sorted(unknown))}")
+        for key in ("project", "data"):
+            if params.get(key) is not None and not isinstance(params[key], str):
+                raise ValueError(f"{key} must be a string, got {params[key]!r}")
+        job = {"project": VOCAnalyzer.safe_project_name(params.get("project") or "default_analysis"),
+               "data": params.get("data") or "data/raw/mock_reviews.csv"}
+        for key in [*ANALYZER_OPTIONS, *RUN_OPTIONS]:
+            if params.get(key) is not None:
+                JobQueue._check_field(key, params[key])
+                job[key] = params[key]
+        if job.get("start_date") and job.get("end_date") and job["start_date"] > job["end_date"]:
+            raise ValueError(f"start_date {job['start_date']} is after end_date {job['end_date']}")
+        if not os.path.exists(job["data"]):
+            raise ValueError(f"Review data not found at {job['data']}")
+        return job
+
+    def submit(self, params):
+        job = {"id": uuid.uuid4().hex[:12], "status": "queued", "params": self.validate(params),
+               "submitted": datetime.datetime.now().isoformat(timespec="seconds")}
+        with self._lock:
+            self.jobs[job["id"]] = job
+            self._trim()
+            queued = dict(job)
+        self._queue.put(job["id"])
+        print(f">> [INFO] Job {job['id']} queued for project {job['params']['project']}")
+        return queued
+
+    def _trim(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job["status"] in ("done", "failed")]
+        for job_id in finished[:max(0, len(self.jobs) - self.max_history)]:
+            del self.jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list(self):
+        with self._lock:
+            return [dict(job) for job in reversed(self.jobs.values())]
+
+    def _project_lock(self, project):
+        with self._lock:
+            return self._project_locks.setdefault(project, threading.Lock())
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            self.jobs[job_id].update(fields)
+
+    def _worker(self):
+        while True:
+            job_id = self._queue.get()
+            try:
+                self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job_id):
+        params = self.get(job_id)["params"]
+        with self._project_lock(params["project"]):
+            self._update(job_id, status="running", started=datetime.datetime.now().isoformat(timespec="seconds"))
+            analyzer = None
+            try:
+                options = {ANALYZER_OPTIONS[key]: params[key] for key in ANALYZER_OPTIONS if key in params}
+                analyzer = self.warm.new_analyzer(params["project"], **options)
+                analyzer.generate_full_report(params["data"], **{key: params[key] for key in RUN_OPTIONS if key in params})
+                timings = {span["name"]: round(span["total_s"], 4) for span in analyzer.metrics.to_dict()["spans"]}
+                self._update(job_id, status="done", report_path=analyzer.last_report_path, timings=timings,
+                             categories=analyzer.analyzed_count, failed_categories=analyzer.fail_count)
+            except Exception as e:
+                print(f">> [ERROR] Job {job_id} failed: {e}")
+                self._update(job_id, status="failed", error=f"{type(e).__name__}: {e}")
+            finally:
+                if analyzer:
+                    analyzer.close()
+                self._update(job_id, finished=datetime.datetime.now().isoformat(timespec="seconds"))
+
+
+def make_handler(jobs):
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("Request body must be a JSON object")
+            return payload
+
+        def do_GET(self):
+            path = self.path.rstrip("/")
+            if path == "/health":
+                self._send_json(200, {"status": "ok", **jobs.warm.health()})
+            elif path == "/jobs":
+                self._send_json(200, {"jobs": jobs.list()})
+            elif path.startswith("/jobs/"):
+                job = jobs.get(path[len("/jobs/"):])
+                self._send_json(200, job) if job else self._send_json(404, {"error": "Unknown job"})
+            else:
+                self._send_json(404, {"error": "Not found"})
+
+        def do_POST(self):
+            path = self.path.rstrip("/")
+            try:
+                if path == "/jobs":
+                    job = jobs.submit(self._read_json())
+                    self._send_json(202, {"job_id": job["id"], "status": job["status"], "params": job["params"]})
+                elif path == "/reload":
+                    self._send_json(200, {"reloaded": jobs.warm.refresh(force=True)})
+                else:
+                    self._send_json(404, {"error": "Not found"})
+            except ValueError as e:
+                self._send_json(400, {"error": str(e)})
+
+        def log_message(self, format, *args):
+            print(f">> [INFO] HTTP {self.address_string()} {format % args}")
+
+    return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="VOC Analysis Service (warm state + job queue)")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8765, help="HTTP port")
+    parser.add_argument("--config", type=str, default="config/teams.yaml", help="Team config, reloaded when it changes")
+    parser.add_argument("--mock", action="store_true", help="Run jobs in mock mode without API calls")
+    parser.add_argument("--job-workers", type=int, default=2, help="Jobs run concurrently (same-project jobs always run in order)")
+    parser.add_argument("--data-cache", type=int, default=2, help="Review files kept in memory between jobs (0 = off)")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the LLM, bypassing the on-disk response cache")
+    parser.add_argument("--rpm", type=float, default=None, help="Max LLM requests per minute, shared by all jobs")
+    parser.add_argument("--tpm", type=float, default=None, help="Max prompt tokens per minute, shared by all jobs")
+    parser.add_argument("--max-retries", type=int, default=4, help="Retries for 429/5xx/timeout errors")
+    parser.add_argument("--llm-timeout", type=float, default=120.0, help="Per-call LLM timeout in seconds")
+    args = parser.parse_args()
+
+    warm = WarmState(
+        config_path=args.config, use_mock=args.mock, data_cache_entries=args.data_cache,
+        client_options={"use_cache": not args.no_cache, "rpm": args.rpm, "tpm": args.tpm,
+                        "max_retries": args.max_retries, "timeout": args.llm_timeout},
+    )
+    jobs = JobQueue(warm, workers=args.job_workers)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(jobs))
+    print(f">> [INFO] VOC service listening on http://{args.host}:{args.port} (model: {warm.runtime.selected_model})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(">> [INFO] Shutting down.")
+    finally:
+        server.server_close()
@@ -1,34 +1,319 @@
+import argparse
+import warnings
+
 import pandas as pd
 import numpy as np
+import yaml
+from scipy import stats as scipy_stats
+
+from utils.review_store import iter_review_chunks, load_reviews
+from utils.team_matcher import TeamMatcher
+
+
+class RunningPearson:
+    """Streaming Pearson correlation: merges per-chunk means and co-moments (Chan et al.)."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.c_xy = 0.0
+
+    def update(self, x, y):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        n_b = len(x)
+        if n_b == 0:
+            return
+        mean_xb, mean_yb = x.mean(), y.mean()
+        dx, dy = x - mean_xb, y - mean_yb
+        m2_xb, m2_yb, c_xyb = (dx * dx).sum(), (dy * dy).sum(), (dx * dy).sum()
+
+        n = self.n + n_b
+        delta_x = mean_xb - self.mean_x
+        delta_y = mean_yb - self.mean_y
+        factor = self.n * n_b / n
+        self.m2_x += m2_xb + delta_x * delta_x * factor
+        self.m2_y += m2_yb + delta_y * delta_y * factor
+        self.c_xy += c_xyb + delta_x * delta_y * factor
+        self.mean_x += delta_x * n_b / n
+        self.mean_y += delta_y * n_b / n
+        self.n = n
+
+    @property
+    def r(self):
+        denom = np.sqrt(self.m2_x * self.m2_y)
+        return float(self.c_xy / denom) if denom > 0 else float('nan')
+
+
+def _simulate_sentiment(star_rating, rng=None):
+    # Adding some noise to star_rating to simulate sentiment score (0.0 to 1.0)
+    rng = rng if rng is not None else np.random.default_rng(42)
+    score = (np.asarray(star_rating, dtype=float) / 5.0) + rng.normal(0, 0.1, len(star_rating))
+    return score.clip(0, 1) # Normalize to 0-1
+
+
+def _pearson_from_sums(n, sx, sy, sxx, syy, sxy):
+    """Pearson r from (weighted) sums; works elementwise on arrays of any shape."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = n * sxy - sx * sy
+        var = (n * sxx - sx * sx) * (n * syy - sy * sy)
+        r = cov / np.sqrt(var)
+    return np.where(var > 0, np.clip(r, -1.0, 1.0), np.nan)
+
+
+def _p_value(r, n):
+    """Two-sided p-value of r under H0: rho = 0 (t-test with n - 2 dof)."""
+    r = np.asarray(r, dtype=float)
+    n = np.asarray(n, dtype=float)
+    dof = n - 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = r * np.sqrt(dof / (1.0 - r * r))
+    p = 2 * scipy_stats.t.sf(np.abs(t), np.maximum(dof, 1))
+    return np.where(dof > 0, p, np.nan)
+
+
+def _grouped_sums(codes, x, y, n_groups, weights=None):
+    """n, Σx, Σy, Σx², Σy², Σxy per group code via bincount (weights optional)."""
+    w = np.ones_like(x) if weights is None else weights
+    return tuple(np.bincount(codes, weights=w * v, minlength=n_groups)
+                 for v in (np.ones_like(x), x, y, x * x, y * y, x * y))
+
+
+def _poisson1_table(bits=16):
+    """Inverse-CDF lookup table of Poisson(1) for uniform `bits`-bit integers (far faster than rng.poisson)."""
+    k = np.arange(12)
+    pmf = np.exp(-1.0) / np.cumprod(np.r_[1, np.arange(1, 12)])
+    u = (np.arange(2 ** bits) + 0.5) / 2 ** bits
+    return np.searchsorted(np.cumsum(pmf), u).clip(max=k[-1]).astype(np.float32)
+
+
+_POISSON1 = _poisson1_table()
+
+
+def _bootstrap_ci(codes, x, y, n_groups, n_boot, confidence, rng,
+                  max_rows=5000, min_rows=500, max_total=250_000, max_cells=8_000_000):
+    """Poisson-bootstrap percentile CIs of Pearson r for every group at once.
+
+    Each resample weights every row by an independent Poisson(1) draw, which
+    approximates resampling with replacement and lets all groups and a block
+    of resamples be reduced with one sparse matrix product. Large groups are
+    bootstrapped on a random subsample (at most `max_rows`, shrinking towards
+    `min_rows` as the number of groups grows) and the interval is rescaled by
+    sqrt(m / n) (m-out-of-n bootstrap), so the cost does not grow with the
+    number of reviews.
+    """
+    from scipy import sparse
 
-def calculate_correlations(file_path="data/raw/mock_reviews.csv"):
+    # Keep at most `cap` random entries per group
+    cap = max(min_rows, min(max_rows, max_total // max(len(np.unique(codes)), 1)))
+    order = np.lexsort((rng.random(len(codes)), codes))
+    sorted_codes = codes[order]
+    group_start = np.searchsorted(sorted_codes, sorted_codes, side='left')
+    keep = order[np.arange(len(order)) - group_start < cap]
+    codes, x, y = codes[keep], x[keep], y[keep]
+
+    rows = len(codes)
+    sub_sums = _grouped_sums(codes, x, y, n_groups)
+    sub_r = _pearson_from_sums(*sub_sums)
+    # One (6 * groups x rows) matrix: row block k sums moment k per group
+    moments = (np.ones(rows), x, y, x * x, y * y, x * y)
+    stacked = sparse.csr_matrix(
+        (np.concatenate(moments), (np.concatenate([codes + k * n_groups for k in range(6)]), np.tile(np.arange(rows), 6))),
+        shape=(6 * n_groups, rows),
+    )
+    block = max(1, min(n_boot, max_cells // max(rows, 1)))
+    samples = []
+    for start in range(0, n_boot, block):
+        size = min(block, n_boot - start)
+        weights = _POISSON1[rng.integers(0, len(_POISSON1), size=(rows, size), dtype=np.uint16)]
+        sums = (stacked @ weights).reshape(6, n_groups, size)
+        samples.append(_pearson_from_sums(*sums))
+    samples = np.concatenate(samples, axis=1)
+    alpha = (1.0 - confidence) / 2
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN rows for tiny groups
+        low, high = np.nanquantile(samples, [alpha, 1 - alpha], axis=1)
+    return sub_r, low, high, sub_sums[0]
+
+
+def group_statistics(df, membership, x_col='sentiment_score', y_col='star_rating',
+                     date_col='date', date_freq=None, n_boot=1000, confidence=0.95, seed=42):
+    """Per-team (and optionally per-date-bucket) correlation statistics in one vectorized pass.
+
+    `membership` is the bool row x team frame produced by TeamMatcher.match,
+    so the analyzer's routing can be reused as-is. An "ALL" group covering
+    every row is added. Returns one row per (team[, period]) with Pearson and
+    Spearman r, their p-values, a bootstrap CI for Pearson r, the mean rating
+    and the predictive impact: the team's share of reviews times how far its
+    mean rating sits below the rest, i.e. the overall rating gain expected if
+    the team's complaints were resolved.
+    """
+    rng = np.random.default_rng(seed)
+    membership = membership.copy()
+    membership.insert(0, 'ALL', True)
+    teams = list(membership.columns)
+    matrix = membership.to_numpy(dtype=bool)
+
+    if date_freq:
+        periods = pd.to_datetime(df[date_col]).dt.to_period(date_freq)
+        period_codes, period_labels = pd.factorize(periods, sort=True)
+        period_labels = [str(p) for p in period_labels]
+    else:
+        period_codes, period_labels = np.zeros(len(df), dtype=np.int64), [None]
+    n_periods = len(period_labels)
+
+    # Long format: one entry per (row, team) membership, keyed by team * n_periods + period
+    row_idx, team_idx = np.nonzero(matrix)
+    codes = team_idx * n_periods + period_codes[row_idx]
+    n_groups = len(teams) * n_periods
+    x = df[x_col].to_numpy(dtype=float)[row_idx]
+    y = df[y_col].to_numpy(dtype=float)[row_idx]
+
+    sums = _grouped_sums(codes, x, y, n_groups)
+    n = sums[0]
+    pearson = _pearson_from_sums(*sums)
+
+    # Spearman = Pearson on within-group average ranks
+    ranks = pd.DataFrame({'g': codes, 'x': x, 'y': y}).groupby('g')[['x', 'y']].rank(method='average')
+    spearman = _pearson_from_sums(*_grouped_sums(codes, ranks['x'].to_numpy(), ranks['y'].to_numpy(), n_groups))
+
+    if n_boot:
+        sub_r, low, high, sub_n = _bootstrap_ci(codes, x, y, n_groups, n_boot, confidence, rng)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scale = np.sqrt(sub_n / n)
+        ci_low = np.clip(pearson + (low - sub_r) * scale, -1.0, 1.0)
+        ci_high = np.clip(pearson + (high - sub_r) * scale, -1.0, 1.0)
+    else:
+        ci_low = ci_high = np.full(n_groups, np.nan)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_rating = sums[2] / n
+        # Rest-of-period baseline comes from the ALL group (team index 0) of the same period
+        all_n = np.tile(n[:n_periods], len(teams))
+        all_sy = np.tile(sums[2][:n_periods], len(teams))
+        rest_mean = (all_sy - sums[2]) / (all_n - n)
+        share = n / all_n
+        impact = share * (rest_mean - mean_rating)
+
+    result = pd.DataFrame({
+        'team': np.repeat(teams, n_periods),
+        'period': period_labels * len(teams),
+        'n': n.astype(np.int64),
+        'share': share,
+        'mean_rating': mean_rating,
+        'pearson_r': pearson,
+        'pearson_p': _p_value(pearson, n),
+        'ci_low': ci_low,
+        'ci_high': ci_high,
+        'spearman_r': spearman,
+        'spearman_p': _p_value(spearman, n),
+        'predictive_impact': np.where(np.repeat(teams, n_periods) == 'ALL', np.nan, impact),
+    })
+    result = result[result['n'] > 0].reset_index(drop=True)
+    if not date_freq:
+        result = result.drop(columns='period')
+    return result
+
+
+def calculate_group_statistics(file_path="data/raw/mock_reviews.csv", config_path="config/teams.yaml",
+                               date_freq=None, n_boot=1000, confidence=0.95, seed=42,
+                               start_date=None, end_date=None):
+    """Loads reviews, routes them with TeamMatcher and returns group_statistics()."""
+    columns = ['review_text', 'star_rating', 'sentiment_score'] + (['date'] if date_freq else [])
+    df = load_reviews(file_path, columns=columns, start_date=start_date, end_date=end_date)
+    if 'sentiment_score' not in df.columns:
+        print(">> [INFO] No sentiment_score column; using simulated scores. Run sentiment_engine.py to score reviews.")
+        df['sentiment_score'] = _simulate_sentiment(df['star_rating'], np.random.default_rng(seed))
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    membership = TeamMatcher.from_config(config).match(df['review_text'])
+    return group_statistics(df, membership, date_freq=date_freq, n_boot=n_boot,
+                            confidence=confidence, seed=seed)
+
+
+def format_statistics_table(stats):
+    """Markdown table of group_statistics() output for reports."""
+    has_period = 'period' in stats.columns
+    header = "| Team |" + (" Period |" if has_period else "") + \
+             " N | Share | Avg ★ | Pearson r (p) | 95% CI | Spearman ρ (p) | Impact |\n"
+    header += "|---|" + ("---|" if has_period else "") + "---|---|---|---|---|---|---|\n"
+    lines = []
+    for row in stats.itertuples(index=False):
+        impact = "-" if pd.isna(row.predictive_impact) else f"{row.predictive_impact:+.3f}"
+        lines.append(
+            f"| {row.team} |" + (f" {row.period} |" if has_period else "") +
+            f" {row.n} | {row.share:.1%} | {row.mean_rating:.2f} |"
+            f" {row.pearson_r:.3f} ({row.pearson_p:.3g}) | [{row.ci_low:.3f}, {row.ci_high:.3f}] |"
+            f" {row.spearman_r:.3f} ({row.spearman_p:.3g}) | {impact} |"
+        )
+    return header + "\n".join(lines) + "\n"
+
+
+def calculate_correlations(file_path="data/raw/mock_reviews.csv", chunksize=None, start_date=None, end_date=None, seed=42):
     try:
-        df = pd.read_csv(file_path)
-        
-        # Since 'sentiment_score' doesn't exist in the raw mock data, 
-        # we will simulate it for testing the statistical logic.
-        # In a real scenario, this would come from the Analyzer or a separate sentiment analysis step.
-        # Adding some noise to star_rating to simulate sentiment score (0.0 to 1.0)
-        np.random.seed(42)
-        df['sentiment_score'] = (df['star_rating'] / 5.0) + np.random.normal(0, 0.1, len(df))
-        df['sentiment_score'] = df['sentiment_score'].clip(0, 1) # Normalize to 0-1
-        
-        correlation = df['star_rating'].corr(df['sentiment_score'])
-        
+        # Uses the 'sentiment_score' written by sentiment_engine.py when present.
+        # Without it the score is simulated from star_rating so the statistical logic can still be tested.
+        rng = np.random.default_rng(seed)
+        simulated = []
+
+        def with_sentiment(df):
+            if 'sentiment_score' not in df.columns:
+                simulated.append(True)
+                df['sentiment_score'] = _simulate_sentiment(df['star_rating'], rng)
+            return df
+
+        columns = ['star_rating', 'sentiment_score']
+        if chunksize:
+            # Streaming path: only the two score columns are read, one chunk at a time
+            stats = RunningPearson()
+            chunks = iter_review_chunks(file_path, chunksize, columns=columns,
+                                        start_date=start_date, end_date=end_date)
+            for chunk in chunks:
+                chunk = with_sentiment(chunk)
+                stats.update(chunk['star_rating'], chunk['sentiment_score'])
+            count, correlation = stats.n, stats.r
+        else:
+            df = with_sentiment(load_reviews(file_path, columns=columns, start_date=start_date, end_date=end_date))
+            with np.errstate(divide='ignore', invalid='ignore'):  # Constant columns give NaN, not a warning
+                count, correlation = len(df), df['star_rating'].corr(df['sentiment_score'])
+        if simulated:
+            print(">> [INFO] No sentiment_score column; using simulated scores. Run sentiment_engine.py to score reviews.")
+        p_value = float(_p_value(correlation, count))
+
         print(f"Analysis Results for {file_path}")
         print("-" * 30)
-        print(f"Data Count: {len(df)}")
-        print(f"Correlation (Star Rating vs Sentiment): {correlation:.4f}")
-        
+        print(f"Data Count: {count}")
+        print(f"Correlation (Star Rating vs Sentiment): {correlation:.4f} (p={p_value:.3g})")
+
         if correlation > 0.5:
             print(">> Result: Significant positive correlation found (Expected). Logic verified.")
         else:
             print(">> Result: Weak or no correlation. Check data quality.")
-            
+
         return correlation
     except Exception as e:
         print(f"Error in statistics engine: {e}")
         return None
 
 if __name__ == "__main__":
-    calculate_correlations()
+    parser = argparse.ArgumentParser(description="VOC Statistics Engine")
+    parser.add_argument("--file", type=str, default="data/raw/mock_reviews.csv", help="Review CSV or Parquet store to analyze")
+    parser.add_argument("--chunksize", type=int, default=None, help="Stream the file in chunks of this many rows")
+    parser.add_argument("--start-date", type=str, default=None, help="Only include reviews on/after this date (YYYY-MM-DD)")
+    parser.add_argument("--end-date", type=str, default=None, help="Only include reviews on/before this date (YYYY-MM-DD)")
+    parser.add_argument("--by-team", action="store_true", help="Per-team Pearson/Spearman, p-values, bootstrap CIs and predictive impact")
+    parser.add_argument("--config", type=str, default="config/teams.yaml", help="Team keyword config used with --by-team")
+    parser.add_argument("--date-freq", type=str, default=None, help="Also split --by-team results into date buckets (pandas period alias: D, W, M)")
+    parser.add_argument("--bootstrap", type=int, default=1000, help="Bootstrap resamples for the CI (0 = skip)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for simulated sentiment and bootstrap resampling")
+    args = parser.parse_args()
+    if args.by_team:
+        table = calculate_group_statistics(args.file, args.config, date_freq=args.date_freq, n_boot=args.bootstrap,
+                                           seed=args.seed, start_date=args.start_date, end_date=args.end_date)
+        print(format_statistics_table(table))
+    else:
+        calculate_correlations(args.file, chunksize=args.chunksize, start_date=args.start_date,
+                               end_date=args.end_date, seed=args.seed)
@@ -11,3 +11,5 @@ analyzer._log_trace(
     prompt_text="You are a VOC analyst... (Prompt content here)",
     response_text="### N [Test_Category] Result\n- Issue: Test successful"
 )
+analyzer.trace_writer.close()
+print(f"Trace written to {analyzer.trace_writer.path}")
@@ -0,0 +1,63 @@
+import os
+import shutil
+import time
+
+import pytest
+import yaml
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import service  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    shutil.copytree(os.path.join(ROOT, "config"), tmp_path / "config")
+    shutil.copytree(os.path.join(ROOT, "data", "docs"), tmp_path / "data" / "docs")
+    (tmp_path / "data" / "raw").mkdir()
+    shutil.copy(os.path.join(ROOT, "data", "raw", "mock_reviews.csv"), tmp_path / "data" / "raw")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_query_cache_holds_summaries_only(workdir):
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60).run()
+    assert not at.exception
+    assert at.metric[0].value == "50"
+    key, positions = at.session_state["selection"]
+    assert len(positions) == 50
+
+    at.sidebar.multiselect[0].set_value(["billing_team"]).run()
+    key2, positions2 = at.session_state["selection"]
+    assert key2 != key and len(positions2) == int(at.metric[0].value)
+
+
+def test_analysis_uses_sidebar_config(workdir, monkeypatch):
+    config_paths = []
+
+    class RecordingWarmState(service.WarmState):
+        def __init__(self, config_path="config/teams.yaml", **kwargs):
+            config_paths.append(config_path)
+            super().__init__(config_path=config_path, **kwargs)
+
+    monkeypatch.setattr(service, "WarmState", RecordingWarmState)
+    with open(workdir / "config" / "teams.yaml", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    with open(workdir / "config" / "alt.yaml", "w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f, allow_unicode=True)
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60).run()
+    at.sidebar.text_input[1].set_value("config/alt.yaml").run()
+    at.sidebar.checkbox[0].set_value(True).run()
+    at.button[0].click().run()
+    for _ in range(40):
+        if at.success or at.error:
+            break
+        time.sleep(0.25)
+        at.run()
+    assert not at.error, [e.value for e in at.error]
+    assert at.success
+    assert config_paths == ["config/alt.yaml"]
@@ -0,0 +1,74 @@
+import json
+import re
+
+import pandas as pd
+import pytest
+
+from analyzer import VOCAnalyzer
+
+NAMES = ["billing_team", "system_team"]
+
+
+def block(name, body=None):
+    return f"<<<CATEGORY: {name}>>>\n{body or f'### 1 [{name}] Issue 50%, 3 cases'}\n<<<END CATEGORY>>>"
+
+
+def test_split_batch_response_parses_each_category():
+    parsed = VOCAnalyzer._split_batch_response("noise\n" + block("billing_team") + "\n" + block("system_team"), NAMES)
+    assert parsed == {name: f"### 1 [{name}] Issue 50%, 3 cases" for name in NAMES}
+
+
+@pytest.mark.parametrize("response", [
+    block("other_team"),                                   # Not asked for
+    block("billing_team", "no heading"),                   # Malformed section
+    block("billing_team", "### 1 [system_team] wrong"),    # Heading names another category
+    "<<<CATEGORY: billing_team>>>\n### 1 [billing_team] x",  # Missing end delimiter
+    "",
+    None,
+])
+def test_split_batch_response_rejects_malformed_sections(response):
+    assert "billing_team" not in VOCAnalyzer._split_batch_response(response, NAMES)
+
+
+def test_first_section_wins_on_duplicates():
+    response = block("billing_team") + block("billing_team", "### 2 [billing_team] later")
+    assert VOCAnalyzer._split_batch_response(response, NAMES)["billing_team"].startswith("### 1")
+
+
+@pytest.fixture
+def analyzer(tmp_path, monkeypatch):
+    from langchain_core.runnables import RunnableLambda
+
+    monkeypatch.chdir(tmp_path)
+    prompts = []
+
+    def fake_llm(prompt):
+        prompts.append(prompt)
+        if re.search(r"<<<CATEGORY: \w+>>>\nCategory", prompt):
+            return "I could not follow the format."
+        name = re.search(r"Category: (\w+)", prompt).group(1)
+        return f"### 1 [{name}] Issue 100%, 2 cases"
+
+    a = VOCAnalyzer(project_name="batch", config={}, rag_context="", rag_top_k=0, batch_threshold=10)
+    a.selected_model = "fake"
+    a.llm = RunnableLambda(fake_llm)
+    a.prompts = prompts
+    yield a
+    a.close()
+
+
+def test_unparseable_batch_is_traced_and_falls_back(analyzer):
+    groups = [(name, pd.DataFrame({"review_text": [f"{name} review 1", f"{name} review 2"]}), 2) for name in NAMES]
+    sections = analyzer.analyze_batch(groups)
+
+    assert len(analyzer.prompts) == 3  # One batch call, then one call per category
+    assert all(sections[name].startswith(f"### 1 [{name}]") for name in NAMES)
+
+    analyzer.trace_writer.flush()
+    with open(analyzer.trace_writer.path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    batch = [r for r in records if r["category"].startswith("batch_")]
+    assert len(batch) == 1
+    assert batch[0]["response"] == "I could not follow the format."
+    assert batch[0]["batch"] == {"categories": NAMES, "call_succeeded": True, "unparsed": NAMES}
+    assert {r["category"] for r in records} >= set(NAMES)
@@ -0,0 +1,16 @@
+import pandas as pd
+
+from generate_data import generate_reviews
+
+
+def test_same_seed_and_end_date_give_the_same_file(tmp_path):
+    paths = [tmp_path / "a.csv", tmp_path / "b.csv"]
+    for path in paths:
+        assert generate_reviews(3000, n_teams=5, days=10, seed=7, output=str(path), chunksize=1000,
+                                end_date="2025-06-30", config_out=str(tmp_path / "teams.yaml")) == 3000
+    assert paths[0].read_bytes() == paths[1].read_bytes()
+
+    df = pd.read_csv(paths[0])
+    assert len(df) == 3000 and df["review_id"].is_unique
+    assert df["date"].min() >= "2025-06-20" and df["date"].max() <= "2025-06-30"
+    assert df["star_rating"].between(1, 5).all()
@@ -0,0 +1,87 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from utils.incremental import IncrementalState, ReviewSetHasher, format_count_change
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "results" / "p").mkdir(parents=True)
+    return tmp_path
+
+
+def test_section_reused_only_for_same_fingerprint(workdir):
+    state = IncrementalState("p")
+    fingerprint = state.fingerprint("digest", "context")
+    state.update("billing_team", fingerprint, 8, "### section")
+    state.save()
+
+    reloaded = IncrementalState("p")
+    assert reloaded.reusable_section("billing_team", fingerprint) == "### section"
+    assert reloaded.reusable_section("billing_team", state.fingerprint("digest", "other context")) is None
+    assert reloaded.reusable_section("billing_team", state.fingerprint("new digest", "context")) is None
+    assert reloaded.previous_count("billing_team") == 8
+
+
+def test_retain_drops_unmatched_teams(workdir):
+    state = IncrementalState("p")
+    state.update("a", "f", 1, "x")
+    state.update("b", "f", 1, "y")
+    state.retain({"a": 1})
+    assert list(state.teams) == ["a"]
+
+
+def test_unreadable_state_is_ignored(workdir):
+    (workdir / "results" / "p" / IncrementalState.FILENAME).write_text("{not json", encoding="utf-8")
+    assert IncrementalState("p").teams == {}
+
+
+def test_review_set_digest_is_chunking_invariant():
+    ids = pd.Series(range(100))
+    whole = ReviewSetHasher().update(ids).hexdigest()
+    chunked = ReviewSetHasher().update(ids[:30]).update(ids[30:]).hexdigest()
+    assert whole == chunked
+    assert ReviewSetHasher().update(ids[::-1]).hexdigest() != whole
+
+
+def test_format_count_change():
+    assert format_count_change(19, 18) == "19건(+5.6%)"
+    assert format_count_change(5, None) == "5건(new)"
+
+
+def test_context_key_covers_prompt_settings(workdir):
+    from analyzer import VOCAnalyzer
+
+    base = VOCAnalyzer(project_name="p", config={}, rag_context="docs")
+    key = base._context_key()
+    assert VOCAnalyzer(project_name="p", config={}, rag_context="docs")._context_key() == key
+    for option in ({"prompt_token_budget": 4000}, {"batch_threshold": 10}, {"batch_size": 3}, {"rag_top_k": 0}):
+        assert VOCAnalyzer(project_name="p", config={}, rag_context="docs", **option)._context_key() != key, option
+    assert VOCAnalyzer(project_name="p", config={}, rag_context="other docs")._context_key() != key
+
+
+def test_sections_live_in_their_own_files(workdir):
+    state = IncrementalState("p")
+    state.update("a", "f1", 1, "### a v1")
+    state.update("a", "f2", 2, "### a v2")
+    state.update("b", "f1", 1, "### b")
+    state.retain({"a": 2})
+    state.save()
+
+    with open(state.path, encoding="utf-8") as f:
+        assert "###" not in f.read()
+    assert os.listdir(state.sections_dir) == [state.teams["a"]["section_file"]]
+    assert IncrementalState("p").reusable_section("a", "f2") == "### a v2"
+
+    os.remove(os.path.join(state.sections_dir, state.teams["a"]["section_file"]))
+    assert IncrementalState("p").reusable_section("a", "f2") is None
+
+
+def test_inline_sections_of_older_state_files_are_reused(workdir):
+    (workdir / "results" / "p" / IncrementalState.FILENAME).write_text(
+        json.dumps({"teams": {"a": {"fingerprint": "f", "count": 3, "section": "### old"}}}), encoding="utf-8")
+    assert IncrementalState("p").reusable_section("a", "f") == "### old"
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analyzer import VOCAnalyzer
+from utils.ingest import TeamBucket, stream_team_buckets
+
+CONFIG = {
+    "teams": {"billing_team": {"keywords": ["결제"]}, "system_team": {"keywords": ["로그인", "오류"]}},
+    "notifications": {"rules": {"max_mean_rating": 3.5, "min_negative_share": 0.3}},
+}
+
+
+@pytest.fixture
+def data_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rng = np.random.default_rng(3)
+    n = 1200
+    texts = rng.choice(["결제 실패", "로그인 오류", "결제 오류", "배송 문의"], n)
+    ratings = rng.integers(1, 6, n).astype(float)
+    ratings[rng.random(n) < 0.1] = np.nan
+    # Sampled rows are the file's first rows, so make those unrepresentative of the whole
+    ratings[:300] = 5.0
+    pd.DataFrame({"review_id": range(n), "review_text": texts, "star_rating": ratings}).to_csv("reviews.csv", index=False)
+    return "reviews.csv"
+
+
+def test_bucket_aggregates_cover_every_row():
+    bucket = TeamBucket(max_samples=2)
+    bucket.add(pd.DataFrame({"review_id": [1, 2, 3], "review_text": ["a"] * 3, "star_rating": [1, 2, None]}))
+    bucket.add(pd.DataFrame({"review_id": [4], "review_text": ["b"], "star_rating": [5]}))
+    assert (bucket.count, bucket.rated_count, bucket.negative_count) == (4, 3, 2)
+    assert bucket.rating_stats() == {"mean_rating": pytest.approx(8 / 3), "negative_share": pytest.approx(2 / 3)}
+    assert len(bucket.sample_frame()) == 2
+    assert TeamBucket().rating_stats() == {"mean_rating": None, "negative_share": None}
+
+
+def test_streaming_matches_full_load(data_path):
+    analyzer = VOCAnalyzer(project_name="ingest", config=CONFIG, rag_context="")
+    full_groups, full_digests, full_ratings = analyzer._load_team_groups(data_path)
+    stream_groups, stream_digests, stream_ratings = analyzer._stream_team_groups(data_path, chunksize=97)
+
+    assert [(team, count) for team, _, count in stream_groups] == [(team, count) for team, _, count in full_groups]
+    assert stream_digests == full_digests
+    assert stream_ratings.keys() == full_ratings.keys()
+    for team, stats in full_ratings.items():
+        assert stream_ratings[team] == pytest.approx(stats)
+        reviews = next(df for name, df, _ in full_groups if name == team)
+        ratings = reviews["star_rating"].dropna()
+        assert stats == pytest.approx({"mean_rating": ratings.mean(), "negative_share": (ratings <= 2).mean()})
+
+    buckets, total_rows = stream_team_buckets(data_path, CONFIG, chunksize=500, max_samples=10)
+    assert total_rows == 1200
+    assert {team: b.count for team, b in buckets.items()} == {team: count for team, _, count in full_groups}
+    assert all(len(b.sample_frame()) == 10 for b in buckets.values())
+
+
+def test_alerts_do_not_depend_on_chunksize(data_path):
+    alerts = []
+    for chunksize in (None, 97):
+        analyzer = VOCAnalyzer(project_name=f"ingest_{chunksize}", config=CONFIG, rag_context="")
+        load = analyzer._stream_team_groups(data_path, chunksize) if chunksize else analyzer._load_team_groups(data_path)
+        team_groups, _, ratings = load
+        added = []
+        analyzer.notifier.add = lambda team, url, alert, detail=None: added.append((team, alert))
+        analyzer._queue_alerts(team_groups, {}, {}, ratings)
+        alerts.append(added)
+        analyzer.close()
+    assert alerts[0] and alerts[0] == alerts[1]
@@ -0,0 +1,57 @@
+import os
+import time
+
+from utils.llm_cache import LLMResponseCache
+
+
+def age(path, seconds):
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_roundtrip_and_key(tmp_path):
+    cache = LLMResponseCache(str(tmp_path))
+    key = cache.make_key("model", "prompt", 0.0)
+    assert key != cache.make_key("model", "prompt", 0.5)
+    assert key != cache.make_key("other", "prompt", 0.0)
+    assert cache.get(key) is None
+    cache.put(key, "response", category="billing_team")
+    assert cache.get(key) == "response"
+    cache.discard(key)
+    assert cache.get(key) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_expired_entries_are_misses_and_removed(tmp_path):
+    cache = LLMResponseCache(str(tmp_path), max_age_days=1)
+    key = cache.make_key("m", "p", 0.0)
+    cache.put(key, "stale")
+    age(cache._path(key), 2 * 86400)
+    assert cache.get(key) is None
+    assert not os.path.exists(cache._path(key))
+
+
+def test_oldest_entries_are_evicted_past_the_size_limit(tmp_path):
+    cache = LLMResponseCache(str(tmp_path), max_size_mb=3000 / (1024 * 1024))
+    keys = [cache.make_key("m", f"p{i}", 0.0) for i in range(6)]
+    for i, key in enumerate(keys):
+        cache.put(key, "x" * 900)
+        age(cache._path(key), 100 - i)  # Later puts are newer
+
+    kept = [key for key in keys if os.path.exists(cache._path(key))]
+    assert kept == keys[-len(kept):]  # Only the newest survive
+    assert 0 < len(kept) < len(keys)
+    assert sum(os.path.getsize(cache._path(key)) for key in kept) <= cache.max_bytes
+
+    reopened = LLMResponseCache(str(tmp_path), max_size_mb=3000 / (1024 * 1024))
+    assert reopened._total_bytes == sum(os.path.getsize(cache._path(key)) for key in kept)
+
+
+def test_stale_temp_files_are_cleaned_up(tmp_path):
+    (tmp_path / "ab").mkdir()
+    stale, fresh = tmp_path / "ab" / "x.json.1.tmp", tmp_path / "ab" / "y.json.2.tmp"
+    stale.write_text("{", encoding="utf-8")
+    fresh.write_text("{", encoding="utf-8")
+    age(stale, 7200)
+    LLMResponseCache(str(tmp_path))
+    assert not stale.exists() and fresh.exists()
@@ -0,0 +1,163 @@
+import threading
+import time
+
+import pytest
+
+from utils.llm_client import LLMTimeoutError, RateLimitedLLM, TokenBucket, is_retryable
+
+
+class FakeLLMError(Exception):
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ResourceExhausted(Exception):
+    """Named like the Google SDK's 429 error, without a status attribute."""
+
+
+class FakeLLM:
+    """Runnable stand-in: raises the queued errors first, then returns `response`."""
+
+    def __init__(self, errors=(), response="### ok", latency=0.0):
+        self.errors = list(errors)
+        self.response = response
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt_text):
+        with self._lock:
+            self.calls += 1
+            error = self.errors.pop(0) if self.errors else None
+        if self.latency:
+            time.sleep(self.latency)
+        if error is not None:
+            raise error
+        return self.response
+
+
+def client(runnable, **options):
+    delays = []
+    options = {"sleep": delays.append, "seed": 1, "timeout": None, **options}
+    return RateLimitedLLM(runnable, **options), delays
+
+
+@pytest.mark.parametrize("error, expected", [
+    (FakeLLMError("rate limited", status_code=429), True),
+    (FakeLLMError("backend", status_code=503), True),
+    (FakeLLMError("invalid argument: internal field 500 too long", status_code=400), False),
+    (FakeLLMError("API key not valid", status_code=403), False),
+    (ValueError("HTTP 500 internal error"), False),  # No status or type to go on: not retried
+    (ResourceExhausted("quota"), True),
+    (TimeoutError(), True),
+    (ConnectionResetError(), True),
+])
+def test_is_retryable_uses_status_and_type(error, expected):
+    assert is_retryable(error) is expected
+
+
+def test_is_retryable_follows_the_cause_chain():
+    try:
+        try:
+            raise FakeLLMError("upstream", status_code=429)
+        except FakeLLMError as e:
+            raise RuntimeError("wrapped by the SDK") from e
+    except RuntimeError as wrapped:
+        assert is_retryable(wrapped)
+
+
+def test_retries_then_succeeds_with_per_call_info():
+    llm = FakeLLM([FakeLLMError("429", status_code=429), FakeLLMError("503", status_code=503)])
+    c, delays = client(llm, max_retries=4, base_delay=1.0)
+    text, info = c.invoke("prompt")
+    assert text == "### ok"
+    assert info["attempts"] == 3 and info["retries"] == 2
+    assert len(delays) == 2 and 0.5 <= delays[0] <= 1.0 and 1.0 <= delays[1] <= 2.0
+    assert c.counters["retries"] == 2 and c.counters["errors"] == 0
+
+
+def test_non_retryable_error_is_raised_immediately_with_call_info():
+    llm = FakeLLM([FakeLLMError("bad request: internal", status_code=400)])
+    c, delays = client(llm)
+    with pytest.raises(FakeLLMError) as raised:
+        c.invoke("prompt")
+    assert llm.calls == 1 and delays == []
+    assert raised.value.call_info == {"attempts": 1, "retries": 0, "throttle_wait_s": 0.0}
+
+
+def test_gives_up_after_max_retries_and_reports_them():
+    llm = FakeLLM([FakeLLMError("503", status_code=503)] * 5)
+    c, _ = client(llm, max_retries=2)
+    with pytest.raises(FakeLLMError) as raised:
+        c.invoke("prompt")
+    assert llm.calls == 3
+    assert raised.value.call_info["retries"] == 2
+    assert c.counters["errors"] == 1
+
+
+def test_retry_hint_extends_backoff():
+    llm = FakeLLM([FakeLLMError("429 Please retry in 7.5s", status_code=429)])
+    c, delays = client(llm, base_delay=0.1)
+    c.invoke("prompt")
+    assert delays == [7.5]
+
+
+def test_timeout_is_retried_and_reported():
+    llm = FakeLLM(latency=0.3)
+    c, _ = client(llm, timeout=0.05, max_retries=1)
+    with pytest.raises(LLMTimeoutError) as raised:
+        c.invoke("prompt")
+    assert raised.value.call_info["retries"] == 1
+    assert c.counters["timeouts"] == 2
+
+
+def test_hung_calls_are_bounded_by_concurrency_slots():
+    llm = FakeLLM(latency=0.5)
+    c, _ = client(llm, timeout=0.05, max_retries=0, max_concurrency=1)
+    with pytest.raises(LLMTimeoutError):
+        c.invoke("first")  # Still running in the background, holding the only slot
+    with pytest.raises(LLMTimeoutError, match="No free LLM call slot"):
+        c.invoke("second")
+    assert llm.calls == 1
+
+
+def test_concurrent_calls_report_their_own_retries():
+    class PerPrompt:
+        def __init__(self):
+            self.failures = {"flaky": 3}
+            self.lock = threading.Lock()
+
+        def invoke(self, prompt):
+            with self.lock:
+                if self.failures.get(prompt, 0):
+                    self.failures[prompt] -= 1
+                    raise FakeLLMError("503", status_code=503)
+            return prompt
+
+    c, _ = client(PerPrompt(), max_retries=5)
+    infos = {}
+
+    def run(prompt):
+        infos[prompt] = c.invoke(prompt)[1]
+
+    threads = [threading.Thread(target=run, args=(p,)) for p in ("flaky", "steady")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert infos["flaky"]["retries"] == 3 and infos["steady"]["retries"] == 0
+
+
+def test_token_bucket_waits_for_refill():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(60, capacity=2, clock=lambda: now[0], sleep=sleep)
+    assert bucket.acquire() == 0.0 and bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(1.0)
+    assert sleeps == [pytest.approx(1.0)]
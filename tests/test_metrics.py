@@ -0,0 +1,78 @@
+import json
+import threading
+
+import pytest
+
+from utils.metrics import Metrics
+
+
+@pytest.fixture
+def metrics():
+    m = Metrics(prefix="voc")
+    with m.span("llm_call", category="billing_team"):
+        pass
+    m.observe("llm_call", 0.5, category="billing_team")
+    m.observe("csv_read", 1.25)
+    m.inc("llm_cache_hits")
+    m.inc("llm_cache_hits", 2)
+    m.inc("alert-sent", team='say "hi"\n')
+    m.record_category("billing_team", latency_s=0.5, prompt_tokens=120, status="done", cached=True)
+    m.record_category("system_team", prompt_tokens=80)
+    return m
+
+
+def test_to_dict_aggregates_spans_counters_and_categories(metrics):
+    data = metrics.to_dict()
+    spans = {(s["name"], tuple(s["labels"].items())): s for s in data["spans"]}
+    llm = spans[("llm_call", (("category", "billing_team"),))]
+    assert llm["count"] == 2 and llm["max_s"] == 0.5 and 0.5 <= llm["total_s"] < 1.0
+    assert spans[("csv_read", ())] == {"name": "csv_read", "labels": {}, "count": 1, "total_s": 1.25, "max_s": 1.25}
+    assert {"name": "llm_cache_hits", "labels": {}, "value": 3} in data["counters"]
+    assert data["categories"]["billing_team"]["status"] == "done"
+    assert data["elapsed_s"] >= 0
+
+
+def test_prometheus_text(metrics):
+    lines = metrics.to_prometheus().splitlines()
+    assert lines[0] == "# TYPE voc_span_seconds summary"
+    assert 'voc_span_seconds_sum{span="csv_read"} 1.25' in lines
+    assert 'voc_span_seconds_count{span="csv_read"} 1' in lines
+    assert 'voc_span_seconds_count{span="llm_call",category="billing_team"} 2' in lines
+    assert 'voc_span_seconds_max{span="llm_call",category="billing_team"} 0.5' in lines
+
+    assert "# TYPE voc_llm_cache_hits_total counter" in lines
+    assert "voc_llm_cache_hits_total 3" in lines
+    # Invalid metric name characters are replaced, label values escaped
+    assert 'voc_alert_sent_total{team="say \\"hi\\"\\n"} 1' in lines
+
+    # Only numeric category values become gauges; strings and booleans are left out
+    assert "# TYPE voc_category_prompt_tokens gauge" in lines
+    assert 'voc_category_prompt_tokens{category="billing_team"} 120' in lines
+    assert 'voc_category_prompt_tokens{category="system_team"} 80' in lines
+    assert 'voc_category_latency_s{category="billing_team"} 0.5' in lines
+    assert not any("status" in line or "cached" in line for line in lines)
+    assert lines[-1].startswith("voc_run_elapsed_seconds ")
+
+
+def test_write_round_trips(metrics, tmp_path):
+    json_path, prom_path = tmp_path / "run" / "metrics.json", tmp_path / "run" / "metrics.prom"
+    metrics.write(str(json_path), str(prom_path))
+    written = json.loads(json_path.read_text(encoding="utf-8"))
+    expected = metrics.to_dict()
+    assert written.pop("elapsed_s") <= expected.pop("elapsed_s")
+    assert written == expected
+    assert prom_path.read_text(encoding="utf-8").startswith("# TYPE voc_span_seconds summary\n")
+    assert not list(tmp_path.glob("run/*.tmp"))
+
+    metrics.write(str(tmp_path / "only.json"))
+    assert [p.name for p in tmp_path.glob("only*")] == ["only.json"]
+
+
+def test_counters_are_thread_safe():
+    m = Metrics()
+    threads = [threading.Thread(target=lambda: [m.inc("calls") for _ in range(1000)]) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert m.to_dict()["counters"] == [{"name": "calls", "labels": {}, "value": 8000}]
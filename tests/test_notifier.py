@@ -0,0 +1,150 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.notifier import NotificationDispatcher, evaluate_alerts
+
+
+class StubWebhooks:
+    """Local webhook server. Paths: /ok, /flaky (429 twice, then 200), /down (503), /bad (400), /slow (200 after 0.2s)."""
+
+    def __init__(self):
+        self.received = []  # (path, payload, arrival time) of accepted posts
+        self.attempts = {}
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub._lock:
+                    stub.attempts[self.path] = attempts = stub.attempts.get(self.path, 0) + 1
+                status = {"/down": 503, "/bad": 400}.get(self.path, 200)
+                if self.path == "/flaky" and attempts <= 2:
+                    status = 429
+                if self.path == "/slow":
+                    time.sleep(0.2)
+                if status == 200:
+                    with stub._lock:
+                        stub.received.append((self.path, payload, time.perf_counter()))
+                self.send_response(status)
+                if status == 429:
+                    self.send_header("Retry-After", "0.5")
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = StubWebhooks()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def dispatcher(tmp_path):
+    dispatcher = NotificationDispatcher(rate_per_minute=0, max_retries=2, base_delay=0.01, max_delay=1.0,
+                                        dead_letter_path=str(tmp_path / "dead.jsonl"), seed=0)
+    yield dispatcher
+    dispatcher.close()
+
+
+def test_alerts_are_coalesced_per_team_and_webhook(stub, dispatcher):
+    dispatcher.add("billing_team", f"{stub.url}/ok", "리뷰 12건", detail="환불 지연")
+    dispatcher.add("billing_team", f"{stub.url}/ok", "평균 평점 1.50", detail="환불 지연")
+    dispatcher.add("system_team", f"{stub.url}/ok", "리뷰 7건")
+    assert not dispatcher.add("design_team", "PLACEHOLDER_URL", "ignored")
+    assert dispatcher.dispatch(title="weekly") == 2
+    dispatcher.close()
+
+    texts = sorted(payload["text"] for _, payload, _ in stub.received)
+    assert texts == [
+        "[VOC Alert] billing_team · weekly\n- 리뷰 12건\n- 평균 평점 1.50\n> 환불 지연",
+        "[VOC Alert] system_team · weekly\n- 리뷰 7건",
+    ]
+    assert dispatcher.counters == {"alerts": 3, "messages": 2, "sent": 2, "retries": 0, "failed": 0, "skipped": 1}
+
+
+def test_rate_limited_post_is_retried_after_retry_after(stub, dispatcher):
+    dispatcher.add("billing_team", f"{stub.url}/flaky", "alert")
+    started = time.perf_counter()
+    dispatcher.dispatch()
+    dispatcher.flush()
+    assert stub.attempts["/flaky"] == 3
+    assert len(stub.received) == 1
+    assert stub.received[0][2] - started >= 1.0  # Two Retry-After: 0.5 waits
+    assert dispatcher.counters["retries"] == 2
+
+
+def test_failures_are_dead_lettered_without_the_webhook_path(stub, dispatcher, tmp_path):
+    dispatcher.add("system_team", f"{stub.url}/down", "server down")
+    dispatcher.add("billing_team", f"{stub.url}/bad", "bad request")
+    dispatcher.dispatch()
+    dispatcher.flush()
+
+    assert stub.attempts == {"/down": 3, "/bad": 1}  # 5xx retried, 4xx not
+    records = [json.loads(line) for line in open(tmp_path / "dead.jsonl", encoding="utf-8")]
+    assert sorted((r["team"], r["status"], r["attempts"]) for r in records) == [
+        ("billing_team", 400, 1), ("system_team", 503, 3)]
+    assert all(r["webhook_host"] == stub.url[len("http://"):] for r in records)
+    assert dispatcher.counters["failed"] == 2
+
+
+def test_rate_limited_webhook_does_not_delay_others(stub, dispatcher):
+    dispatcher.add("system_team", f"{stub.url}/flaky", "throttled")
+    dispatcher.dispatch()
+    time.sleep(0.1)  # The /flaky sender is now waiting out Retry-After
+    started = time.perf_counter()
+    dispatcher.add("billing_team", f"{stub.url}/ok", "on time")
+    dispatcher.dispatch()
+    dispatcher.flush()
+
+    arrivals = {path: at for path, _, at in stub.received}
+    assert arrivals["/ok"] - started < 0.3
+    assert arrivals["/flaky"] > arrivals["/ok"]
+
+
+def test_close_delivers_everything_dispatched(stub, dispatcher):
+    for i in range(3):
+        dispatcher.add(f"team_{i}", f"{stub.url}/slow", f"alert {i}")
+    dispatcher.add("billing_team", f"{stub.url}/ok", "alert")
+    assert dispatcher.dispatch() == 4
+    dispatcher.close()
+
+    assert sorted(path for path, _, _ in stub.received) == ["/ok", "/slow", "/slow", "/slow"]
+    with pytest.raises(RuntimeError):
+        dispatcher.dispatch()
+
+
+def test_evaluate_alerts_skips_missing_stats():
+    rules = {"max_mean_rating": 2.0, "min_negative_share": 0.5, "min_change_pct": 50}
+    assert evaluate_alerts(rules, {"count": 12, "mean_rating": None, "negative_share": 0.6}) == [
+        "1~2점 리뷰 비율 60.0% (기준 50% 이상)"]
+    assert evaluate_alerts(rules, {"count": 3, "mean_rating": 2.5, "change_pct": 20.0}) == []
+
+
+def test_min_reviews_gates_every_alert():
+    rules = {"min_reviews": 10, "max_mean_rating": 2.0, "min_change_pct": 50}
+    stats = {"mean_rating": 1.5, "change_pct": 80.0}
+    assert evaluate_alerts(rules, {"count": 9, **stats}) == []
+    assert evaluate_alerts(rules, {**stats}) == []
+    assert evaluate_alerts(rules, {"count": 10, **stats}) == [
+        "평균 평점 1.50 (기준 2.0 이하)", "직전 실행 대비 +80.0% (기준 +50% 이상)"]
+    assert evaluate_alerts({"min_reviews": 10}, {"count": 500}) == []  # A gate alone never alerts
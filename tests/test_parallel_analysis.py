@@ -0,0 +1,80 @@
+import re
+import time
+
+import pandas as pd
+import pytest
+
+from analyzer import VOCAnalyzer
+
+TEAMS = ["alpha_team", "beta_team", "gamma_team", "delta_team", "omega_team"]
+CONFIG = {"teams": {team: {"keywords": [team.split("_")[0]]} for team in TEAMS}}
+COUNTS = [6, 2, 5, 1, 3]  # Reviews per team; with batching, teams of <= 3 reviews share calls
+
+
+@pytest.fixture
+def data_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    texts = [f"{team.split('_')[0]} review {i}" for team, n in zip(TEAMS, COUNTS) for i in range(n)]
+    pd.DataFrame({"review_id": range(len(texts)), "review_text": texts, "star_rating": 3}).to_csv("reviews.csv", index=False)
+    return "reviews.csv"
+
+
+def fake_llm(prompt):
+    names = re.findall(r"<<<CATEGORY: (\w+)>>>\nCategory", prompt)
+    if names:
+        return "\n".join(f"<<<CATEGORY: {n}>>>\n### 1 [{n}] Issue 100%, 1 cases\n<<<END CATEGORY>>>" for n in names)
+    name = re.search(r"Category: (\w+)", prompt).group(1)
+    # Earlier teams answer last, so parallel runs complete out of config order
+    time.sleep(0.05 * (len(TEAMS) - TEAMS.index(name)))
+    if name == "gamma_team":
+        raise ValueError("bad request")  # Not retryable, so the call fails at once
+    return f"### 1 [{name}] Issue 100%, 2 cases"
+
+
+def run(workers, batch_threshold, data_path):
+    from langchain_core.runnables import RunnableLambda
+
+    a = VOCAnalyzer(project_name=f"w{workers}_b{batch_threshold}", config=CONFIG, rag_context="", rag_top_k=0,
+                    max_workers=workers, batch_threshold=batch_threshold)
+    a.selected_model = "fake"
+    a.llm = RunnableLambda(fake_llm)
+    with open(a.generate_full_report(data_path), encoding="utf-8") as f:
+        report = f.read()
+    a.close()
+    return a, report
+
+
+@pytest.mark.parametrize("batch_threshold", [0, 3])
+def test_parallel_run_matches_serial_run(data_path, batch_threshold):
+    serial, serial_report = run(1, batch_threshold, data_path)
+    parallel, parallel_report = run(3, batch_threshold, data_path)
+
+    def section_order(report):
+        # Every section's audit table starts with its team's first review; failed sections have no '###' line
+        return [f"{prefix}_team" for prefix in re.findall(r"\*\*Raw Data\*\* \| - (\w+) review", report)]
+
+    def headlines(report):
+        return [line for line in report.splitlines() if line.startswith("### ")]
+
+    def summary_rows(report):
+        # Category, Cases and Status columns of the execution summary table
+        return [tuple(cell.strip() for cell in line.split("|")[1:4])
+                for line in report.splitlines() if line.startswith("| ") and line.split("|")[1].strip() in TEAMS]
+
+    assert section_order(serial_report) == section_order(parallel_report) == TEAMS
+    assert headlines(parallel_report) == headlines(serial_report)
+    assert summary_rows(parallel_report) == summary_rows(serial_report)
+    assert [row[0] for row in summary_rows(serial_report)] == TEAMS
+    assert dict((row[0], row[2]) for row in summary_rows(serial_report))["gamma_team"] == "Failed"
+
+    for a in (serial, parallel):
+        assert [stat["Category"] for stat in a.analysis_stats] == TEAMS
+    assert [s["Status"] for s in parallel.analysis_stats] == [s["Status"] for s in serial.analysis_stats]
+    assert (parallel.analyzed_count, parallel.success_count, parallel.fail_count, parallel.llm_calls) == \
+        (serial.analyzed_count, serial.success_count, serial.fail_count, serial.llm_calls)
+    assert (serial.analyzed_count, serial.fail_count) == (5, 1)
+
+    def category_counters(a):
+        return sorted((c["labels"]["status"], c["value"]) for c in a.metrics.to_dict()["counters"] if c["name"] == "categories")
+
+    assert category_counters(parallel) == category_counters(serial)
@@ -0,0 +1,99 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from utils.report_writer import ReportWriter
+
+
+def test_sections_are_written_in_position_order(tmp_path):
+    path = tmp_path / "report.md"
+    writer = ReportWriter(str(path), total=3, header="H\n")
+    writer.add(2, "c")
+    writer.add(1, "b")
+    assert not path.exists()
+    assert (tmp_path / "report.md.tmp").read_text(encoding="utf-8") == "H\n"  # Held until position 0 arrives
+    writer.add(0, "a")
+    assert (tmp_path / "report.md.tmp").read_text(encoding="utf-8") == "H\na\n\nb\n\nc"
+    assert writer.close("\nF") == str(path)
+    assert path.read_text(encoding="utf-8") == "H\na\n\nb\n\nc\nF"
+    assert writer.bytes_written == len("H\na\n\nb\n\nc\nF")
+
+
+def test_missing_positions_are_skipped_on_close(tmp_path):
+    writer = ReportWriter(str(tmp_path / "report.md"), total=3, header="")
+    writer.add(2, "c")
+    writer.close()
+    assert (tmp_path / "report.md").read_text(encoding="utf-8") == "c"
+
+
+def test_abort_discards_the_partial_report(tmp_path):
+    writer = ReportWriter(str(tmp_path / "report.md"), total=2)
+    writer.add(0, "a")
+    writer.abort()
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.fixture
+def analyzer_factory(tmp_path, monkeypatch):
+    from langchain_core.runnables import RunnableLambda
+
+    from analyzer import VOCAnalyzer
+
+    monkeypatch.chdir(tmp_path)
+    pd.DataFrame({
+        "review_id": range(4),
+        "review_text": ["결제 오류", "결제 실패", "로그인 안됨", "로그인 오류"],
+        "star_rating": [1, 2, 1, 2],
+    }).to_csv("reviews.csv", index=False)
+    config = {"teams": {"billing_team": {"keywords": ["결제"]}, "system_team": {"keywords": ["로그인"]}}}
+    calls = []
+    analyzers = []
+
+    def fake_llm(prompt):
+        name = prompt.split("Category: ")[1].split()[0]
+        calls.append(name)
+        if name == "system_team":
+            raise ValueError("bad request")
+        return f"### 1 [{name}] Issue 100%, 2 cases"
+
+    def make():
+        a = VOCAnalyzer(project_name="stream", config=config, rag_context="", rag_top_k=0, incremental=True)
+        a.selected_model = "fake"
+        a.llm = RunnableLambda(fake_llm)
+        analyzers.append(a)
+        return a
+
+    make.calls = calls
+    yield make
+    for a in analyzers:
+        a.close()
+
+
+def test_full_report_streams_sections_and_keeps_only_metadata(analyzer_factory):
+    analyzer = analyzer_factory()
+    kept = []
+    run_categories = analyzer._run_categories
+    analyzer._run_categories = lambda *args, **kwargs: kept.append(run_categories(*args, **kwargs))
+
+    path = analyzer.generate_full_report("reviews.csv")
+    report = open(path, encoding="utf-8").read()
+    assert kept == [{}]  # Sections went to the writer, not into a dict
+    assert report.index("### 1 [billing_team]") < report.index("system_team")
+    assert "# 📊 Execution Summary" in report
+
+    with open("results/stream/incremental_state.json", encoding="utf-8") as f:
+        teams = json.load(f)["teams"]
+    assert list(teams) == ["billing_team"]  # The failed section is not stored for reuse
+    assert "section" not in teams["billing_team"]
+    assert os.listdir("results/stream/sections") == [teams["billing_team"]["section_file"]]
+
+    second = analyzer_factory()
+    second_report = open(second.generate_full_report("reviews.csv"), encoding="utf-8").read()
+    assert analyzer_factory.calls.count("billing_team") == 1  # Reused from its section file
+    assert "### 1 [billing_team] Issue 100%, 2 cases" in second_report
+
+
+def test_missing_data_returns_none(analyzer_factory):
+    assert analyzer_factory().generate_full_report("missing.csv") is None
@@ -0,0 +1,39 @@
+import pandas as pd
+
+from utils.review_sampler import cluster_reviews, format_cluster_lines, normalize_texts
+
+
+def test_normalize_strips_noise_and_masks_digits():
+    texts = ["[결제오류] 결제 실패 ㅠㅠ!!", "주문번호 12345 환불 안됨...", "  App   CRASHED 😡 ", None]
+    assert normalize_texts(texts).tolist() == ["결제 실패", "주문번호 0 환불 안됨", "app crashed", ""]
+
+
+def test_duplicates_and_near_duplicates_are_merged_with_exact_counts():
+    texts = ["결제가 안돼요 ㅠㅠ"] * 5 + ["결제가 안돼요!!"] * 2 + ["로그인 오류 발생"] * 3 + ["배송이 너무 늦어요"]
+    clusters = cluster_reviews(texts)
+    assert clusters["count"].tolist() == [7, 3, 1]
+    assert clusters["representative"].tolist() == ["결제가 안돼요 ㅠㅠ", "로그인 오류 발생", "배송이 너무 늦어요"]
+    assert clusters["variants"].tolist() == [1, 1, 1]  # Both payment phrasings normalize to the same key
+    assert clusters["share"].sum() == 1.0
+    assert cluster_reviews([]).empty
+
+
+def test_threshold_controls_near_duplicate_merging():
+    texts = ["결제 오류 환불 요청합니다", "결제 오류 환불 요청드립니다"]
+    assert len(cluster_reviews(texts, threshold=0.5)) == 1
+    assert len(cluster_reviews(texts, threshold=0.99)) == 2
+
+
+def test_many_distinct_texts_are_clustered_from_a_bounded_sample():
+    texts = pd.Series([f"review {chr(0xAC00 + i % 11172)}{chr(0xAC00 + i // 11172 * 37)} text" for i in range(3000)])
+    clusters = cluster_reviews(texts, max_distinct=500)
+    assert clusters["count"].sum() == 500
+    assert clusters.equals(cluster_reviews(texts, max_distinct=500))  # Seeded sample
+    assert next(format_cluster_lines(clusters, total_count=3000)).startswith("(~")
+
+
+def test_format_cluster_lines_scales_sampled_counts():
+    clusters = cluster_reviews(["결제 실패"] * 3 + ["로그인 오류"])
+    assert list(format_cluster_lines(clusters)) == ["(3건, 75.0%) 결제 실패", "(1건, 25.0%) 로그인 오류"]
+    assert list(format_cluster_lines(clusters, total_count=4)) == ["(3건, 75.0%) 결제 실패", "(1건, 25.0%) 로그인 오류"]
+    assert list(format_cluster_lines(clusters, total_count=400)) == ["(~300건, 75.0%) 결제 실패", "(~100건, 25.0%) 로그인 오류"]
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from utils.review_store import iter_review_chunks, load_reviews
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def reviews():
+    return pd.DataFrame({
+        "review_id": [1, 2, 3, 4],
+        "date": ["2025-12-01", "2025-12-02", "2025-12-02", "2025-12-05"],
+        "review_text": ["a", "b", "c", "d"],
+        "star_rating": [1, 2, 3, 4],
+    })
+
+
+@pytest.fixture(params=["csv", "parquet", "partitioned"])
+def store(request, tmp_path, reviews):
+    if request.param == "csv":
+        path = tmp_path / "reviews.csv"
+        reviews.to_csv(path, index=False)
+    elif request.param == "parquet":
+        path = tmp_path / "reviews.parquet"
+        reviews.to_parquet(path, index=False)
+    else:
+        path = tmp_path / "reviews_parquet"
+        reviews.to_parquet(path, partition_cols=["date"], index=False)
+    return str(path)
+
+
+def test_date_window_and_columns(store):
+    df = load_reviews(store, columns=["review_id", "review_text"], start_date="2025-12-02", end_date="2025-12-04")
+    assert sorted(df["review_id"].tolist()) == [2, 3]
+    assert list(df.columns) == ["review_id", "review_text"]
+
+
+def test_chunks_cover_the_same_rows(store):
+    chunks = list(iter_review_chunks(store, 2, columns=["review_id", "date"], start_date="2025-12-02"))
+    assert all(len(chunk) <= 2 for chunk in chunks)
+    assert sorted(pd.concat(chunks)["review_id"].tolist()) == [2, 3, 4]
+    assert pd.concat(chunks)["date"].astype(str).min() == "2025-12-02"
@@ -0,0 +1,101 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from utils.rollups import DailyRollupStore, format_trend_line, format_trend_table
+
+CONFIG = {"teams": {"billing_team": {"keywords": ["결제"]}, "system_team": {"keywords": ["로그인"]}}}
+START = datetime.date(2025, 1, 1)
+
+
+def reviews(daily_counts, team_text="결제 오류", rating=2, start=START):
+    """One row per review, `daily_counts[i]` reviews on day i."""
+    rows = []
+    for offset, n in enumerate(daily_counts):
+        day = (start + datetime.timedelta(days=offset)).isoformat()
+        rows += [{"date": day, "review_text": team_text, "star_rating": rating}] * int(n)
+    return pd.DataFrame(rows, columns=["date", "review_text", "star_rating"])
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Rollups and the sentiment cache are written relative to the working directory
+    return tmp_path
+
+
+def test_week_and_month_deltas():
+    # 60 days: 2 reviews a day, then 4 a day over the last 7 days
+    store = DailyRollupStore("reviews.csv", CONFIG)
+    store.update([reviews([2] * 53 + [4] * 7)])
+    trend = store.trend("billing_team")
+
+    assert trend["as_of"] == "2025-03-01"
+    assert (trend["wow"]["count"], trend["wow"]["previous"]) == (28, 14)
+    assert trend["wow"]["change_pct"] == pytest.approx(100.0)
+    assert (trend["mom"]["count"], trend["mom"]["previous"]) == (23 * 2 + 28, 60)
+    assert trend["wow"]["mean_rating"] == pytest.approx(2.0)
+    assert trend["spikes"] == []
+    assert store.trend("system_team")["wow"]["count"] == 0
+
+
+def test_spike_detection_uses_the_recent_window():
+    counts = [3, 4] * 20 + [30]
+    store = DailyRollupStore("reviews.csv", CONFIG)
+    store.update([reviews(counts)])
+    spikes = store.trend("billing_team")["spikes"]
+    assert [s["date"] for s in spikes] == ["2025-02-10"]
+    assert spikes[0]["count"] == 30 and spikes[0]["z"] > 3
+
+    # Outside the lookback window the same day is no longer reported
+    assert store.trend("billing_team", as_of="2025-02-20")["spikes"] == []
+    # Below min_spike_count nothing counts as a spike
+    assert store.trend("billing_team", min_spike_count=31)["spikes"] == []
+
+
+def test_incremental_updates_match_a_rebuild(workdir):
+    full = pd.concat([reviews([2, 3, 1, 4] * 10), reviews([1] * 40, team_text="로그인 실패", rating=1)])
+    full = full.sort_values("date", kind="stable").reset_index(drop=True)
+    path = str(workdir / "reviews.csv")
+
+    # History up to a day that is still being filled, then the complete file
+    cut = full[full["date"] <= "2025-01-20"]
+    pd.concat([cut[cut["date"] < "2025-01-20"], cut[cut["date"] == "2025-01-20"].head(1)]).to_csv(path, index=False)
+    DailyRollupStore(path, CONFIG).refresh(chunksize=7)
+    full.to_csv(path, index=False)
+    incremental = DailyRollupStore(path, CONFIG)
+    incremental.refresh(chunksize=7)
+
+    rebuilt = DailyRollupStore(path, CONFIG, root="rebuilt", rebuild=True)
+    rebuilt.refresh()
+    assert incremental.watermark == rebuilt.watermark == "2025-02-09"
+    assert incremental.teams == rebuilt.teams
+    assert incremental.trend("billing_team") == rebuilt.trend("billing_team")
+
+
+def test_store_is_rebuilt_when_keywords_change(workdir):
+    path = str(workdir / "reviews.csv")
+    reviews([1] * 5).to_csv(path, index=False)
+    DailyRollupStore(path, CONFIG).refresh()
+    assert DailyRollupStore(path, CONFIG).watermark == "2025-01-05"
+    changed = {"teams": {"billing_team": {"keywords": ["결제", "환불"]}}}
+    assert DailyRollupStore(path, changed).watermark is None
+
+
+def test_missing_date_column_is_an_error():
+    store = DailyRollupStore("reviews.csv", CONFIG)
+    with pytest.raises(ValueError, match="no date column"):
+        store.update([pd.DataFrame({"review_text": ["결제"], "star_rating": [1]})])
+
+
+def test_trend_formatting():
+    store = DailyRollupStore("reviews.csv", CONFIG)
+    store.update([reviews([3, 4] * 20 + [30])])
+    trends = {team: store.trend(team) for team in ("billing_team", "system_team")}
+    line = format_trend_line(trends["billing_team"])
+    assert line.startswith("Trend (as of 2025-02-10): 최근 7일(WoW) ")
+    assert "급증일 2025-02-10 30건" in line
+    table = format_trend_table(trends).splitlines()
+    assert table[0] == "# 📈 Trend (as of 2025-02-10)"
+    assert table[-1].startswith("| system_team | 0건(new) |")
+    assert all(row.count("|") == 7 for row in table[1:])
@@ -0,0 +1,34 @@
+import threading
+
+import numpy as np
+import pytest
+
+from sentiment_engine import SentimentCache, SentimentScorer
+
+pytest.importorskip("pyarrow")
+
+
+def test_scores_round_trip_and_skip_cached(tmp_path):
+    scorer = SentimentScorer(cache=SentimentCache(str(tmp_path), version="v1"))
+    first = scorer.score(["최고 만족", "결제 오류", "결제 오류"])
+    assert first[0] > 0 > first[1] and first[1] == first[2]
+    scorer.cache.save()
+
+    again = SentimentScorer(cache=SentimentCache(str(tmp_path), version="v1"))
+    np.testing.assert_array_equal(again.score(["결제 오류", "최고 만족"]), first[[1, 0]])
+    assert again.cached == 2 and again.scored == 0
+
+
+def test_concurrent_saves_leave_a_readable_file(tmp_path):
+    caches = [SentimentCache(str(tmp_path), version="v1") for _ in range(8)]
+    for i, cache in enumerate(caches):
+        cache.add(np.arange(i * 1000, (i + 1) * 1000, dtype=np.uint64), np.full(1000, i, dtype=np.float32))
+    threads = [threading.Thread(target=cache.save) for cache in caches]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not list(tmp_path.glob("*.tmp"))
+    reloaded = SentimentCache(str(tmp_path), version="v1")
+    assert len(reloaded) == 1000  # Last writer wins; the file is one writer's complete snapshot
@@ -0,0 +1,29 @@
+import re
+
+import numpy as np
+
+from sentiment_engine import LEXICON, LEXICON_SCALE, LexiconScorer, lexicon_version
+
+
+def test_lag_terms_do_not_match_inside_other_words():
+    scores = LexiconScorer().score(["렉서스 차량 정보", "플렉스 했어요", "셀렉트 박스", "게임 렉 걸려요", "렉이 심해요"])
+    assert scores[:3].tolist() == [0.0, 0.0, 0.0]
+    assert scores[3] == scores[4] == np.float32(np.tanh(-1.0 / LEXICON_SCALE))
+
+
+def test_no_single_syllable_terms():
+    # Single Hangul syllables match inside unrelated words; jamo such as "ㅠ" are intended substrings
+    assert not [t for terms in LEXICON.values() for t in terms if re.fullmatch(r"[가-힣]", t)]
+
+
+def test_scores_weights_and_negation():
+    scores = LexiconScorer().score(["정말 좋아요", "안 좋아요", "결제 오류 환불 요청", "", None])
+    assert scores[0] > 0 > scores[1]
+    assert scores[1] == np.float32(np.tanh((1.0 - 2.0) / LEXICON_SCALE))  # "안 좋" outweighs the "좋아요" inside it
+    assert scores[2] == np.float32(np.tanh(-2.0 / LEXICON_SCALE))
+    assert scores[3:].tolist() == [0.0, 0.0]
+
+
+def test_lexicon_version_tracks_the_terms():
+    assert lexicon_version() == lexicon_version(dict(LEXICON))
+    assert lexicon_version() != lexicon_version({**LEXICON, -1.0: LEXICON[-1.0] + ["렉"]})
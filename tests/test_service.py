@@ -0,0 +1,95 @@
+import json
+import os
+import shutil
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from service import JobQueue, WarmState, make_handler
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    shutil.copytree(os.path.join(ROOT, "config"), tmp_path / "config")
+    shutil.copytree(os.path.join(ROOT, "data", "docs"), tmp_path / "data" / "docs")
+    (tmp_path / "data" / "raw").mkdir()
+    shutil.copy(os.path.join(ROOT, "data", "raw", "mock_reviews.csv"), tmp_path / "data" / "raw")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def server(workdir):
+    jobs = JobQueue(WarmState(use_mock=True), workers=1)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(jobs))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def request(url, payload=None):
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data, method="POST" if data else "GET")) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_validate_normalizes_project_and_keeps_known_fields(workdir):
+    job = JobQueue.validate({"project": "weekly report/..", "workers": 2, "incremental": True,
+                             "start_date": "2025-01-01", "end_date": "2025-01-31", "batch_small": 0})
+    assert job == {"project": "weeklyreport", "data": "data/raw/mock_reviews.csv", "workers": 2,
+                   "incremental": True, "start_date": "2025-01-01", "end_date": "2025-01-31", "batch_small": 0}
+
+
+@pytest.mark.parametrize("params, message", [
+    ({"workers": "x"}, "workers must be an integer"),
+    ({"chunksize": "abc"}, "chunksize must be an integer"),
+    ({"chunksize": 2.5}, "chunksize must be an integer"),
+    ({"workers": True}, "workers must be an integer"),
+    ({"workers": 0}, "workers must be >= 1"),
+    ({"rag_top_k": -1}, "rag_top_k must be >= 0"),
+    ({"incremental": "yes"}, "incremental must be true or false"),
+    ({"notify": 1}, "notify must be true or false"),
+    ({"start_date": "01/02/2025"}, "start_date must be a YYYY-MM-DD date"),
+    ({"end_date": 20250101}, "end_date must be a YYYY-MM-DD date"),
+    ({"start_date": "2025-02-01", "end_date": "2025-01-01"}, "is after end_date"),
+    ({"project": ["a"]}, "project must be a string"),
+    ({"data": "missing.csv"}, "Review data not found"),
+    ({"wokers": 2}, "Unknown job fields: wokers"),
+])
+def test_validate_rejects_bad_values(workdir, params, message):
+    with pytest.raises(ValueError, match=message):
+        JobQueue.validate(params)
+
+
+def test_bad_job_returns_400(server):
+    status, body = request(f"{server}/jobs", {"workers": "x"})
+    assert status == 400
+    assert "workers must be an integer" in body["error"]
+    assert request(f"{server}/jobs", {"chunksize": "abc"})[0] == 400
+    assert request(f"{server}/jobs")[1] == {"jobs": []}
+
+
+def test_job_runs_in_mock_mode(server, workdir):
+    status, body = request(f"{server}/jobs", {"project": "svc", "workers": 2})
+    assert status == 202
+    deadline = time.time() + 60
+    while True:
+        job = request(f"{server}/jobs/{body['job_id']}")[1]
+        if job["status"] in ("done", "failed") or time.time() > deadline:
+            break
+        time.sleep(0.1)
+    assert job["status"] == "done", job.get("error")
+    assert job["failed_categories"] == 0
+    assert os.path.exists(workdir / job["report_path"])
+    assert request(f"{server}/jobs/unknown")[0] == 404
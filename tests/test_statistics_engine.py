@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats as scipy_stats
+
+from statistics_engine import (
+    RunningPearson, _bootstrap_ci, calculate_correlations, format_statistics_table, group_statistics,
+)
+
+
+@pytest.fixture
+def reviews():
+    rng = np.random.default_rng(0)
+    n = 600
+    rating = rng.integers(1, 6, n).astype(float)
+    df = pd.DataFrame({"star_rating": rating, "sentiment_score": rating / 5 + rng.normal(0, 0.3, n)})
+    membership = pd.DataFrame({
+        "billing_team": rng.random(n) < 0.4,
+        "system_team": rng.random(n) < 0.3,
+    })
+    return df, membership
+
+
+def test_group_statistics_match_scipy(reviews):
+    df, membership = reviews
+    result = group_statistics(df, membership, n_boot=0).set_index("team")
+    groups = {"ALL": np.ones(len(df), dtype=bool), **{t: membership[t].to_numpy() for t in membership}}
+    for team, mask in groups.items():
+        x, y = df["sentiment_score"][mask], df["star_rating"][mask]
+        pearson, spearman = scipy_stats.pearsonr(x, y), scipy_stats.spearmanr(x, y)
+        row = result.loc[team]
+        assert row["n"] == mask.sum()
+        assert row["pearson_r"] == pytest.approx(pearson[0])
+        assert row["pearson_p"] == pytest.approx(pearson[1], rel=1e-6, abs=1e-12)
+        assert row["spearman_r"] == pytest.approx(spearman[0])
+        assert row["spearman_p"] == pytest.approx(spearman[1], rel=1e-6, abs=1e-12)
+        assert row["mean_rating"] == pytest.approx(y.mean())
+    assert np.isnan(result.loc["ALL", "predictive_impact"])
+
+
+def test_running_pearson_chunks_equal_a_single_pass(reviews):
+    df, _ = reviews
+    x, y = df["star_rating"].to_numpy(), df["sentiment_score"].to_numpy()
+    chunked = RunningPearson()
+    for start in range(0, len(x), 77):
+        chunked.update(x[start:start + 77], y[start:start + 77])
+    chunked.update([], [])
+    single = RunningPearson()
+    single.update(x, y)
+    assert chunked.n == len(x)
+    assert chunked.r == pytest.approx(single.r, abs=1e-12)
+    assert chunked.r == pytest.approx(np.corrcoef(x, y)[0, 1], abs=1e-12)
+
+
+def test_chunked_correlation_matches_full_load(tmp_path, reviews):
+    df, _ = reviews
+    path = tmp_path / "reviews.csv"
+    df.to_csv(path, index=False)
+    full = calculate_correlations(str(path))
+    assert calculate_correlations(str(path), chunksize=50) == pytest.approx(full, abs=1e-12)
+
+
+def test_bootstrap_ci_contains_estimate_and_is_seeded(reviews):
+    df, membership = reviews
+    first = group_statistics(df, membership, n_boot=300, seed=7)
+    again = group_statistics(df, membership, n_boot=300, seed=7)
+    pd.testing.assert_frame_equal(first, again)
+    assert (first["ci_low"] <= first["pearson_r"]).all() and (first["pearson_r"] <= first["ci_high"]).all()
+    assert not first.equals(group_statistics(df, membership, n_boot=300, seed=8))
+
+
+def test_bootstrap_subsamples_large_groups_to_the_cap():
+    rng = np.random.default_rng(1)
+    codes = np.repeat([0, 1], [1000, 40])
+    x = rng.normal(size=len(codes))
+    y = x + rng.normal(size=len(codes))
+    _, low, high, sub_n = _bootstrap_ci(codes, x, y, 2, 200, 0.95, rng, max_rows=100, min_rows=100)
+    assert sub_n.tolist() == [100, 40]
+    assert (low < high).all()
+
+
+def test_constant_and_tiny_groups_give_nan():
+    df = pd.DataFrame({"star_rating": [5.0, 5.0, 5.0, 1.0, 2.0, 4.0], "sentiment_score": [0.1, 0.5, 0.9, 0.2, 0.3, 0.8]})
+    membership = pd.DataFrame({
+        "constant": [True, True, True, False, False, False],
+        "single": [False, False, False, True, False, False],
+    })
+    result = group_statistics(df, membership, n_boot=50).set_index("team")
+    for team in ("constant", "single"):
+        assert np.isnan(result.loc[team, ["pearson_r", "pearson_p", "spearman_r", "ci_low", "ci_high"]].astype(float)).all()
+    assert "nan" in format_statistics_table(result.reset_index())
+
+    constant = RunningPearson()
+    constant.update([3, 3, 3], [0.1, 0.2, 0.3])
+    assert np.isnan(constant.r)
+    assert np.isnan(RunningPearson().r)
+
+
+def test_constant_file_correlation_is_nan(tmp_path):
+    path = tmp_path / "constant.csv"
+    pd.DataFrame({"star_rating": [3] * 10, "sentiment_score": np.linspace(0, 1, 10)}).to_csv(path, index=False)
+    assert np.isnan(calculate_correlations(str(path)))
+    assert np.isnan(calculate_correlations(str(path), chunksize=3))
@@ -0,0 +1,57 @@
+import random
+
+import pandas as pd
+import pytest
+
+import utils.team_matcher as team_matcher
+from utils.team_matcher import TeamMatcher
+
+
+def brute_force(texts, teams):
+    """The original per-team routing loop."""
+    return pd.DataFrame({
+        team: [any(k in str(x) for k in info['keywords']) for x in texts] for team, info in teams.items()
+    })
+
+
+@pytest.fixture(params=["string[pyarrow]", None], ids=["arrow", "python-re"])
+def text_dtype(request, monkeypatch):
+    if request.param:
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(team_matcher, "_TEXT_DTYPE", request.param)
+
+
+def test_overlapping_and_nested_keywords(text_dtype):
+    teams = {
+        "a": {"keywords": ["ab"]},
+        "b": {"keywords": ["bc"]},      # Starts inside an "ab" match
+        "c": {"keywords": ["로그"]},     # Prefix of another team's keyword
+        "d": {"keywords": ["로그인"]},
+        "e": {"keywords": ["a.c"]},     # Regex metacharacters are literal
+    }
+    texts = pd.Series(["abc", "로그인 실패", "a.c", "abx", "axc", None, 3])
+    got = TeamMatcher(teams).match(texts)
+    assert got.to_numpy().tolist() == brute_force(texts, teams).to_numpy().tolist()
+
+
+def test_empty_keyword_matches_every_row(text_dtype):
+    teams = {"all": {"keywords": [""]}, "pay": {"keywords": ["페이"]}}
+    texts = pd.Series(["페이 오류", "배송", None])
+    got = TeamMatcher(teams).match(texts)
+    assert got["all"].tolist() == [True, True, True]
+    assert got["pay"].tolist() == [True, False, False]
+
+
+def test_matches_brute_force_on_random_configs(text_dtype):
+    rng = random.Random(7)
+    alphabet = "abc.*"
+    for _ in range(100):
+        teams = {
+            f"t{i}": {"keywords": ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 3)))
+                                   for _ in range(rng.randint(1, 3))]}
+            for i in range(rng.randint(1, 4))
+        }
+        texts = pd.Series(["".join(rng.choice(alphabet + "xy") for _ in range(rng.randint(0, 12)))
+                           for _ in range(40)])
+        got = TeamMatcher(teams).match(texts)
+        assert got.to_numpy().tolist() == brute_force(texts, teams).to_numpy().tolist(), teams
@@ -0,0 +1,66 @@
+import sys
+
+import pytest
+
+from utils.token_budget import DEFAULT_PRICING, MODEL_PRICING_PER_1M, TokenCounter, estimate_cost, fit_reviews
+
+
+def words(text):
+    return len(text.split())
+
+
+def test_fit_reviews_stops_at_the_budget():
+    counter = TokenCounter(count_fn=words)
+    texts = ["결제 오류 발생"] * 10  # 3 tokens + 1 separator each
+    selected, used = fit_reviews(texts, counter, budget=14, batch_size=3)
+    assert (selected, used) == (texts[:3], 12)
+    assert fit_reviews(texts, counter, budget=1000) == (texts, 40)
+    assert fit_reviews([], counter, budget=10) == ([], 0)
+
+
+def test_fit_reviews_consumes_lazily():
+    counter = TokenCounter(count_fn=words)
+    consumed = []
+
+    def reviews():
+        for i in range(1000):
+            consumed.append(i)
+            yield f"review {i}"
+
+    selected, _ = fit_reviews(reviews(), counter, budget=9, batch_size=4)
+    assert len(selected) == 3
+    assert len(consumed) == 4
+
+
+def test_a_single_long_review_is_truncated():
+    counter = TokenCounter(count_fn=words)
+    long_review = " ".join(["환불"] * 1000)
+    selected, used = fit_reviews([long_review, "짧은 리뷰"], counter, budget=20, max_review_tokens=50)
+    assert len(selected) == 1  # Always keeps one review, even over the budget
+    assert selected[0].endswith("…")
+    assert counter.count(selected[0]) <= 50
+    assert used == counter.count(selected[0]) + 1
+
+
+def test_fallback_counter_without_tiktoken(monkeypatch, capsys):
+    monkeypatch.setitem(sys.modules, "tiktoken", None)  # Makes `import tiktoken` fail
+    counter = TokenCounter()
+    assert counter.name == "approx"
+    assert "tiktoken unavailable (ModuleNotFoundError)" in capsys.readouterr().out
+
+    assert counter.count("") == 0
+    assert counter.count("abcdefgh") == 2
+    assert counter.count("결제 오류") == 4 + 1  # One per Hangul char, the space rounds up to a token
+    assert counter.count_many(["abcd", "가나"]) == [1, 2]
+
+    truncated = counter.truncate("결제" * 200, 30)
+    assert truncated.endswith("…") and counter.count(truncated[:-1]) <= 30
+    assert counter.truncate("short", 30) == "short"
+
+
+def test_estimate_cost_known_and_unknown_models():
+    price_in, price_out = MODEL_PRICING_PER_1M["gemini-1.5-pro"]
+    assert estimate_cost("gemini-1.5-pro", 1_000_000, 1_000_000) == pytest.approx(price_in + price_out)
+    assert estimate_cost("gemini-1.5-flash", 2000, 500) == pytest.approx((2000 * 0.075 + 500 * 0.30) / 1e6)
+    assert estimate_cost("unknown-model", 1_000_000, 0) == pytest.approx(DEFAULT_PRICING[0])
+    assert estimate_cost("unknown-model", 0, 0) == 0
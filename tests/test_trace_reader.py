@@ -0,0 +1,61 @@
+import gzip
+import json
+
+import pytest
+
+from utils.trace_reader import export_legacy_view, find_record, read_trace
+from utils.trace_writer import TraceWriter
+
+RECORDS = [
+    {"ts": "2025-01-02T03:04:05.100000", "category": "billing_team", "input": "결제 실패", "prompt": "P1", "response": "R1"},
+    {"ts": "2025-01-02T03:04:05.900000", "category": "billing_team", "input": "환불 지연", "prompt": "P2", "response": "R2"},
+    {"ts": "2025-01-02T03:04:06.000000", "category": "system_team", "input": "로그인 오류", "prompt": "P3", "response": "R3"},
+]
+
+
+@pytest.fixture(params=[False, True], ids=["plain", "gzip"])
+def trace(request, tmp_path):
+    writer = TraceWriter(str(tmp_path), run_id="run1", compress=request.param, batch_size=2)
+    ids = [writer.write(record) for record in RECORDS]
+    writer.close()
+    return writer.path, ids
+
+
+def test_records_round_trip(trace):
+    path, ids = trace
+    assert ids == ["run1-000001", "run1-000002", "run1-000003"]
+    assert list(read_trace(path)) == [{"id": i, **r} for i, r in zip(ids, RECORDS)]
+    assert find_record(path, ids[1])["prompt"] == "P2"
+    assert find_record(path, "run1-999999") is None
+
+
+def test_compressed_file_is_gzip(tmp_path):
+    writer = TraceWriter(str(tmp_path), run_id="gz", compress=True)
+    writer.write(RECORDS[0])
+    writer.close()
+    with gzip.open(writer.path, "rt", encoding="utf-8") as f:
+        assert json.loads(f.readline())["input"] == "결제 실패"
+
+
+def test_export_legacy_view(trace, tmp_path):
+    path, ids = trace
+    out = tmp_path / "view"
+    assert export_legacy_view(path, str(out)) == 3
+    # Same second and category: the second record gets its sequence number appended
+    stems = ["20250102_030405_billing_team", "20250102_030405_billing_team_000002", "20250102_030406_system_team"]
+    assert sorted(p.name for p in out.iterdir()) == sorted(
+        name for stem in stems for name in (f"trace_{stem}.log", f"{stem}_prompt.txt", f"{stem}_raw_res.json"))
+
+    log = (out / f"trace_{stems[1]}.log").read_text(encoding="utf-8")
+    assert log.startswith("=== [Step 1: Raw Input] ===\n환불 지연\n")
+    assert f"(See {stems[1]}_prompt.txt for full content)" in log
+    assert (out / f"{stems[1]}_prompt.txt").read_text(encoding="utf-8") == "P2"
+    raw = json.loads((out / f"{stems[2]}_raw_res.json").read_text(encoding="utf-8"))
+    assert raw == {"category": "system_team", "response": "R3"}
+
+
+def test_export_filters_by_category(trace, tmp_path):
+    path, _ = trace
+    assert export_legacy_view(path, str(tmp_path / "system"), category="system_team") == 1
+    assert export_legacy_view(path, category="missing") == 0
+    assert (tmp_path / "trace_view").is_dir()  # Defaults to <logs>/trace_view
@@ -0,0 +1,69 @@
+import re
+import zlib
+
+import numpy as np
+import pytest
+
+from utils.vector_store import HashingEmbedder, chunk_document
+
+
+def reference_embed(texts, dim=1024, ngram_range=(2, 3)):
+    """The original per-feature loop the memoized embedder must reproduce exactly."""
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in re.findall(r"\w+", str(text).lower()):
+            vectors[row, zlib.crc32(word.encode("utf-8")) % dim] += 1.0
+            for n in range(ngram_range[0], ngram_range[1] + 1):
+                for i in range(len(word) - n + 1):
+                    vectors[row, zlib.crc32(word[i:i + n].encode("utf-8")) % dim] += 1.0
+    np.log1p(vectors, out=vectors)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+TEXTS = ["페이 충전 실패 ㅠㅠ 결제 결제 결제", "App crashes on LOGIN", "", "!!!", "배송 언제 오나요? 배송 조회 안됨", 42]
+
+
+def test_embeddings_match_the_reference_loop():
+    embedder = HashingEmbedder()
+    np.testing.assert_array_equal(embedder.embed(TEXTS), reference_embed(TEXTS))
+    # Second pass is served from the word memo and must not change anything
+    np.testing.assert_array_equal(embedder.embed(TEXTS), reference_embed(TEXTS))
+    assert embedder.embed([]).shape == (0, embedder.dim)
+
+
+def test_word_memo_is_bounded():
+    embedder = HashingEmbedder(dim=64)
+    embedder.max_cached_words = 3
+    texts = ["alpha beta gamma delta epsilon", "zeta eta alpha"]
+    np.testing.assert_array_equal(embedder.embed(texts), reference_embed(texts, dim=64))
+    assert len(embedder._word_cache) == 3
+
+
+def test_chunks_pack_paragraphs_up_to_max_chars():
+    text = "a" * 30 + "\n\n" + "b" * 30 + "\n\n" + "c" * 30 + "\n\n\n" + "line1\nline2"
+    assert chunk_document(text, max_chars=70) == ["a" * 30 + "\n\n" + "b" * 30, "c" * 30 + "\n\nline1\nline2"]
+    assert chunk_document("x" * 10 + "\n" + "y" * 10, max_chars=15) == ["x" * 10, "y" * 10]
+
+
+def test_index_syncs_incrementally_and_retrieves_relevant_chunks(tmp_path):
+    pytest.importorskip("chromadb")
+    from utils.vector_store import DocumentIndex
+
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "billing.txt").write_text("결제 오류와 환불 처리 기준\n\n충전 실패 시 고객센터 안내", encoding="utf-8")
+    (docs / "system.txt").write_text("앱 튕김과 로그인 실패 대응 절차", encoding="utf-8")
+    store = str(tmp_path / "store")
+
+    index = DocumentIndex(docs_dir=str(docs), store_dir=store)
+    assert index.sync() == (["billing.txt", "system.txt"], [])
+    assert index.sync() == ([], [])
+    assert index.query("로그인 실패", top_k=1)[0]["source"] == "system.txt"
+
+    (docs / "system.txt").unlink()
+    (docs / "billing.txt").write_text("결제 오류와 환불 처리 기준", encoding="utf-8")
+    reopened = DocumentIndex(docs_dir=str(docs), store_dir=store)
+    assert reopened.sync() == (["billing.txt"], ["system.txt"])
+    assert reopened.count() == 1
+    assert {hit["source"] for hit in reopened.query("로그인", top_k=4)} == {"billing.txt"}
@@ -0,0 +1,136 @@
+import datetime
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+
+def hash_text(text):
+    return hashlib.sha256(str(text).encode("utf-8")).hexdigest()
+
+
+class ReviewSetHasher:
+    """Order-sensitive SHA-256 over review ids, fed in one or more chunks.
+
+    Feeding the ids of a file chunk by chunk yields the same digest as feeding
+    them all at once, so streaming and in-memory ingestion agree.
+    """
+
+    def __init__(self):
+        self._sha = hashlib.sha256()
+
+    def update(self, ids):
+        if len(ids):
+            hashed = pd.util.hash_pandas_object(pd.Series(ids).astype(str), index=False)
+            self._sha.update(hashed.to_numpy().tobytes())
+        return self
+
+    def hexdigest(self):
+        return self._sha.hexdigest()
+
+
+def review_ids_of(reviews_df):
+    """Stable identifiers for a team's reviews (falls back to the text if there is no review_id)."""
+    if 'review_id' in reviews_df.columns:
+        return reviews_df['review_id']
+    return reviews_df['review_text']
+
+
+class IncrementalState:
+    """Per-team fingerprints and last rendered sections, persisted under results/<project>/.
+
+    The state file only holds small per-team metadata; each section's text
+    is written to its own file under results/<project>/sections/ when it is
+    recorded and read back only when it is reused.
+    """
+
+    FILENAME = "incremental_state.json"
+    SECTIONS_DIR = "sections"
+
+    def __init__(self, project_name):
+        self.path = f"results/{project_name}/{self.FILENAME}"
+        self.sections_dir = f"results/{project_name}/{self.SECTIONS_DIR}"
+        self.teams = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.teams = json.load(f).get("teams", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f">> [WARNING] Ignoring unreadable incremental state {self.path}: {e}")
+
+    @staticmethod
+    def fingerprint(review_digest, context_key):
+        """Combines the review-set digest with the model/RAG context the section depends on."""
+        return hash_text(f"{review_digest}:{context_key}")
+
+    def previous(self, team):
+        return self.teams.get(team)
+
+    def previous_count(self, team):
+        prev = self.teams.get(team)
+        return prev.get("count") if prev else None
+
+    def reusable_section(self, team, fingerprint):
+        """Returns the stored section if the team's fingerprint is unchanged, else None."""
+        prev = self.teams.get(team)
+        if not prev or prev.get("fingerprint") != fingerprint:
+            return None
+        if prev.get("section_file"):
+            try:
+                with open(os.path.join(self.sections_dir, prev["section_file"]), "r", encoding="utf-8") as f:
+                    return f.read() or None
+            except OSError:
+                return None
+        return prev.get("section") or None  # State files written before sections moved to their own files
+
+    def update(self, team, fingerprint, count, section):
+        """Records a team's fingerprint and count, writing the section text to its own file."""
+        # Named by team and fingerprint, so a file never holds text of another review set
+        section_file = f"{hash_text(f'{team}:{fingerprint}')[:24]}.md"
+        path = os.path.join(self.sections_dir, section_file)
+        try:
+            os.makedirs(self.sections_dir, exist_ok=True)
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                f.write(section)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            print(f">> [WARNING] Failed to save section of {team} for reuse: {e}")
+            return
+        self.teams[team] = {
+            "fingerprint": fingerprint,
+            "count": int(count),
+            "section_file": section_file,
+            "updated": datetime.datetime.now().isoformat(timespec="seconds"),
+        }
+
+    def retain(self, teams):
+        """Drops teams that no longer match any review."""
+        self.teams = {team: state for team, state in self.teams.items() if team in teams}
+
+    def save(self):
+        """Writes the state file, then deletes section files no team refers to any more."""
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"teams": self.teams}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f">> [WARNING] Failed to save incremental state: {e}")
+            return
+        referenced = {state.get("section_file") for state in self.teams.values()}
+        if os.path.isdir(self.sections_dir):
+            for name in os.listdir(self.sections_dir):
+                if name not in referenced:
+                    try:
+                        os.remove(os.path.join(self.sections_dir, name))
+                    except OSError:
+                        pass
+
+
+def format_count_change(count, previous):
+    """Renders the PRD's 'N건(+변동률%)' delta, e.g. '19건(+5.6%)'."""
+    if not previous:
+        return f"{count}건(new)"
+    return f"{count}건({(count - previous) / previous * 100:+.1f}%)"
@@ -0,0 +1,71 @@
+import pandas as pd
+
+from utils.incremental import ReviewSetHasher, review_ids_of
+from utils.review_store import ANALYSIS_COLUMNS, iter_review_chunks
+from utils.team_matcher import TeamMatcher
+
+
+class TeamBucket:
+    """Bounded per-team accumulator: exact counts and aggregates, plus the first N rows as samples."""
+
+    def __init__(self, max_samples=200):
+        self.max_samples = max_samples
+        self.count = 0
+        self.rating_sum = 0.0
+        self.rated_count = 0
+        self.negative_count = 0  # 1-2 star reviews
+        self.hasher = ReviewSetHasher()
+        self._samples = []
+        self._sample_rows = 0
+
+    def add(self, rows):
+        self.count += len(rows)
+        self.hasher.update(review_ids_of(rows))
+        if 'star_rating' in rows.columns:
+            ratings = pd.to_numeric(rows['star_rating'], errors='coerce')
+            self.rating_sum += float(ratings.sum())
+            self.rated_count += int(ratings.notna().sum())
+            self.negative_count += int((ratings <= 2).sum())
+        if self._sample_rows < self.max_samples:
+            keep = rows.head(self.max_samples - self._sample_rows)
+            self._samples.append(keep.copy())
+            self._sample_rows += len(keep)
+
+    @property
+    def avg_rating(self):
+        return self.rating_sum / self.rated_count if self.rated_count else None
+
+    @property
+    def negative_share(self):
+        return self.negative_count / self.rated_count if self.rated_count else None
+
+    def rating_stats(self):
+        """Exact rating aggregates over every added row, as used by the alert rules."""
+        return {"mean_rating": self.avg_rating, "negative_share": self.negative_share}
+
+    def sample_frame(self):
+        if not self._samples:
+            return pd.DataFrame(columns=['review_text'])
+        return pd.concat(self._samples, ignore_index=True)
+
+
+def stream_team_buckets(data_path, config, chunksize=100000, max_samples=200,
+                        columns=ANALYSIS_COLUMNS, start_date=None, end_date=None):
+    """Reads a review CSV/Parquet store chunk by chunk and routes each chunk into team buckets.
+
+    Peak memory is bounded by one chunk plus `max_samples` rows per team,
+    regardless of the file size. Returns ({team: TeamBucket}, total_rows).
+    """
+    matcher = TeamMatcher.from_config(config)
+    buckets = {team: TeamBucket(max_samples) for team in matcher.team_keywords}
+    total_rows = 0
+
+    chunks = iter_review_chunks(data_path, chunksize, columns=columns, start_date=start_date, end_date=end_date)
+    for chunk in chunks:
+        total_rows += len(chunk)
+        membership = matcher.match(chunk['review_text'])
+        for team in membership.columns:
+            mask = membership[team].to_numpy()
+            if mask.any():
+                buckets[team].add(chunk[mask])
+    return buckets, total_rows
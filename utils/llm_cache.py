@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class LLMResponseCache:
+    """Content-addressed on-disk cache for LLM responses.
+
+    Entries are keyed by a hash of (model, prompt, temperature) and stored as
+    one JSON file each under `cache_dir/<key[:2]>/<key>.json`. Entries older
+    than `max_age_days` are dropped, and the oldest entries are evicted once
+    the cache grows past `max_size_mb`.
+    """
+
+    def __init__(self, cache_dir="data/cache/llm", max_age_days=30, max_size_mb=200):
+        self.cache_dir = cache_dir
+        self.max_age = max_age_days * 86400 if max_age_days else None
+        self.max_bytes = int(max_size_mb * 1024 * 1024) if max_size_mb else None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._total_bytes = self.evict()
+
+    @staticmethod
+    def make_key(model, prompt, temperature):
+        payload = json.dumps([model, float(temperature), prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _is_expired(self, mtime, now=None):
+        return self.max_age is not None and (now or time.time()) - mtime > self.max_age
+
+    def get(self, key):
+        """Returns the cached response text, or None on a miss."""
+        path = self._path(key)
+        try:
+            if self._is_expired(os.path.getmtime(path)):
+                os.remove(path)
+                raise FileNotFoundError(path)
+            with open(path, "r", encoding="utf-8") as f:
+                response = json.load(f)["response"]
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return response
+
+    def put(self, key, response, **metadata):
+        """Stores a response atomically and evicts old entries if over the size limit."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"response": response, "created": time.time(), **metadata}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f">> [WARNING] Failed to write LLM cache entry: {e}")
+            return
+
+        with self._lock:
+            self._total_bytes += os.path.getsize(path)
+            over_limit = self.max_bytes is not None and self._total_bytes > self.max_bytes
+        if over_limit:
+            with self._lock:
+                self._total_bytes = self.evict()
+
+    def discard(self, key):
+        """Removes a single entry (e.g. a response that turned out to be unusable)."""
+        self._remove(self._path(key))
+
+    def evict(self):
+        """Drops expired entries, then the oldest ones until under max_size_mb. Returns bytes kept."""
+        entries = []
+        now = time.time()
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if name.endswith(".tmp"):
+                    # Leftovers from interrupted writes; leave in-flight ones alone
+                    if now - stat.st_mtime > 3600:
+                        self._remove(path)
+                elif self._is_expired(stat.st_mtime, now):
+                    self._remove(path)
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        if self.max_bytes is not None and total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+        return total
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def summary(self):
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        return f"{self.hits} hits / {self.misses} misses ({rate:.0f}% hit rate)"
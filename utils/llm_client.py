@@ -0,0 +1,190 @@
+import random
+import re
+import threading
+import time
+
+# SDK exception classes (matched by name, so no SDK import is needed) for rate limits and server-side failures
+_RETRYABLE_TYPES = {
+    "ResourceExhausted", "TooManyRequests", "InternalServerError", "ServiceUnavailable", "DeadlineExceeded",
+    "GatewayTimeout", "BadGateway", "ServerError", "RateLimitError", "APITimeoutError", "APIConnectionError",
+}
+_RETRY_HINT = re.compile(r"(?:retry in|retry_delay\s*\{\s*seconds:)\s*([0-9.]+)", re.IGNORECASE)
+
+
+class LLMTimeoutError(TimeoutError):
+    pass
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `rate_per_minute`."""
+
+    def __init__(self, rate_per_minute, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity or rate_per_minute)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount=1):
+        """Takes `amount` tokens, sleeping until they are available. Returns seconds waited."""
+        amount = min(float(amount), self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                wait = (amount - self.tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+
+def status_code(error):
+    """HTTP status carried by an SDK error (status_code, code or response.status_code), else None."""
+    for value in (getattr(error, "status_code", None), getattr(error, "code", None),
+                  getattr(getattr(error, "response", None), "status_code", None)):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return int(value)
+    return None
+
+
+def is_retryable(error):
+    """429 / 5xx / timeout / connection errors are worth retrying; auth and bad-request errors are not.
+
+    Classified by status code or exception type, following the cause chain of
+    wrapped errors. The message text is never inspected, so a 400 whose text
+    happens to contain "500" or "internal" is not retried.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, (TimeoutError, ConnectionError)):
+            return True
+        code = status_code(error)
+        if code is not None:
+            return code == 429 or 500 <= code < 600
+        if any(cls.__name__ in _RETRYABLE_TYPES for cls in type(error).__mro__):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def retry_hint(error):
+    """Server-suggested delay in seconds, if the error message carries one."""
+    match = _RETRY_HINT.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+class RateLimitedLLM:
+    """Client layer around a LangChain runnable: throttling, retries with jittered backoff, timeouts.
+
+    `runnable.invoke(prompt_text)` must return the response text. Requests are
+    throttled by a requests-per-minute bucket and, if `tpm` is set, a
+    tokens-per-minute bucket charged with the prompt's estimated tokens.
+    Retryable failures back off exponentially (equal jitter) up to
+    `max_retries` times, honouring server retry hints.
+
+    With a timeout, each call runs on a daemon thread holding one of
+    `max_concurrency` slots. A timed-out call keeps its slot until the SDK
+    returns, so hung calls cannot pile up threads, and they never block
+    interpreter exit.
+    """
+
+    def __init__(self, runnable, rpm=None, tpm=None, max_retries=4, base_delay=1.0, max_delay=60.0,
+                 timeout=120.0, count_tokens=None, sleep=time.sleep, seed=None, max_concurrency=16):
+        self.runnable = runnable
+        self.request_bucket = TokenBucket(rpm, sleep=sleep) if rpm else None
+        self.token_bucket = TokenBucket(tpm, sleep=sleep) if tpm else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.count_tokens = count_tokens or (lambda text: len(text) // 4)
+        self._sleep = sleep
+        self._rng = random.Random(seed)
+        self.max_concurrency = max_concurrency
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "retries": 0, "timeouts": 0, "errors": 0, "throttle_wait_s": 0.0}
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.counters[key] += amount
+
+    def _backoff(self, attempt, error):
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = delay / 2 + self._rng.uniform(0, delay / 2)
+        hint = retry_hint(error)
+        return min(self.max_delay, max(delay, hint)) if hint else delay
+
+    def _call(self, prompt_text):
+        if not self.timeout:
+            return self.runnable.invoke(prompt_text)
+        if not self._slots.acquire(timeout=self.timeout):
+            raise LLMTimeoutError(f"No free LLM call slot within {self.timeout}s "
+                                  f"({self.max_concurrency} calls still running)")
+        outcome = {}
+        done = threading.Event()
+
+        def run():
+            try:
+                outcome["result"] = self.runnable.invoke(prompt_text)
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                self._slots.release()
+                done.set()
+
+        threading.Thread(target=run, name="llm-call", daemon=True).start()
+        if not done.wait(self.timeout):
+            raise LLMTimeoutError(f"LLM call timed out after {self.timeout}s")
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+
+    def invoke(self, prompt_text):
+        """Returns (response_text, call_info) with this call's attempts, retries and throttle wait.
+
+        Once retries are exhausted the last error is raised with the same
+        call_info attached as `error.call_info`.
+        """
+        info = {"attempts": 0, "retries": 0, "throttle_wait_s": 0.0}
+        estimated_tokens = self.count_tokens(prompt_text)
+        attempt = 0
+        while True:
+            waited = 0.0
+            if self.request_bucket:
+                waited += self.request_bucket.acquire(1)
+            if self.token_bucket:
+                waited += self.token_bucket.acquire(estimated_tokens)
+            info["throttle_wait_s"] += waited
+            self._count("throttle_wait_s", waited)
+            self._count("requests")
+            info["attempts"] += 1
+
+            try:
+                return self._call(prompt_text), info
+            except Exception as e:
+                if isinstance(e, TimeoutError):
+                    self._count("timeouts")
+                if attempt >= self.max_retries or not is_retryable(e):
+                    self._count("errors")
+                    e.call_info = info
+                    raise
+                delay = self._backoff(attempt, e)
+                print(f">> [WARNING] LLM call failed ({type(e).__name__}: {str(e)[:80]}). "
+                      f"Retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                self._count("retries")
+                info["retries"] += 1
+                self._sleep(delay)
+                attempt += 1
+
+    def summary(self):
+        c = self.counters
+        return (f"{c['requests']} requests, {c['retries']} retries, {c['timeouts']} timeouts, "
+                f"{c['errors']} failed, throttled {c['throttle_wait_s']:.1f}s")
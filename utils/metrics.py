@@ -0,0 +1,123 @@
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+_INVALID_NAME = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for v in labels.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
+
+class Metrics:
+    """Thread-safe run instrumentation: timed spans, counters and per-category values.
+
+    Spans aggregate count / total / max seconds per (name, labels). Exports
+    are a JSON document and a Prometheus text-format snapshot.
+    """
+
+    def __init__(self, prefix="voc"):
+        self.prefix = prefix
+        self.started = time.time()
+        self.timers = {}  # (name, labels) -> {"count", "total_s", "max_s"}
+        self.counters = {}  # (name, labels) -> value
+        self.categories = {}  # category -> {metric: value}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    @contextmanager
+    def span(self, name, **labels):
+        """Times the enclosed block under `name` (e.g. `with metrics.span("csv_read"):`)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def observe(self, name, seconds, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            timer = self.timers.setdefault(key, {"count": 0, "total_s": 0.0, "max_s": 0.0})
+            timer["count"] += 1
+            timer["total_s"] += seconds
+            timer["max_s"] = max(timer["max_s"], seconds)
+
+    def inc(self, name, amount=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def record_category(self, category, **values):
+        """Sets per-category values (latency, prompt/response sizes, retries, ...)."""
+        with self._lock:
+            self.categories.setdefault(category, {}).update(values)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "started": self.started,
+                "elapsed_s": time.time() - self.started,
+                "spans": [{"name": name, "labels": dict(labels), **{k: round(v, 6) for k, v in t.items()}}
+                          for (name, labels), t in self.timers.items()],
+                "counters": [{"name": name, "labels": dict(labels), "value": value}
+                             for (name, labels), value in self.counters.items()],
+                "categories": {c: dict(v) for c, v in self.categories.items()},
+            }
+
+    def to_prometheus(self):
+        """Prometheus text exposition format (suitable for a node-exporter textfile collector)."""
+        p = self.prefix
+        data = self.to_dict()
+        lines = [f"# TYPE {p}_span_seconds summary"]
+        for span in data["spans"]:
+            labels = {"span": span["name"], **span["labels"]}
+            lines.append(f"{p}_span_seconds_sum{_label_text(labels)} {span['total_s']}")
+            lines.append(f"{p}_span_seconds_count{_label_text(labels)} {span['count']}")
+        lines.append(f"# TYPE {p}_span_seconds_max gauge")
+        for span in data["spans"]:
+            lines.append(f"{p}_span_seconds_max{_label_text({'span': span['name'], **span['labels']})} {span['max_s']}")
+
+        for name in dict.fromkeys(c["name"] for c in data["counters"]):
+            metric = f"{p}_{_INVALID_NAME.sub('_', name)}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(f"{metric}{_label_text(c['labels'])} {c['value']}" for c in data["counters"] if c["name"] == name)
+
+        fields = dict.fromkeys(k for values in data["categories"].values() for k, v in values.items()
+                               if isinstance(v, (int, float)) and not isinstance(v, bool))
+        for field in fields:
+            metric = f"{p}_category_{_INVALID_NAME.sub('_', field)}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.extend(f"{metric}{_label_text({'category': c})} {values[field]}"
+                         for c, values in data["categories"].items() if field in values)
+        lines.append(f"{p}_run_elapsed_seconds {data['elapsed_s']}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, json_path, prom_path=None):
+        """Writes the JSON metrics file and, optionally, the Prometheus snapshot (atomically)."""
+        outputs = [(json_path, json.dumps(self.to_dict(), ensure_ascii=False, indent=2))]
+        if prom_path:
+            outputs.append((prom_path, self.to_prometheus()))
+        for path, text in outputs:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+
+    def summary(self, names=None):
+        """One line with total seconds per span name, slowest first."""
+        totals = {}
+        with self._lock:
+            for (name, _), timer in self.timers.items():
+                if names is None or name in names:
+                    totals[name] = totals.get(name, 0.0) + timer["total_s"]
+        return ", ".join(f"{name} {seconds:.2f}s" for name, seconds in sorted(totals.items(), key=lambda kv: -kv[1]))
@@ -1,5 +1,329 @@
+import argparse
+import atexit
+import datetime
+import http.client
+import json
+import os
+import queue
+import random
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from utils.llm_client import TokenBucket
+
+PLACEHOLDER_URLS = {"", "PLACEHOLDER_URL"}
+DISCORD_MAX_CHARS = 2000
+_STOP = object()
+
+
+class WebhookError(Exception):
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self):
+        # Network errors (no status), rate limits and server errors are worth another attempt
+        return self.status is None or self.status == 429 or self.status >= 500
+
+
+class ConnectionPool:
+    """Keep-alive http.client connections per (scheme, host), reused across webhook posts."""
+
+    def __init__(self, timeout=10.0, max_idle=4):
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _connect(self, scheme, netloc):
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def post(self, url, payload):
+        """POSTs a JSON payload. Returns the status; raises WebhookError on non-2xx or network failure."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise WebhookError(f"Unsupported webhook URL scheme: {parts.scheme or url}", status=400)
+        key = (parts.scheme, parts.netloc)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json; charset=utf-8", "Content-Length": str(len(body))}
+
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+        try:
+            conn = conn or self._connect(*key)
+            conn.request("POST", path, body=body, headers=headers)
+            response = conn.getresponse()
+            text = response.read().decode("utf-8", errors="replace")
+        except (OSError, http.client.HTTPException) as e:
+            if conn:
+                conn.close()
+            raise WebhookError(f"{type(e).__name__}: {e}") from e
+
+        if response.will_close:
+            conn.close()
+        else:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.max_idle:
+                    idle.append(conn)
+                    conn = None
+            if conn:
+                conn.close()
+
+        if not 200 <= response.status < 300:
+            retry_after = response.getheader("Retry-After")
+            try:
+                retry_after = float(retry_after) if retry_after else None
+            except ValueError:
+                retry_after = None
+            raise WebhookError(f"HTTP {response.status}: {text[:200]}", status=response.status, retry_after=retry_after)
+        return response.status
+
+    def close(self):
+        with self._lock:
+            connections = [conn for idle in self._idle.values() for conn in idle]
+            self._idle = {}
+        for conn in connections:
+            conn.close()
+
+
+_DEFAULT_POOL = ConnectionPool()
+
+
+def is_placeholder(webhook_url):
+    return not webhook_url or str(webhook_url).strip() in PLACEHOLDER_URLS
+
+
+def webhook_payload(webhook_url, message):
+    """Discord webhooks take `content` (max 2000 chars); Slack and compatible ones take `text`."""
+    if "discord" in urlsplit(webhook_url).netloc:
+        return {"content": message[:DISCORD_MAX_CHARS]}
+    return {"text": message}
+
+
 def send_slack_notification(webhook_url, message):
-    pass
+    """Posts one message synchronously. Returns False if the URL is a placeholder or the post failed."""
+    return _send_now(webhook_url, {"text": message})
+
 
 def send_discord_notification(webhook_url, message):
-    pass
+    return _send_now(webhook_url, {"content": message[:DISCORD_MAX_CHARS]})
+
+
+def _send_now(webhook_url, payload):
+    if is_placeholder(webhook_url):
+        return False
+    try:
+        _DEFAULT_POOL.post(webhook_url, payload)
+        return True
+    except WebhookError as e:
+        print(f">> [WARNING] Notification failed: {e}")
+        return False
+
+
+def evaluate_alerts(rules, stats):
+    """Alert lines for every threshold rule in `rules` that a team's `stats` trip.
+
+    Rules (from teams.yaml): max_mean_rating, min_negative_share (share of
+    1-2 star reviews, 0-1) and min_change_pct (growth vs the previous run of
+    the project). min_reviews is a gate, not a trigger: teams with fewer
+    reviews get no alerts at all. Stats missing a value never trip a rule.
+    """
+    alerts = []
+    count = stats.get("count")
+    if rules.get("min_reviews") is not None and (count is None or count < rules["min_reviews"]):
+        return alerts
+    mean_rating = stats.get("mean_rating")
+    if rules.get("max_mean_rating") is not None and mean_rating is not None and mean_rating <= rules["max_mean_rating"]:
+        alerts.append(f"평균 평점 {mean_rating:.2f} (기준 {rules['max_mean_rating']} 이하)")
+    negative_share = stats.get("negative_share")
+    if (rules.get("min_negative_share") is not None and negative_share is not None
+            and negative_share >= rules["min_negative_share"]):
+        alerts.append(f"1~2점 리뷰 비율 {negative_share:.1%} (기준 {rules['min_negative_share']:.0%} 이상)")
+    change_pct = stats.get("change_pct")
+    if rules.get("min_change_pct") is not None and change_pct is not None and change_pct >= rules["min_change_pct"]:
+        alerts.append(f"직전 실행 대비 {change_pct:+.1f}% (기준 +{rules['min_change_pct']}% 이상)")
+    return alerts
+
+
+class NotificationDispatcher:
+    """Non-blocking webhook dispatcher: per-run coalescing, per-webhook rate limits, retries and a dead-letter file.
+
+    `add()` only records an alert. `dispatch()` coalesces everything added
+    since the last dispatch into one message per (team, webhook) and hands
+    it to that webhook's background sender thread, so callers never wait on
+    the network. Each webhook has its own queue, sender and token bucket, so
+    one rate-limited or failing webhook never delays the others. 429/5xx/
+    network failures are retried with jittered exponential backoff
+    (honouring Retry-After), and messages that still fail are appended to
+    `dead_letter_path` as JSONL.
+    """
+
+    def __init__(self, rate_per_minute=30, max_retries=3, base_delay=1.0, max_delay=30.0, timeout=10.0,
+                 dead_letter_path="data/logs/notifications_dead_letter.jsonl", sleep=time.sleep, seed=None):
+        self.rate_per_minute = rate_per_minute
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.dead_letter_path = dead_letter_path
+        self.pool = ConnectionPool(timeout=timeout)
+        self.counters = {"alerts": 0, "messages": 0, "sent": 0, "retries": 0, "failed": 0, "skipped": 0}
+        self._sleep = sleep
+        self._rng = random.Random(seed)
+        self._pending = OrderedDict()  # (team, webhook_url) -> {"alerts": [...], "details": [...]}
+        self._buckets = {}
+        self._senders = {}  # webhook_url -> (queue, sender thread)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def add(self, team, webhook_url, alert, detail=None):
+        """Records an alert for this run. Placeholder webhook URLs are skipped."""
+        with self._lock:
+            if is_placeholder(webhook_url):
+                self.counters["skipped"] += 1
+                return False
+            entry = self._pending.setdefault((team, webhook_url), {"alerts": [], "details": []})
+            entry["alerts"].append(alert)
+            if detail and detail not in entry["details"]:
+                entry["details"].append(detail)
+            self.counters["alerts"] += 1
+            return True
+
+    def dispatch(self, title=None):
+        """Queues one coalesced message per team for background delivery. Returns the number queued."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("NotificationDispatcher is closed")
+            pending, self._pending = self._pending, OrderedDict()
+            if pending and not self._senders:
+                atexit.register(self.close)
+            for _, webhook_url in pending:
+                if webhook_url not in self._senders:
+                    sender_queue = queue.Queue()
+                    thread = threading.Thread(target=self._run, args=(sender_queue,),
+                                              name=f"notifier-{len(self._senders)}", daemon=True)
+                    thread.start()
+                    self._senders[webhook_url] = (sender_queue, thread)
+            queues = {webhook_url: self._senders[webhook_url][0] for _, webhook_url in pending}
+            self.counters["messages"] += len(pending)
+        for (team, webhook_url), entry in pending.items():
+            queues[webhook_url].put((team, webhook_url, self.format_message(team, entry["alerts"], entry["details"], title)))
+        return len(pending)
+
+    @staticmethod
+    def format_message(team, alerts, details=(), title=None):
+        header = f"[VOC Alert] {team}" + (f" · {title}" if title else "")
+        lines = [header, *(f"- {alert}" for alert in alerts), *(f"> {detail}" for detail in details)]
+        return "\n".join(lines)
+
+    def _bucket(self, webhook_url):
+        with self._lock:
+            if webhook_url not in self._buckets:
+                self._buckets[webhook_url] = TokenBucket(self.rate_per_minute, sleep=self._sleep)
+            return self._buckets[webhook_url]
+
+    def _backoff(self, attempt, error):
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = delay / 2 + self._rng.uniform(0, delay / 2)
+        return min(self.max_delay, max(delay, error.retry_after)) if error.retry_after else delay
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.counters[key] += amount
+
+    def _deliver(self, team, webhook_url, message):
+        bucket = self._bucket(webhook_url) if self.rate_per_minute else None
+        attempt = 0
+        while True:
+            if bucket:
+                bucket.acquire(1)
+            try:
+                self.pool.post(webhook_url, webhook_payload(webhook_url, message))
+                self._count("sent")
+                return
+            except WebhookError as e:
+                if attempt >= self.max_retries or not e.retryable:
+                    self._count("failed")
+                    print(f">> [WARNING] Notification for {team} failed after {attempt + 1} attempts: {e}")
+                    self._dead_letter(team, webhook_url, message, e, attempt + 1)
+                    return
+                self._count("retries")
+                self._sleep(self._backoff(attempt, e))
+                attempt += 1
+
+    def _dead_letter(self, team, webhook_url, message, error, attempts):
+        if not self.dead_letter_path:
+            return
+        record = {
+            "ts": datetime.datetime.now().isoformat(timespec="seconds"),
+            "team": team,
+            "webhook_host": urlsplit(webhook_url).netloc,  # Full URLs embed secrets; keep only the host
+            "status": error.status,
+            "error": str(error),
+            "attempts": attempts,
+            "message": message,
+        }
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.dead_letter_path)), exist_ok=True)
+            with self._lock:
+                with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f">> [WARNING] Failed to write notification dead letter: {e}")
+
+    def _run(self, sender_queue):
+        while True:
+            item = sender_queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self._deliver(*item)
+            finally:
+                sender_queue.task_done()
+
+    def flush(self):
+        """Blocks until every dispatched message was sent or dead-lettered."""
+        with self._lock:
+            queues = [sender_queue for sender_queue, _ in self._senders.values()]
+        for sender_queue in queues:
+            sender_queue.join()
+
+    def close(self):
+        """Delivers what is queued, then stops the sender threads (idempotent; also runs at exit)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            senders = list(self._senders.values())
+        for sender_queue, _ in senders:
+            sender_queue.put(_STOP)
+        for _, thread in senders:
+            thread.join()
+        if senders:
+            atexit.unregister(self.close)
+        self.pool.close()
+
+    def summary(self):
+        c = self.counters
+        return (f"{c['alerts']} alerts in {c['messages']} messages: {c['sent']} sent, {c['retries']} retries, "
+                f"{c['failed']} dead-lettered, {c['skipped']} skipped (no webhook)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send a test VOC notification to a webhook")
+    parser.add_argument("url", help="Slack/Discord-compatible webhook URL (http:// works for a local stub server)")
+    parser.add_argument("--message", default="test notification", help="Alert line to send")
+    args = parser.parse_args()
+    dispatcher = NotificationDispatcher()
+    dispatcher.add("test", args.url, args.message)
+    dispatcher.dispatch()
+    dispatcher.close()
+    print(f">> [INFO] {dispatcher.summary()}")
@@ -0,0 +1,126 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from utils.team_matcher import TeamMatcher
+
+
+class ReviewQueryEngine:
+    """In-memory filter index over a review set for interactive queries.
+
+    Built once per dataset: rows are sorted by date so a date window is a
+    contiguous slice (found with searchsorted on the distinct days), team
+    membership is a precomputed row x team boolean matrix (plus each team's
+    row positions, for per-team counts of a selection), and keyword masks
+    are computed on first use and memoized. A query is then a few NumPy mask
+    operations over the date slice, independent of how many filters changed.
+    """
+
+    def __init__(self, df, config, max_cached_keywords=64):
+        df = df.reset_index(drop=True)
+        if 'date' in df.columns:
+            self.days, day_codes = np.unique(df['date'].astype(str).to_numpy(), return_inverse=True)
+            order = np.argsort(day_codes, kind="stable")
+            df = df.iloc[order].reset_index(drop=True)
+            self.day_codes = day_codes[order]
+            # Rows of day i are df[day_starts[i]:day_starts[i + 1]]
+            self.day_starts = np.searchsorted(self.day_codes, np.arange(len(self.days) + 1))
+        else:
+            self.days = np.array([], dtype=object)
+            self.day_codes = np.zeros(len(df), dtype=np.int64)
+            self.day_starts = np.array([0, len(df)])
+
+        self.df = df
+        self.texts = TeamMatcher._as_text(df['review_text'])
+        self.ratings = pd.to_numeric(df['star_rating'], errors='coerce').to_numpy(dtype=np.float64) \
+            if 'star_rating' in df.columns else np.full(len(df), np.nan)
+        membership = TeamMatcher.from_config(config).match(df['review_text'])
+        self.teams = list(membership.columns)
+        self.membership = membership.to_numpy(dtype=bool)
+        # Sorted row positions per team: selection counts gather only member rows, not the whole matrix
+        self.team_rows = [np.flatnonzero(self.membership[:, j]) for j in range(len(self.teams))]
+        self.max_cached_keywords = max_cached_keywords
+        self._keyword_masks = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.df)
+
+    def _row_range(self, start_date=None, end_date=None):
+        if not len(self.days):
+            return 0, len(self.df)
+        lo = np.searchsorted(self.days, str(start_date), side="left") if start_date else 0
+        hi = np.searchsorted(self.days, str(end_date), side="right") if end_date else len(self.days)
+        return int(self.day_starts[lo]), int(self.day_starts[max(lo, hi)])
+
+    def keyword_mask(self, keyword):
+        """Full-length substring mask for one keyword (memoized, least recently used evicted)."""
+        with self._lock:
+            if keyword in self._keyword_masks:
+                self._keyword_masks.move_to_end(keyword)
+                return self._keyword_masks[keyword]
+        mask = self.texts.str.contains(keyword, regex=False).fillna(False).to_numpy(dtype=bool)
+        with self._lock:
+            self._keyword_masks[keyword] = mask
+            while len(self._keyword_masks) > self.max_cached_keywords:
+                self._keyword_masks.popitem(last=False)
+        return mask
+
+    def select(self, teams=(), keywords=(), start_date=None, end_date=None, ratings=(), match_all_keywords=False):
+        """Row positions matching every filter. Empty filters match everything.
+
+        `teams`: rows routed to any of these teams. `keywords`: rows containing
+        any (or, with `match_all_keywords`, all) of these substrings.
+        `ratings`: allowed star ratings. Dates are inclusive ISO strings.
+        """
+        lo, hi = self._row_range(start_date, end_date)
+        mask = np.ones(hi - lo, dtype=bool)
+        if teams:
+            columns = [self.teams.index(team) for team in teams if team in self.teams]
+            mask &= self.membership[lo:hi, columns].any(axis=1)
+        keywords = [k for k in (str(k).strip() for k in keywords) if k]
+        if keywords:
+            hits = [self.keyword_mask(k)[lo:hi] for k in keywords]
+            mask &= np.logical_and.reduce(hits) if match_all_keywords else np.logical_or.reduce(hits)
+        if ratings:
+            mask &= np.isin(self.ratings[lo:hi], list(ratings))
+        return lo + np.flatnonzero(mask)
+
+    def _selected(self, positions):
+        selected = np.zeros(len(self.df), dtype=bool)
+        selected[positions] = True
+        return selected
+
+    def summary(self, positions):
+        """Counts for a selection: total, mean rating, per team, per day and per star rating."""
+        selected = self._selected(positions)
+        ratings = self.ratings[positions]
+        valid = ratings[~np.isnan(ratings)]
+        rating_counts = np.bincount(valid.astype(np.int64)) if len(valid) else np.zeros(0, dtype=np.int64)
+        return {
+            "count": len(positions),
+            "mean_rating": float(valid.mean()) if len(valid) else None,
+            "teams": pd.Series([np.count_nonzero(selected[rows]) for rows in self.team_rows],
+                               index=self.teams, name="reviews", dtype=np.int64),
+            "daily": pd.Series(np.bincount(self.day_codes[positions], minlength=len(self.days))
+                               if len(self.days) else [], index=self.days, name="reviews", dtype=np.int64),
+            "ratings": pd.Series(rating_counts[np.flatnonzero(rating_counts)], index=np.flatnonzero(rating_counts),
+                                 name="reviews"),
+        }
+
+    def frame(self, positions, limit=None):
+        return self.df.iloc[positions[:limit] if limit else positions]
+
+    def team_groups(self, positions, teams=None):
+        """[(team, reviews_df, count)] of a selection, in config order, as VOCAnalyzer routes them."""
+        selected = self._selected(positions)
+        groups = []
+        for team, team_rows in zip(self.teams, self.team_rows):
+            if teams and team not in teams:
+                continue
+            rows = team_rows[selected[team_rows]]
+            if len(rows):
+                groups.append((team, self.df.iloc[rows], len(rows)))
+        return groups
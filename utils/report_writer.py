@@ -0,0 +1,67 @@
+import os
+import threading
+
+
+class ReportWriter:
+    """Streams report sections to disk in their final order as they complete.
+
+    Sections are added by position from any thread. Every contiguous run
+    starting at the next unwritten position is written immediately, so only
+    sections that finished ahead of an earlier one are held in memory. The
+    report is written to `<path>.tmp` and moved into place by close(), so
+    readers never see a partial file.
+    """
+
+    def __init__(self, path, total, header="\n", separator="\n\n"):
+        self.path = path
+        self.total = total
+        self.separator = separator
+        self.bytes_written = 0
+        self._tmp_path = f"{path}.tmp"
+        self._pending = {}
+        self._next = 0
+        self._sections_written = 0
+        self._lock = threading.Lock()
+        self._file = open(self._tmp_path, "w", encoding="utf-8")
+        self._write(header)
+
+    def _write(self, text):
+        self._file.write(text)
+        self.bytes_written += len(text)
+
+    def add(self, position, section):
+        with self._lock:
+            self._pending[position] = section
+            while self._next in self._pending:
+                self._write_section(self._pending.pop(self._next))
+                self._next += 1
+            self._file.flush()
+
+    def _write_section(self, section):
+        if self._sections_written:
+            self._write(self.separator)
+        self._write(section)
+        self._sections_written += 1
+
+    def close(self, footer=""):
+        """Writes any sections still held (skipping positions never added), the footer, and publishes the file."""
+        with self._lock:
+            if self._next < self.total:
+                missing = [p for p in range(self._next, self.total) if p not in self._pending]
+                if missing:
+                    print(f">> [WARNING] Report is missing {len(missing)} section(s); writing the rest in order.")
+                for position in sorted(self._pending):
+                    self._write_section(self._pending.pop(position))
+                self._next = self.total
+            self._write(footer)
+            self._file.close()
+            os.replace(self._tmp_path, self.path)
+        return self.path
+
+    def abort(self):
+        """Discards the partial report."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+            if os.path.exists(self._tmp_path):
+                os.remove(self._tmp_path)
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+from utils.vector_store import HashingEmbedder
+
+try:
+    import pyarrow  # noqa: F401  (RE2-backed regex replace on Arrow strings)
+    _TEXT_DTYPE = "string[pyarrow]"
+except ImportError:
+    _TEXT_DTYPE = None
+
+# Stripped before comparing reviews: bracket tags, laughter/crying jamo, punctuation and emoji.
+# RE2's \w is ASCII-only, so the Arrow path spells out Unicode letters/digits.
+_NOISE = r"\[[^\]]*\]|[ㅋㅎㅠㅜ]+|" + (r"[^\p{L}\p{N}\s]" if _TEXT_DTYPE else r"[^\w\s]|_")
+
+
+def normalize_texts(texts):
+    """Lower-cases, strips tags/jamo/punctuation, masks digits and collapses whitespace (vectorized)."""
+    text = pd.Series(texts, dtype=object).fillna("").astype(str)
+    if _TEXT_DTYPE:
+        text = text.astype(_TEXT_DTYPE)
+    text = text.str.lower().str.replace(_NOISE, " ", regex=True)
+    text = text.str.replace(r"\d+", "0", regex=True)  # order numbers, dates, amounts
+    return text.str.replace(r"\s+", " ", regex=True).str.strip()
+
+
+def _leader_clusters(vectors, threshold, block_size=256):
+    """Greedy leader clustering: each vector joins the first leader with cosine >= threshold.
+
+    Vectors are visited in order (most frequent first), so leaders are the
+    most common phrasing of each complaint. Returns a cluster label per row.
+    """
+    labels = np.full(len(vectors), -1, dtype=np.int64)
+    leaders = np.empty_like(vectors)  # Leaders are a prefix of this buffer
+    n_leaders = 0
+    for start in range(0, len(vectors), block_size):
+        block = vectors[start:start + block_size]
+        if n_leaders:
+            sims = block @ leaders[:n_leaders].T
+            best = sims.argmax(axis=1)
+            matched = sims[np.arange(len(block)), best] >= threshold
+            labels[start:start + len(block)][matched] = best[matched]
+        # Rows that matched no existing leader are clustered among this block's new leaders
+        block_first = n_leaders
+        for i in np.flatnonzero(labels[start:start + len(block)] < 0):
+            row = block[i]
+            if n_leaders > block_first:
+                sims = leaders[block_first:n_leaders] @ row
+                j = int(sims.argmax())
+                if sims[j] >= threshold:
+                    labels[start + i] = block_first + j
+                    continue
+            labels[start + i] = n_leaders
+            leaders[n_leaders] = row
+            n_leaders += 1
+    return labels
+
+
+def _distinct_texts(texts, normalized):
+    """One row per distinct normalized text (`key`, first original `text`, `count`), most frequent first."""
+    exact = pd.DataFrame({"key": normalized, "text": texts})
+    exact = exact.groupby("key", sort=False).agg(text=("text", "first"), count=("text", "size"))
+    return exact.sort_values("count", ascending=False, kind="stable").reset_index()
+
+
+def cluster_reviews(texts, threshold=0.8, embedder=None, max_distinct=5000, seed=0):
+    """Collapses duplicate and near-duplicate reviews into clusters with exact counts.
+
+    Exact duplicates (after normalize_texts) are merged first; the distinct
+    texts are then embedded and leader-clustered at cosine `threshold`.
+    Leader clustering is O(distinct x leaders), so when there are more than
+    `max_distinct` distinct texts a seeded random sample of `max_distinct`
+    reviews is clustered instead; counts then refer to the sample and
+    format_cluster_lines scales them back from `share`.
+    Returns a DataFrame sorted by count with columns `representative` (the
+    most frequent original text of the cluster), `count`, `share` and
+    `variants` (distinct normalized texts merged into it).
+    """
+    texts = pd.Series(texts, dtype=object).fillna("").astype(str).reset_index(drop=True)
+    if texts.empty:
+        return pd.DataFrame(columns=["representative", "count", "share", "variants"])
+
+    normalized = normalize_texts(texts).to_numpy(dtype=object)
+    exact = _distinct_texts(texts, normalized)
+    if max_distinct and len(exact) > max_distinct:
+        rows = np.sort(np.random.default_rng(seed).choice(len(texts), size=max_distinct, replace=False))
+        texts = texts.iloc[rows].reset_index(drop=True)
+        exact = _distinct_texts(texts, normalized[rows])
+
+    vectors = (embedder or HashingEmbedder(dim=256)).embed(exact["key"].tolist())
+    exact["cluster"] = _leader_clusters(vectors, threshold)
+
+    clusters = exact.groupby("cluster", sort=False).agg(
+        representative=("text", "first"), count=("count", "sum"), variants=("key", "size")
+    )
+    clusters["share"] = clusters["count"] / len(texts)
+    clusters = clusters.sort_values("count", ascending=False, kind="stable").reset_index(drop=True)
+    return clusters[["representative", "count", "share", "variants"]]
+
+
+def format_cluster_lines(clusters, total_count=None):
+    """Prompt lines `(N건, S%) text`, in the given (largest-first) order.
+
+    When the clusters come from a sample of a larger set (`total_count`
+    greater than the sampled rows), counts are scaled to `total_count` from
+    the cluster's share and prefixed with "~".
+    """
+    for row in clusters.itertuples(index=False):
+        sampled = row.count / row.share if row.share else row.count
+        if total_count and total_count > round(sampled):
+            count = f"~{round(row.share * total_count)}"
+        else:
+            count = f"{row.count}"
+        yield f"({count}건, {row.share:.1%}) {row.representative}"
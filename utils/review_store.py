@@ -0,0 +1,103 @@
+import os
+
+import pandas as pd
+
+# Columns VOCAnalyzer needs for routing, prompts and fingerprints
+ANALYSIS_COLUMNS = ["review_id", "review_text", "star_rating"]
+
+
+def is_columnar(path):
+    """True for a Parquet file or a (date-partitioned) Parquet dataset directory."""
+    return os.path.isdir(path) or path.endswith(".parquet")
+
+
+def _open_dataset(path):
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError as e:
+        raise ImportError("pyarrow is required to read Parquet review stores (pip install pyarrow)") from e
+
+    # Hive-style layout written by convert_to_parquet.py: <root>/date=YYYY-MM-DD/*.parquet
+    partitioning = ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive") if os.path.isdir(path) else None
+    return ds.dataset(path, format="parquet", partitioning=partitioning)
+
+
+def _date_filter(start_date, end_date):
+    import pyarrow.dataset as ds
+    expr = None
+    if start_date:
+        expr = ds.field("date") >= str(start_date)
+    if end_date:
+        upper = ds.field("date") <= str(end_date)
+        expr = upper if expr is None else expr & upper
+    return expr
+
+
+def _projection(available, columns):
+    return [c for c in columns if c in available] if columns else None
+
+
+def _filter_dates(df, start_date, end_date):
+    # ISO 'YYYY-MM-DD' strings compare correctly as text
+    if start_date:
+        df = df[df["date"].astype(str) >= str(start_date)]
+    if end_date:
+        df = df[df["date"].astype(str) <= str(end_date)]
+    return df
+
+
+def _csv_usecols(columns, start_date, end_date):
+    if not columns:
+        return None
+    wanted = set(columns) | ({"date"} if (start_date or end_date) else set())
+    return lambda c: c in wanted
+
+
+def _drop_unrequested(df, columns):
+    if columns:
+        df = df[[c for c in df.columns if c in columns]]
+    return df
+
+
+def load_reviews(path, columns=None, start_date=None, end_date=None):
+    """Loads reviews from a CSV or Parquet store.
+
+    For Parquet, the date range and column list are pushed down so only the
+    requested partitions/columns are read. For CSV the file is parsed and then
+    filtered. Dates are inclusive ISO 'YYYY-MM-DD' strings.
+    """
+    if is_columnar(path):
+        dataset = _open_dataset(path)
+        table = dataset.to_table(
+            columns=_projection(dataset.schema.names, columns),
+            filter=_date_filter(start_date, end_date),
+        )
+        return table.to_pandas()
+
+    df = pd.read_csv(path, usecols=_csv_usecols(columns, start_date, end_date))
+    if start_date or end_date:
+        df = _filter_dates(df, start_date, end_date)
+    return _drop_unrequested(df, columns)
+
+
+def iter_review_chunks(path, chunksize, columns=None, start_date=None, end_date=None):
+    """Yields review DataFrames of at most `chunksize` rows (streaming counterpart of load_reviews)."""
+    if is_columnar(path):
+        dataset = _open_dataset(path)
+        batches = dataset.to_batches(
+            columns=_projection(dataset.schema.names, columns),
+            filter=_date_filter(start_date, end_date),
+            batch_size=chunksize,
+        )
+        for batch in batches:
+            if batch.num_rows:
+                yield batch.to_pandas()
+        return
+
+    reader = pd.read_csv(path, usecols=_csv_usecols(columns, start_date, end_date), chunksize=chunksize)
+    for chunk in reader:
+        if start_date or end_date:
+            chunk = _filter_dates(chunk, start_date, end_date)
+        if not chunk.empty:
+            yield _drop_unrequested(chunk, columns)
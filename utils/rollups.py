@@ -0,0 +1,253 @@
+import datetime
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from utils.incremental import format_count_change, hash_text
+from utils.review_store import iter_review_chunks
+from utils.team_matcher import TeamMatcher
+
+# Columns a rollup update reads from the review store
+ROLLUP_COLUMNS = ["date", "review_text", "star_rating"]
+FIELDS = ["count", "rating_sum", "rated_count", "sentiment_sum"]
+
+
+class DailyRollupStore:
+    """Daily per-team review aggregates for one review source, kept under data/rollups/.
+
+    Each (team, day) holds the review count, star-rating sum, rated-review
+    count and sentiment-score sum. The store remembers a watermark (the
+    latest day ingested); an update drops that possibly partial day and
+    ingests only rows dated on or after it, so past data is never rescanned
+    for aggregation. The store is rebuilt when the team keywords or the
+    sentiment lexicon change. Late rows dated before the watermark are not
+    picked up; use `rebuild=True` after backfilling old dates.
+    """
+
+    def __init__(self, data_path, config, root="data/rollups", rebuild=False):
+        from sentiment_engine import lexicon_version
+
+        self.data_path = data_path
+        self.matcher = TeamMatcher.from_config(config)
+        self.config_key = hash_text(
+            json.dumps(self.matcher.team_keywords, sort_keys=True, ensure_ascii=False) + lexicon_version()
+        )[:16]
+        source = os.path.normpath(data_path)
+        name = re.sub(r"[^\w.-]", "_", os.path.basename(source))
+        self.path = os.path.join(root, f"{name}_{hash_text(source)[:8]}.json")
+        self.watermark = None
+        self.teams = {}  # team -> {day: [count, rating_sum, rated_count, sentiment_sum]}
+        self.rows_ingested = 0
+        if not rebuild:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f">> [WARNING] Ignoring unreadable rollup store {self.path}: {e}")
+            return
+        if state.get("config_key") != self.config_key:
+            print(">> [INFO] Team keywords or sentiment lexicon changed; rebuilding daily rollups.")
+            return
+        self.watermark = state.get("watermark")
+        self.teams = state.get("teams", {})
+
+    def update(self, frames):
+        """Ingests review frames (with date, review_text, star_rating) dated on or after the watermark.
+
+        `frames` yields DataFrames or (DataFrame, team membership) pairs, so
+        an already routed frame is not matched again. Returns rows ingested.
+        """
+        from sentiment_engine import SentimentCache, SentimentScorer
+
+        since = self.watermark
+        if since:
+            for days in self.teams.values():
+                for day in [day for day in days if day >= since]:
+                    del days[day]
+        scorer = SentimentScorer(cache=SentimentCache())
+        latest = since
+        rows = 0
+        for item in frames:
+            df, membership = item if isinstance(item, tuple) else (item, None)
+            if 'date' not in df.columns:
+                raise ValueError(f"{self.data_path} has no date column; daily rollups need one")
+            dates = df['date'].astype(str).to_numpy()
+            keep = dates >= since if since else np.ones(len(df), dtype=bool)
+            if not keep.any():
+                continue
+            rows += int(keep.sum())
+            latest = max(latest or "", dates[keep].max())
+            if membership is None:
+                membership = self.matcher.match(df['review_text'])
+            matched = membership.to_numpy(dtype=bool) & keep[:, None]
+            routed = matched.any(axis=1)
+            if not routed.any():
+                continue
+
+            # Only routed rows are scored; their day codes index the per-day sums below
+            days, codes = np.unique(dates[routed], return_inverse=True)
+            if 'star_rating' in df.columns:
+                ratings = pd.to_numeric(df['star_rating'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+                ratings = ratings[routed]
+            else:
+                ratings = np.full(int(routed.sum()), np.nan)
+            rated = ~np.isnan(ratings)
+            sentiment = scorer.score(df['review_text'].to_numpy()[routed]).astype(np.float64)
+            for j, team in enumerate(membership.columns):
+                mask = matched[routed, j]
+                if not mask.any():
+                    continue
+                n = len(days)
+                sums = np.stack([
+                    np.bincount(codes[mask], minlength=n),
+                    np.bincount(codes[mask], weights=np.where(rated, ratings, 0.0)[mask], minlength=n),
+                    np.bincount(codes[mask], weights=rated[mask].astype(np.float64), minlength=n),
+                    np.bincount(codes[mask], weights=sentiment[mask], minlength=n),
+                ], axis=1)
+                team_days = self.teams.setdefault(team, {})
+                for i in np.flatnonzero(sums[:, 0]):
+                    previous = team_days.get(days[i], [0, 0.0, 0, 0.0])
+                    team_days[days[i]] = [
+                        int(previous[0] + sums[i, 0]), float(previous[1] + sums[i, 1]),
+                        int(previous[2] + sums[i, 2]), float(previous[3] + sums[i, 3]),
+                    ]
+        scorer.cache.save()
+        self.watermark = latest
+        self.rows_ingested += rows
+        self.save()
+        return rows
+
+    def refresh(self, chunksize=100000):
+        """Streams rows dated on or after the watermark from the source and ingests them."""
+        return self.update(iter_review_chunks(self.data_path, chunksize, columns=ROLLUP_COLUMNS,
+                                              start_date=self.watermark))
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "source": self.data_path,
+                    "config_key": self.config_key,
+                    "watermark": self.watermark,
+                    "updated": datetime.datetime.now().isoformat(timespec="seconds"),
+                    "teams": self.teams,
+                }, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f">> [WARNING] Failed to save daily rollups: {e}")
+
+    def daily(self, team, end=None):
+        """Calendar-continuous daily arrays for a team up to `end` (inclusive): (first_day, {field: array})."""
+        team_days = self.teams.get(team) or {}
+        end = end or self.watermark
+        days = sorted(day for day in team_days if day <= end) if end else []
+        if not days:
+            return None, {field: np.zeros(0) for field in FIELDS}
+        first = np.datetime64(days[0], "D")
+        length = int((np.datetime64(end, "D") - first).astype(np.int64)) + 1
+        positions = (np.array(days, dtype="datetime64[D]") - first).astype(np.int64)
+        values = np.array([team_days[day] for day in days], dtype=np.float64)
+        series = {}
+        for k, field in enumerate(FIELDS):
+            series[field] = np.zeros(length)
+            series[field][positions] = values[:, k]
+        return first, series
+
+    def trend(self, team, as_of=None, spike_z=3.0, baseline_days=28, min_spike_count=5, spike_lookback=7):
+        """Week-over-week and month-over-month (30-day) deltas plus recent spike days, in O(days).
+
+        A day is a spike if its count is at least `min_spike_count` and its
+        z-score against the preceding `baseline_days` days is at least
+        `spike_z` (std floored at 1 so quiet baselines do not explode).
+        """
+        as_of = as_of or self.watermark
+        first, series = self.daily(team, as_of)
+        csum = {field: np.concatenate([[0.0], np.cumsum(values)]) for field, values in series.items()}
+        length = len(series["count"])
+
+        def window(field, days, offset=0):
+            # Sum over the `days` days ending `offset` days before as_of
+            hi = max(length - offset, 0)
+            return csum[field][hi] - csum[field][max(hi - days, 0)]
+
+        def period(days):
+            current, previous = window("count", days), window("count", days, days)
+            rated, prev_rated = window("rated_count", days), window("rated_count", days, days)
+            return {
+                "count": int(current),
+                "previous": int(previous),
+                "change_pct": (current - previous) / previous * 100 if previous else None,
+                "mean_rating": window("rating_sum", days) / rated if rated else None,
+                "previous_mean_rating": window("rating_sum", days, days) / prev_rated if prev_rated else None,
+                "mean_sentiment": window("sentiment_sum", days) / current if current else None,
+                "previous_mean_sentiment": window("sentiment_sum", days, days) / previous if previous else None,
+            }
+
+        spikes = []
+        if length > baseline_days:
+            counts = series["count"]
+            squares = np.concatenate([[0.0], np.cumsum(counts ** 2)])
+            ends = np.arange(baseline_days, length)
+            mean = (csum["count"][ends] - csum["count"][ends - baseline_days]) / baseline_days
+            var = (squares[ends] - squares[ends - baseline_days]) / baseline_days - mean ** 2
+            z = (counts[ends] - mean) / np.maximum(np.sqrt(np.maximum(var, 0.0)), 1.0)
+            recent = ends >= length - spike_lookback
+            for i in np.flatnonzero(recent & (z >= spike_z) & (counts[ends] >= min_spike_count)):
+                day = first + np.timedelta64(int(ends[i]), "D")
+                spikes.append({"date": str(day), "count": int(counts[ends[i]]), "z": float(z[i])})
+
+        return {"as_of": as_of, "wow": period(7), "mom": period(30), "spikes": spikes}
+
+    def summary(self):
+        days = len({day for team_days in self.teams.values() for day in team_days})
+        return f"{len(self.teams)} teams x {days} days up to {self.watermark or '-'} ({self.rows_ingested:,} rows ingested this run)"
+
+
+def _rating_change(period):
+    if period["mean_rating"] is None:
+        return "-"
+    if period["previous_mean_rating"] is None:
+        return f"{period['mean_rating']:.2f}"
+    return f"{period['mean_rating']:.2f}({period['mean_rating'] - period['previous_mean_rating']:+.2f})"
+
+
+def format_trend_line(trend):
+    """One-line trend summary for a category prompt."""
+    wow, mom = trend["wow"], trend["mom"]
+    parts = [
+        f"최근 7일(WoW) {format_count_change(wow['count'], wow['previous'])}",
+        f"최근 30일(MoM) {format_count_change(mom['count'], mom['previous'])}",
+        f"7일 평균 평점 {_rating_change(wow)}",
+    ]
+    if wow["mean_sentiment"] is not None:
+        parts.append(f"7일 평균 감성 {wow['mean_sentiment']:+.2f}")
+    if trend["spikes"]:
+        parts.append("급증일 " + ", ".join(f"{s['date']} {s['count']}건(z={s['z']:.1f})" for s in trend["spikes"]))
+    return f"Trend (as of {trend['as_of']}): " + " / ".join(parts)
+
+
+def format_trend_table(trends):
+    """Markdown trend table for the report header. `trends` is {team: trend} in report order."""
+    as_of = next((trend["as_of"] for trend in trends.values()), None)
+    lines = [
+        f"# 📈 Trend (as of {as_of})",
+        "| Team | 최근 7일 (WoW) | 최근 30일 (MoM) | 평점 7일 (WoW) | 감성 7일 | Spikes |",
+        "| :--- | :--- | :--- | :--- | :--- | :--- |",
+    ]
+    for team, trend in trends.items():
+        wow, mom = trend["wow"], trend["mom"]
+        sentiment = f"{wow['mean_sentiment']:+.2f}" if wow["mean_sentiment"] is not None else "-"
+        spikes = ", ".join(f"{s['date']} ({s['count']}건, z={s['z']:.1f})" for s in trend["spikes"]) or "-"
+        lines.append(f"| {team} | {format_count_change(wow['count'], wow['previous'])} | "
+                     f"{format_count_change(mom['count'], mom['previous'])} | {_rating_change(wow)} | {sentiment} | {spikes} |")
+    return "\n".join(lines)
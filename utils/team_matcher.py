@@ -0,0 +1,107 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (enables the RE2-backed Arrow string kernels)
+    _TEXT_DTYPE = "string[pyarrow]"
+except ImportError:
+    _TEXT_DTYPE = None
+
+
+class TeamMatcher:
+    """Routes reviews to teams using compiled keyword alternations and vectorized string ops.
+
+    Semantics are identical to the original per-team scan
+    `any(k in str(x) for k in keywords)`: a review belongs to a team if any of
+    the team's keywords occurs in it as a plain substring (so a team with an
+    empty keyword matches every review).
+    """
+
+    def __init__(self, teams):
+        # teams: {team_name: {"keywords": [...], ...}} as in config/teams.yaml
+        self.team_keywords = {
+            team: [str(k) for k in (info or {}).get('keywords', [])]
+            for team, info in (teams or {}).items()
+        }
+        teams = list(self.team_keywords)
+        # An empty keyword is a substring of every text, so its team matches every row
+        self.match_all = np.array([any(k == "" for k in self.team_keywords[t]) for t in teams], dtype=bool)
+        # Longest first: at each position the alternation then captures the longest keyword starting there
+        self.keywords = sorted(dict.fromkeys(k for kws in self.team_keywords.values() for k in kws if k),
+                               key=len, reverse=True)
+        self.keyword_index = {k: i for i, k in enumerate(self.keywords)}
+        # A matched keyword also implies every keyword contained in it, so it maps to all of their teams
+        self.keyword_teams = np.array([
+            [any(k and k in keyword for k in self.team_keywords[team]) for team in teams] for keyword in self.keywords
+        ], dtype=bool).reshape(len(self.keywords), len(teams))
+        # Non-overlapping scanning can only miss a keyword that starts inside another keyword's match
+        # and runs past its end; those few are checked directly
+        self.overlap_keywords = [
+            b for b in self.keywords
+            if any(a != b and b not in a and any(b.startswith(a[o:]) for o in range(1, len(a))) for a in self.keywords)
+        ]
+        self.any_pattern = self._alternation(self.keywords) if self.keywords else None
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.get('teams', {}) if config else {})
+
+    @staticmethod
+    def _alternation(keywords):
+        # Escaped literals only, so the regex is an exact substring test
+        return "|".join(re.escape(k) for k in keywords)
+
+    @staticmethod
+    def _as_text(series):
+        """Converts a column to strings once, matching str(x) for non-string cells."""
+        if not (pd.api.types.is_string_dtype(series) and not series.isna().any()):
+            series = series.astype(object).map(str)
+        if _TEXT_DTYPE and str(series.dtype) != _TEXT_DTYPE:
+            series = series.astype(_TEXT_DTYPE)
+        return series
+
+    def _scan(self, texts):
+        """(row, keyword id) for every non-overlapping keyword occurrence, found in one regex pass."""
+        if _TEXT_DTYPE:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+
+            # Each occurrence is fenced by separators, so splitting leaves keywords as whole pieces
+            # (text between occurrences can never equal a keyword, or the scan would have matched it)
+            fenced = pc.replace_substring_regex(pa.array(texts), f"({self.any_pattern})", "\x1f\\1\x1f")
+            pieces = pc.split_pattern(fenced, "\x1f")
+            ids = pc.index_in(pc.list_flatten(pieces), value_set=pa.array(self.keywords))
+            found = pc.is_valid(ids).to_numpy(zero_copy_only=False)
+            rows = pc.list_parent_indices(pieces).to_numpy(zero_copy_only=False)[found]
+            return rows, ids.to_numpy(zero_copy_only=False)[found].astype(np.int64)
+        hits = texts.map(re.compile(self.any_pattern).findall)
+        lengths = hits.map(len).to_numpy()
+        ids = np.fromiter((self.keyword_index[k] for found in hits for k in found), dtype=np.int64,
+                          count=int(lengths.sum()))
+        return np.repeat(np.arange(len(texts)), lengths), ids
+
+    def match(self, series):
+        """Returns a row x team boolean membership DataFrame (columns in config order).
+
+        A single regex pass finds every keyword occurrence; occurrences map to
+        teams through a keyword -> team table instead of one scan per team.
+        """
+        teams = list(self.team_keywords)
+        matrix = np.zeros((len(series), len(teams)), dtype=bool)
+        matrix[:, self.match_all] = True
+        if self.any_pattern is not None and len(series):
+            texts = self._as_text(series)
+            rows, keyword_ids = self._scan(texts)
+            hit, team_cols = np.nonzero(self.keyword_teams[keyword_ids])
+            matrix[rows[hit], team_cols] = True
+            for keyword in self.overlap_keywords:
+                found = texts.str.contains(keyword, regex=False).fillna(False).to_numpy(dtype=bool)
+                matrix[np.ix_(found, self.keyword_teams[self.keyword_index[keyword]])] = True
+        return pd.DataFrame(matrix, index=series.index, columns=teams)
+
+
+def match_teams(df, config, column='review_text'):
+    """Convenience wrapper: membership matrix for `df[column]` under `config`."""
+    return TeamMatcher.from_config(config).match(df[column])
@@ -0,0 +1,103 @@
+import itertools
+import re
+
+# USD per 1M tokens (input, output). Estimates only; unknown models use DEFAULT_PRICING.
+MODEL_PRICING_PER_1M = {
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-1.5-pro": (1.25, 5.00),
+    "gemini-1.0-pro": (0.50, 1.50),
+    "gemini-pro": (0.50, 1.50),
+    "gemini-2.0-flash": (0.10, 0.40),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-pro": (1.25, 10.00),
+}
+DEFAULT_PRICING = (0.30, 2.50)
+
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+
+class TokenCounter:
+    """Counts prompt tokens with tiktoken, or a character heuristic when it is unavailable.
+
+    tiktoken's encodings are an approximation of Gemini's tokenizer, which is
+    not available offline; any callable `count_fn(text) -> int` can be plugged
+    in instead.
+    """
+
+    def __init__(self, encoding_name="cl100k_base", count_fn=None):
+        self._encoding = None
+        self._count_fn = count_fn
+        if count_fn is not None:
+            self.name = getattr(count_fn, "__name__", "custom")
+            return
+        try:
+            import tiktoken
+            self._encoding = tiktoken.get_encoding(encoding_name)
+            self.name = f"tiktoken/{encoding_name}"
+        except Exception as e:
+            # Encodings are downloaded on first use; offline runs fall back to the heuristic
+            print(f">> [WARNING] tiktoken unavailable ({type(e).__name__}). Using approximate token counts.")
+            self.name = "approx"
+
+    @staticmethod
+    def approximate(text):
+        """~4 ASCII chars per token; Hangul/CJK chars are roughly one token each."""
+        text = str(text)
+        non_ascii = len(_NON_ASCII.findall(text))
+        return non_ascii + (len(text) - non_ascii + 3) // 4
+
+    def count(self, text):
+        if not text:
+            return 0
+        if self._count_fn is not None:
+            return int(self._count_fn(text))
+        if self._encoding is not None:
+            return len(self._encoding.encode(str(text), disallowed_special=()))
+        return self.approximate(text)
+
+    def count_many(self, texts):
+        if self._encoding is not None:
+            return [len(tokens) for tokens in self._encoding.encode_ordinary_batch([str(t) for t in texts])]
+        return [self.count(t) for t in texts]
+
+    def truncate(self, text, max_tokens):
+        """Cuts a single text down to about max_tokens."""
+        text = str(text)
+        if self.count(text) <= max_tokens:
+            return text
+        if self._encoding is not None:
+            return self._encoding.decode(self._encoding.encode_ordinary(text)[:max_tokens]) + "…"
+        # Heuristic path: shrink proportionally, then trim until it fits
+        cut = max(1, int(len(text) * max_tokens / max(self.count(text), 1)))
+        while cut > 1 and self.count(text[:cut]) > max_tokens:
+            cut = int(cut * 0.9)
+        return text[:cut] + "…"
+
+
+def fit_reviews(texts, counter, budget, max_review_tokens=300, batch_size=64):
+    """Greedily takes reviews, in the given order, until `budget` tokens are used.
+
+    Each review is capped at `max_review_tokens` so one long review cannot
+    crowd out the rest. At least one review is always kept. Returns
+    (selected_texts, tokens_used).
+    """
+    selected, used = [], 0
+    texts = iter(texts)  # Consumed lazily: a huge team only costs what fits in the budget
+    while True:
+        batch = [str(t) for t in itertools.islice(texts, batch_size)]
+        if not batch:
+            return selected, used
+        for text, tokens in zip(batch, counter.count_many(batch)):
+            if tokens > max_review_tokens:
+                text = counter.truncate(text, max_review_tokens)
+                tokens = counter.count(text)
+            tokens += 1  # newline separator
+            if selected and used + tokens > budget:
+                return selected, used
+            selected.append(text)
+            used += tokens
+
+
+def estimate_cost(model, prompt_tokens, response_tokens):
+    price_in, price_out = MODEL_PRICING_PER_1M.get(model, DEFAULT_PRICING)
+    return (prompt_tokens * price_in + response_tokens * price_out) / 1_000_000
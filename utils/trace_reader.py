@@ -0,0 +1,88 @@
+"""Reads run trace files written by TraceWriter and rebuilds the per-file audit view.
+
+Usage:
+    python -m utils.trace_reader results/<project>/logs/trace_<run_id>.jsonl [--out DIR] [--category NAME]
+    python -m utils.trace_reader results/<project>/logs/trace_<run_id>.jsonl --id <record_id>
+"""
+import argparse
+import datetime
+import gzip
+import json
+import os
+
+
+def read_trace(path):
+    """Yields trace records from a .jsonl or .jsonl.gz file."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def find_record(path, record_id):
+    """Returns the record with this id (as referenced from report audit tables), or None."""
+    return next((record for record in read_trace(path) if record.get("id") == record_id), None)
+
+
+def export_legacy_view(path, out_dir=None, category=None):
+    """Writes trace_<ts>_<cat>.log, <ts>_<cat>_prompt.txt and <ts>_<cat>_raw_res.json per record.
+
+    If two records map to the same second and category, the record sequence
+    number is appended so nothing is overwritten. Returns the number of
+    records exported.
+    """
+    out_dir = out_dir or os.path.join(os.path.dirname(path), "trace_view")
+    os.makedirs(out_dir, exist_ok=True)
+    used = set()
+    exported = 0
+    for record in read_trace(path):
+        if category and record.get("category") != category:
+            continue
+        timestamp = datetime.datetime.fromisoformat(record["ts"]).strftime("%Y%m%d_%H%M%S")
+        stem = f"{timestamp}_{record['category']}"
+        if stem in used:
+            stem = f"{stem}_{record['id'].rsplit('-', 1)[-1]}"
+        used.add(stem)
+
+        with open(os.path.join(out_dir, f"trace_{stem}.log"), "w", encoding="utf-8") as f:
+            f.write(f"=== [Step 1: Raw Input] ===\n")
+            f.write(f"{record.get('input', '')}\n\n")
+            f.write(f"=== [Step 2: Constructed Prompt Used] ===\n")
+            f.write(f"(See {stem}_prompt.txt for full content)\n\n")
+            f.write(f"=== [Step 3: AI Raw Response] ===\n")
+            f.write(f"{record.get('response', '')}\n")
+        with open(os.path.join(out_dir, f"{stem}_prompt.txt"), "w", encoding="utf-8") as f:
+            f.write(record.get("prompt", ""))
+        with open(os.path.join(out_dir, f"{stem}_raw_res.json"), "w", encoding="utf-8") as f:
+            json.dump({"category": record["category"], "response": record.get("response", "")}, f,
+                      ensure_ascii=False, indent=2)
+        exported += 1
+    return exported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trace log reader")
+    parser.add_argument("path", type=str, help="trace_<run_id>.jsonl or .jsonl.gz")
+    parser.add_argument("--out", type=str, default=None, help="Output directory (default: <logs>/trace_view)")
+    parser.add_argument("--category", type=str, default=None, help="Only export this category")
+    parser.add_argument("--list", action="store_true", help="Print a one-line summary per record instead of exporting")
+    parser.add_argument("--id", type=str, default=None, help="Print the prompt and response of one record")
+    args = parser.parse_args()
+
+    if args.id:
+        rec = find_record(args.path, args.id)
+        if rec is None:
+            raise SystemExit(f"Record {args.id} not found in {args.path}")
+        print(f"=== [{rec['category']}] Prompt ===\n{rec.get('prompt', '')}\n")
+        print(f"=== Response ===\n{rec.get('response', '')}")
+    elif args.list:
+        for rec in read_trace(args.path):
+            if not args.category or rec.get("category") == args.category:
+                unparsed = (rec.get("batch") or {}).get("unparsed")
+                print(f"{rec['id']}  {rec['ts']}  {rec['category']}  prompt={len(rec.get('prompt', ''))} chars"
+                      + (f"  unparsed={','.join(unparsed)}" if unparsed else ""))
+    else:
+        count = export_legacy_view(args.path, args.out, args.category)
+        print(f"Exported {count} trace records to {args.out or os.path.join(os.path.dirname(args.path), 'trace_view')}")
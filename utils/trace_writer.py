@@ -0,0 +1,82 @@
+import atexit
+import datetime
+import gzip
+import itertools
+import json
+import queue
+import threading
+import uuid
+
+_STOP = object()
+
+
+class TraceWriter:
+    """Background, batched writer for analysis trace records.
+
+    Records are queued by the analysis threads and appended by a single writer
+    thread to one JSONL file per run (gzip-compressed if requested). The queue
+    is bounded, so a slow disk applies back-pressure instead of growing memory.
+    Every record gets a unique id of the form `<run_id>-<seq>`.
+    """
+
+    def __init__(self, log_dir, run_id=None, compress=False, max_queue=1000, batch_size=64):
+        self.run_id = run_id or f"{datetime.datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:6]}"
+        self.path = f"{log_dir}/trace_{self.run_id}.jsonl" + (".gz" if compress else "")
+        self.compress = compress
+        self.batch_size = batch_size
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._seq = itertools.count(1)
+        self._seq_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, record):
+        """Queues a record and returns its id. Blocks only if the queue is full."""
+        if self._closed:
+            raise RuntimeError("TraceWriter is closed")
+        with self._seq_lock:
+            record_id = f"{self.run_id}-{next(self._seq):06d}"
+        self._queue.put({"id": record_id, "ts": datetime.datetime.now().isoformat(timespec="microseconds"), **record})
+        return record_id
+
+    def _open(self):
+        if self.compress:
+            # Appending gzip members keeps the file readable with gzip.open
+            return gzip.open(self.path, "at", encoding="utf-8")
+        return open(self.path, "a", encoding="utf-8")
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = [item for item in batch if item is not _STOP]
+            stopping = len(records) != len(batch)
+            if records:
+                try:
+                    with self._open() as f:
+                        f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+                except Exception as e:
+                    print(f"Failed to write trace log: {e}")
+            for _ in batch:
+                self._queue.task_done()
+
+    def flush(self):
+        """Blocks until every queued record has been written."""
+        self._queue.join()
+
+    def close(self):
+        """Flushes and stops the writer thread (idempotent; also runs at interpreter exit)."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        atexit.unregister(self.close)  # Don't keep closed writers alive until exit
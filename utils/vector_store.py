@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+
+
+class HashingEmbedder:
+    """Offline character n-gram hashing embedder (no model download, deterministic).
+
+    Works for Korean and English alike since it does not depend on a tokenizer.
+    Any object with `name` and `embed(texts) -> np.ndarray` can be used instead.
+    """
+
+    def __init__(self, dim=1024, ngram_range=(2, 3)):
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.name = f"hashing-words-{dim}-{ngram_range[0]}{ngram_range[1]}"
+        self.max_cached_words = 200000  # Review vocabularies repeat heavily; bound the memo anyway
+        self._word_cache = {}
+
+    def _word_features(self, word):
+        # Word-internal n-grams (plus the word itself) so separators and spacing don't dominate
+        features = self._word_cache.get(word)
+        if features is None:
+            features = [zlib.crc32(word.encode("utf-8")) % self.dim]
+            for n in range(self.ngram_range[0], self.ngram_range[1] + 1):
+                for i in range(len(word) - n + 1):
+                    features.append(zlib.crc32(word[i:i + n].encode("utf-8")) % self.dim)
+            if len(self._word_cache) < self.max_cached_words:
+                self._word_cache[word] = features
+        return features
+
+    def _features(self, text):
+        for word in re.findall(r"\w+", str(text).lower()):
+            yield from self._word_features(word)
+
+    def embed(self, texts):
+        # Feature ids of all texts are flattened and counted in one bincount
+        rows, features = [], []
+        for row, text in enumerate(texts):
+            ids = list(self._features(text))
+            features.extend(ids)
+            rows.extend([row] * len(ids))
+        flat = np.asarray(rows, dtype=np.int64) * self.dim + np.asarray(features, dtype=np.int64)
+        vectors = np.bincount(flat, minlength=len(texts) * self.dim).astype(np.float32).reshape(len(texts), self.dim)
+        np.log1p(vectors, out=vectors)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def chunk_document(text, max_chars=800):
+    """Splits a document on blank lines, packing paragraphs into chunks of at most ~max_chars."""
+    pieces = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        # Oversized paragraph: fall back to line boundaries
+        pieces.extend(line for line in paragraph.splitlines() if line.strip())
+
+    chunks, current = [], ""
+    for piece in pieces:
+        if current and len(current) + len(piece) + 2 > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _file_sha256(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+class DocumentIndex:
+    """Persistent ChromaDB index over data/docs/*.txt, synced incrementally.
+
+    A manifest next to the collection records each file's mtime, size and
+    SHA-256; `sync()` only re-embeds files whose content changed and drops
+    chunks of deleted files. Embeddings are computed locally and passed to
+    Chroma directly, so no embedding model is downloaded.
+    """
+
+    COLLECTION = "voc_docs"
+
+    def __init__(self, docs_dir="data/docs", store_dir="data/vector_store", embedder=None, max_chars=800):
+        import chromadb
+        from chromadb.config import Settings
+
+        self.docs_dir = docs_dir
+        self.store_dir = store_dir
+        self.embedder = embedder or HashingEmbedder()
+        self.max_chars = max_chars
+        self.manifest_path = os.path.join(store_dir, "manifest.json")
+        self._lock = threading.Lock()
+
+        os.makedirs(store_dir, exist_ok=True)
+        self._client = chromadb.PersistentClient(path=store_dir, settings=Settings(anonymized_telemetry=False))
+        self.manifest = self._load_manifest()
+        if self.manifest.get("embedder") != self.embedder.name:
+            # Vectors from another embedder are not comparable; rebuild from scratch
+            self._reset_collection()
+            self.manifest = {"embedder": self.embedder.name, "files": {}}
+        self.collection = self._client.get_or_create_collection(
+            self.COLLECTION, embedding_function=None, metadata={"hnsw:space": "cosine"}
+        )
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _reset_collection(self):
+        try:
+            self._client.delete_collection(self.COLLECTION)
+        except Exception:
+            pass
+
+    def sync(self):
+        """Brings the index in line with docs_dir. Returns (added_files, removed_files)."""
+        files = self.manifest.setdefault("files", {})
+        current = {}
+        if os.path.exists(self.docs_dir):
+            for name in sorted(os.listdir(self.docs_dir)):
+                if name.endswith(".txt"):
+                    current[name] = os.path.join(self.docs_dir, name)
+
+        added, removed = [], []
+        with self._lock:
+            for name in [n for n in files if n not in current]:
+                self._delete_chunks(files.pop(name))
+                removed.append(name)
+
+            for name, path in current.items():
+                stat = os.stat(path)
+                entry = files.get(name)
+                if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                    continue
+                sha = _file_sha256(path)
+                if entry and entry["sha256"] == sha:
+                    entry.update(mtime=stat.st_mtime, size=stat.st_size)
+                    continue
+                if entry:
+                    self._delete_chunks(entry)
+                files[name] = self._add_file(name, path, sha, stat)
+                added.append(name)
+
+            self._save_manifest()
+        return added, removed
+
+    def _delete_chunks(self, entry):
+        if entry.get("chunk_ids"):
+            self.collection.delete(ids=entry["chunk_ids"])
+
+    def _add_file(self, name, path, sha, stat):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                chunks = chunk_document(f.read(), self.max_chars)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Failed to read doc {name}: {e}")
+            chunks = []
+
+        # Name is part of the id so two files with identical content don't share chunks
+        prefix = hashlib.sha256(f"{name}:{sha}".encode("utf-8")).hexdigest()[:16]
+        ids = [f"{prefix}-{i}" for i in range(len(chunks))]
+        if chunks:
+            self.collection.upsert(
+                ids=ids,
+                embeddings=self.embedder.embed(chunks).tolist(),
+                documents=chunks,
+                metadatas=[{"source": name, "chunk": i} for i in range(len(chunks))],
+            )
+        return {"sha256": sha, "mtime": stat.st_mtime, "size": stat.st_size, "chunk_ids": ids}
+
+    def count(self):
+        return self.collection.count()
+
+    def query(self, text, top_k=4):
+        """Returns the top_k most similar chunks as [{'source', 'chunk', 'text', 'score'}]."""
+        total = self.count()
+        if not total or top_k <= 0:
+            return []
+        embedding = self.embedder.embed([text])[0].tolist()
+        with self._lock:
+            result = self.collection.query(query_embeddings=[embedding], n_results=min(top_k, total))
+        hits = []
+        for doc, meta, dist in zip(result["documents"][0], result["metadatas"][0], result["distances"][0]):
+            hits.append({"source": meta.get("source"), "chunk": meta.get("chunk"), "text": doc, "score": 1.0 - dist})
+        return hits